@@ -1,7 +1,15 @@
 import argparse
+import json
 import sys
 from classes.Project import Project
 from classes.Single import Single
+from classes.Batch import Batch
+from classes.Plan import Plan
+from classes.Plan import C as Cp
+from classes.File import File
+from classes.Writer import Writer
+from classes.BuildRecord import BuildRecord
+from classes.InsertMakerError import InsertMakerError, WriteError
 from classes.ConfigConstants import ConfigConstantsText as Cc
 
 
@@ -12,10 +20,21 @@ def parse_arguments():
     """
     parser = argparse.ArgumentParser(add_help=False)
 
-    parser.add_argument('-c', type=str, help='Config File and section')
-    parser.add_argument('-p', type=str, help='Project File and section')
+    parser.add_argument('-c', type=str, nargs='+', help='Config Files and sections')
+    parser.add_argument('-p', type=str, nargs='+', help='Project Files, also patterns like "config/*.config"')
     parser.add_argument('-v', action='store_true', help='verbose')
     parser.add_argument('-n', action='store_true', help='noprint')
+    parser.add_argument('-f', action='store_true',
+                        help='force writing of unchanged files and a complete build of projects')
+    parser.add_argument('-k', '--keep-going', action='store_true',
+                        help='record failing designs and projects and create the remaining ones')
+    parser.add_argument('--plan', nargs='?', const='text', choices=['text', 'json'],
+                        help='show designs, templates, configs and stale outputs without creating anything')
+    parser.add_argument('--jsonl', action='store_true', help='create designs from JSON lines on stdin')
+    parser.add_argument('-j', '--jobs', type=int, default=1, help='number of processes for --jsonl')
+    parser.add_argument('-w', '--writers', type=int, default=2,
+                        help='number of threads writing the files while the next designs are drawn, 0 writes '
+                             'every file immediately')
 
     return parser.parse_args()
 
@@ -27,17 +46,72 @@ if __name__ == "__main__":
     args = parse_arguments()
 
     kwargs = {Cc.verbose: args.v,
-              Cc.noprint: args.n}
+              Cc.noprint: args.n,
+              Cc.force: args.f,
+              Cc.keep_going: args.keep_going}
 
-    # configuration file
-    if args.c:
-        kwargs[Cc.config_file_and_section] = args.c
+    try:
+        # plan of the build from the configuration only
+        if args.plan and (args.c or args.p):
+            if args.p:
+                plan = Project.plan_projects(args.p, **kwargs)
+            else:
+                plan = {Cp.projects: [{Cp.project: None, Cp.designs: [
+                    Single.plan(**dict(kwargs, **{Cc.config_file_and_section: entry})) for entry in args.c]}]}
 
-        single = Single.create(**kwargs)
-        sys.exit(0)
-    elif args.p:
-        kwargs[Cc.config_file] = args.p
-        project = Project(**kwargs)
-        project.create()
-        sys.exit(0)
+            if args.plan == 'json':
+                print(json.dumps(plan, indent=2))
+            else:
+                Plan.print_plan(plan)
+            sys.exit(0)
 
+        # the files are written in the background, the requests with JSON lines write them immediately
+        if not args.jsonl:
+            Writer.start(args.writers)
+
+        # configuration file
+        if args.c:
+            failed = set()
+            for config_file_and_section in args.c:
+                # the errors of the files written in the background are reported for the design
+                Writer.owner = config_file_and_section
+                try:
+                    Single.create(**dict(kwargs, **{Cc.config_file_and_section: config_file_and_section}))
+                except InsertMakerError as e:
+                    if not args.keep_going:
+                        raise
+                    print(f'{config_file_and_section}: {e}')
+                    failed.add(config_file_and_section)
+                finally:
+                    Writer.owner = None
+
+            # all files are written before the statistics
+            try:
+                Writer.flush()
+            except WriteError as e:
+                if not args.keep_going:
+                    raise
+                for design, messages in e.designs.items():
+                    print(f'{design}: ' + '\n'.join(messages))
+                failed.update(e.designs)
+            File.print_statistics()
+            sys.exit(1 if failed else 0)
+        elif args.jsonl:
+            Batch.run(sys.stdin, sys.stdout, args.jobs, **kwargs)
+            sys.exit(0)
+        elif args.p:
+            results = Project.create_projects(args.p, **kwargs)
+            failed = any(result.error is not None or result.failed for result in results)
+            if len(results) > 1 or failed:
+                Project.print_report(results)
+            File.print_statistics()
+            sys.exit(1 if failed else 0)
+    except InsertMakerError as e:
+        print(e)
+        sys.exit(-1)
+    finally:
+        # handed over files are written even if the run failed
+        Writer.stop()
+
+        # the inputs of the written files for the plan of the next build
+        BuildRecord.save()
@@ -0,0 +1,137 @@
+import io
+import json
+import time
+import queue
+import threading
+import contextlib
+from typing import TextIO
+from concurrent.futures import ProcessPoolExecutor
+from classes.Single import Single
+from classes.InsertMakerError import InsertMakerError
+from classes.ConfigConstants import ConfigConstantsText as Ct
+
+
+class C:
+    id = 'id'
+    design = 'design'
+    settings = 'settings'
+    inline = 'inline'
+
+    files = 'files'
+    svg = 'svg'
+    time = 'time'
+    error = 'error'
+    messages = 'messages'
+
+
+class Batch:
+    """ Creates designs from requests in JSON lines, i.e. from an order system. Every line is a request
+
+        {"id": "order-1", "design": "CardSheet", "settings": {"x measure": 63, "filename": "order-1"}}
+
+    The settings are given like in a config file. With "inline": true the drawings are not written but
+    returned in the result, the files of the result are empty. For every request one line with the result is
+    written in the order of the requests
+
+        {"id": "order-1", "files": ["order-1.svg"], "time": 0.0123, "error": null, "messages": "..."}
+
+    The process stays warm for all requests. With more than one job the requests are created in parallel
+    processes.
+    """
+
+    @classmethod
+    def run(cls, source: TextIO, target: TextIO, jobs: int = 1, **kwargs) -> None:
+        """ Creates the designs of all requests
+
+        :param source: stream with one request per line
+        :param target: stream for the results
+        :param jobs: number of processes to create the designs
+        :param kwargs: arguments for all designs, i.e. noprint
+        :return:
+        """
+        requests = (line for line in source if line.strip())
+
+        if jobs <= 1:
+            for line in requests:
+                cls.__write(target, cls.render(line, kwargs))
+            return
+
+        with ProcessPoolExecutor(jobs) as executor:
+            # the requests are read in a thread of their own. A result is written as soon as it and all
+            # results before it are done, even while the next request is awaited
+            pending = queue.Queue()
+
+            # requests kept in advance that all processes have work
+            places = threading.BoundedSemaphore(2 * jobs)
+
+            def read() -> None:
+                try:
+                    for request in requests:
+                        places.acquire()
+                        pending.put(executor.submit(cls.render, request, kwargs))
+                finally:
+                    pending.put(None)
+
+            threading.Thread(target=read, name='Batch', daemon=True).start()
+
+            while True:
+                future = pending.get()
+                if future is None:
+                    break
+
+                cls.__write(target, future.result())
+                places.release()
+
+    @staticmethod
+    def render(line: str, kwargs: dict) -> dict:
+        """ Creates the design of a single request. The output of the design is kept in the messages,
+        errors of the design are returned as error.
+
+        :param line: request as JSON
+        :param kwargs: arguments for the design
+        :return: result of the request
+        """
+        start = time.perf_counter()
+        result = {C.id: None, C.files: [], C.error: None}
+        messages = io.StringIO()
+
+        try:
+            request = json.loads(line)
+            if not isinstance(request, dict):
+                raise ValueError('Request is no JSON object')
+
+            result[C.id] = request.get(C.id)
+            if not request.get(C.design):
+                raise ValueError('Request has no design')
+
+            inline = bool(request.get(C.inline, False))
+            parts = []
+
+            # values are converted by the settings like the text of a config file
+            settings = {key: value if isinstance(value, str) else json.dumps(value)
+                        for key, value in request.get(C.settings, {}).items()}
+
+            arguments = dict(kwargs)
+            arguments.update({Ct.settings: settings, Ct.parts: parts, Ct.nowrite: inline})
+
+            with contextlib.redirect_stdout(messages):
+                class_ = Single.get_design_class(request[C.design], 'request')
+                class_(**arguments).create()
+
+            # inline drawings are not written
+            result[C.files] = [] if inline else [part.name for part in parts]
+            if inline:
+                result[C.svg] = [part.svg for part in parts]
+
+        except Exception as e:
+            result[C.error] = InsertMakerError.text(e)
+
+        result[C.time] = round(time.perf_counter() - start, 4)
+        result[C.messages] = messages.getvalue().strip()
+
+        return result
+
+    @staticmethod
+    def __write(target: TextIO, result: dict) -> None:
+        target.write(json.dumps(result) + '\n')
+        target.flush()
@@ -0,0 +1,107 @@
+import os
+import json
+import hashlib
+import threading
+from classes.File import File
+
+
+class BuildRecord:
+    """ Content of the templates and config files every output was last created from. A file with an unchanged
+    drawing is not written again and keeps its modification time, even if a template or config file changed
+    without changing the drawing. The file is up to date as long as its inputs have the recorded content.
+
+    The record of the outputs in a directory is written into that directory as .insertmaker.build.
+    """
+
+    __FILENAME = '.insertmaker.build'
+
+    # sha256 of the inputs by output name, by record file
+    __records = {}
+
+    # record files with new content
+    __changed = set()
+
+    # (modification time, size, sha256) by input file
+    __hashes = {}
+
+    # outputs are recorded by the threads of the background writer
+    __lock = threading.Lock()
+
+    @classmethod
+    def add(cls, filename: str, inputs: list) -> None:
+        """ Keeps the content of the inputs of a written or unchanged output
+
+        :param filename: output file
+        :param inputs: templates and config files of the output
+        :return:
+        """
+        record_file, name = cls.__record_file(filename)
+        with cls.__lock:
+            digests = {os.path.abspath(file): cls.__hash(file) for file in inputs if os.path.isfile(file)}
+
+            record = cls.__load(record_file)
+            if record.get(name) != digests:
+                record[name] = digests
+                cls.__changed.add(record_file)
+
+    @classmethod
+    def is_current(cls, filename: str, inputs: list) -> bool:
+        """ Tests if an output was created from the current content of its inputs
+
+        :param filename: output file
+        :param inputs: templates and config files of the output
+        :return: True if the output is up to date
+        """
+        record_file, name = cls.__record_file(filename)
+        with cls.__lock:
+            digests = cls.__load(record_file).get(name)
+            return digests is not None and all(
+                digests.get(os.path.abspath(file)) == cls.__hash(file) for file in inputs if os.path.isfile(file))
+
+    @classmethod
+    def save(cls) -> None:
+        """ Writes the records with new content. A record that can not be written only marks its outputs
+        as stale in the plan.
+
+        :return:
+        """
+        with cls.__lock:
+            for record_file in sorted(cls.__changed):
+                try:
+                    File.write_file(record_file, json.dumps(cls.__records[record_file], indent=1, sort_keys=True),
+                                    count=False)
+                except OSError:
+                    pass
+
+            cls.__changed.clear()
+
+    @classmethod
+    def __record_file(cls, filename: str) -> tuple:
+        """ Record file in the directory of the output and the name of the output in it """
+        path = os.path.abspath(filename)
+        return os.path.join(os.path.dirname(path), cls.__FILENAME), os.path.basename(path)
+
+    @classmethod
+    def __load(cls, record_file: str) -> dict:
+        """ Record of a directory. An unreadable record is empty """
+        if record_file not in cls.__records:
+            try:
+                with open(record_file, 'r', encoding='utf-8') as f:
+                    cls.__records[record_file] = json.load(f)
+            except (OSError, ValueError):
+                cls.__records[record_file] = {}
+
+        return cls.__records[record_file]
+
+    @classmethod
+    def __hash(cls, filename: str) -> str:
+        """ sha256 of a file. The hash is calculated again when the file has changed """
+        path = os.path.abspath(filename)
+        status = os.stat(path)
+        state = cls.__hashes.get(path)
+        if state is None or state[:2] != (status.st_mtime_ns, status.st_size):
+            with open(path, 'rb') as f:
+                state = (status.st_mtime_ns, status.st_size, hashlib.sha256(f.read()).hexdigest())
+            cls.__hashes[path] = state
+
+        return state[2]
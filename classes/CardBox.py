@@ -1,7 +1,14 @@
+import os
+import itertools
 from enum import Enum
 from classes.Design import Design
+from classes.File import File
+from classes.CombinedSheet import CombinedSheet
+from classes.InsertMakerError import SettingsError
+from classes.Settings import Settings, Setting, number
 from datetime import datetime
 from classes.PathStyle import PathStyle
+from classes.LruCache import LruCache
 from classes.Direction import Rotation
 from classes.ConfigConstants import ConfigConstantsText as Ct
 from classes.ConfigConstants import ConfigConstantsTemplate as Cm
@@ -20,15 +27,10 @@ class C:
     funnel = 'funnel'
     small_height = 'small height'
 
-    slot_width_tdpi =  f'{slot_width}{Ct.tdpi}'
-    corner_gap_tdpi = f'{corner_gap}{Ct.tdpi}'
-    funnel_top_width_tdpi = f'{funnel_top_width}{Ct.tdpi}'
-    funnel_bottom_width_tdpi = f'{funnel_bottom_width}{Ct.tdpi}'
-    funnel_neck_height_tdpi = f'{funnel_neck_height}{Ct.tdpi}'
-    center_nose_width_tdpi = f'{center_nose_width}{Ct.tdpi}'
-    funnel = f'{funnel}{Ct.tdpi}'
-    small_height = f'{small_height}{Ct.tdpi}'
-
+    matrix_funnel = 'matrix funnel'
+    matrix_thumbhole = 'matrix thumbhole'
+    matrix_enforce_design = 'matrix enforce design'
+    matrix_sheet = 'matrix sheet'
 
 
 class EnfordeDesign(Enum):
@@ -49,104 +51,118 @@ class Funnel(Enum):
     DUAL = 'double'
 
 
+class CardBoxSettings(Settings):
+    __slots__ = ()
+
+    template_file = Setting(Ct.template_file, str, 'CardBox.svg')
+    template_card_name = Setting(C.template_card_name, str, 'CardBox.svg')
+
+    length = Setting(Ct.length, number, 80.0, measure=True)
+    width = Setting(Ct.width, number, 40.0, measure=True)
+    height = Setting(Ct.height, number, 15.0, measure=True)
+    vertical_separation = Setting(Ct.vertical_separation, number, 3.0, measure=True)
+    slot_width = Setting(C.slot_width, number, 10.0, measure=True)
+    corner_gap = Setting(C.corner_gap, number, 10.0, measure=True)
+    funnel_top_width = Setting(C.funnel_top_width, number, 10.0, measure=True)
+    funnel_bottom_width = Setting(C.funnel_bottom_width, number, 10.0, measure=True)
+    funnel_neck_height = Setting(C.funnel_neck_height, number, 10.0, measure=True)
+    center_nose_width = Setting(C.center_nose_width, number, 5.0, measure=True)
+    small_height = Setting(C.small_height, number, 20.0)
+
+    thumbhole = Setting(C.thumbhole, Thumbhole, Thumbhole.NONE)
+    enforce_design = Setting(C.enforce_design, EnfordeDesign, EnfordeDesign.NONE)
+    funnel = Setting(C.funnel, Funnel, Funnel.DUAL)
+    separated = Setting(Ct.separated, bool, False)
+
+    # variant matrix: every combination of the listed funnels, thumbholes and designs is drawn from the same
+    # corners, i.e. "single, double". An empty list takes the value of the box
+    matrix_funnel = Setting(C.matrix_funnel, str, '')
+    matrix_thumbhole = Setting(C.matrix_thumbhole, str, '')
+    matrix_enforce_design = Setting(C.matrix_enforce_design, str, '')
+
+    # the variants are written as layers of one sheet instead of a file for each variant
+    matrix_sheet = Setting(C.matrix_sheet, bool, False)
+
+
 class CardBox(Design):
     __DEFAULT_FILENAME = 'CardBox'
     __DEFAULT_TEMPLATE = 'CardBox.svg'
     __DEFAULT_TEMPLATE_SEPARATED = 'ItemBoxSeparated.svg'
+    __DEFAULT_TEMPLATE_MATRIX = 'CombinedSheet.svg'
 
-    __DEFAULT_LENGTH = 80.0
-    __DEFAULT_WIDTH = 40.0
-    __DEFAULT_HEIGHT = 15.0
-
-    __DEFAULT_SLOT_WIDTH = 10.0
-    __DEFAULT_CORNER_GAP = 10.0
-    __DEFAULT_FUNNEL_TOP_WIDTH = 10.0
-    __DEFAULT_FUNNEL_BOTTOM_WIDTH = 10.0
-    __DEFAULT_FUNNEL_NECK_HEIGHT = 10.0
-    __DEFAULT_VERTICAL_SEPARATION = 3.0
-    __DEFAULT_CENTER_NOSE_WIDTH = 5.0
     __DEFAULT_BOTTOM_HOLE_RADIUS = 10.0
-    __DEFAULT_ENFORCEDESIGN = EnfordeDesign.NONE
-    __DEFAULT_FUNNEL = Funnel.DUAL
-    __DEFAULT_THUMBHOLE = Thumbhole.NONE
 
-    __DEFAULT_SMALL_HEIGHT = 20.0
+    # cutlines of the variants by funnel, thumbhole, design and funnel widths. Shared by all boxes in the process
+    __cutlines_cache = LruCache(32)
+
+    settings_class = CardBoxSettings
 
     def __init__(self, **kwargs):
         super().__init__(kwargs)
 
-        self.settings.update({Ct.template_file: self.__DEFAULT_TEMPLATE,
-                              C.template_card_name: self.__DEFAULT_TEMPLATE,
-                              })
-
         self.inner_dimensions = []
         self.outer_dimensions = []
 
-        self.settings.update({Ct.length: self.__DEFAULT_LENGTH,
-                              Ct.width: self.__DEFAULT_WIDTH,
-                              Ct.height: self.__DEFAULT_HEIGHT,
-                              # 'separated': False,
-                              C.thumbhole: self.__DEFAULT_THUMBHOLE,
-                              C.enforce_design: self.__DEFAULT_ENFORCEDESIGN,
-                              Ct.vertical_separation: self.__DEFAULT_VERTICAL_SEPARATION,
-                              C.slot_width: self.__DEFAULT_SLOT_WIDTH,
-                              C.corner_gap: self.__DEFAULT_CORNER_GAP,
-                              C.funnel_top_width: self.__DEFAULT_FUNNEL_TOP_WIDTH,
-                              C.funnel_bottom_width: self.__DEFAULT_FUNNEL_BOTTOM_WIDTH,
-                              C.funnel_neck_height: self.__DEFAULT_FUNNEL_NECK_HEIGHT,
-                              C.center_nose_width: self.__DEFAULT_CENTER_NOSE_WIDTH,
-                              C.funnel: self.__DEFAULT_FUNNEL,
-                              C.small_height: self.__DEFAULT_SMALL_HEIGHT,
-                              }
-                             )
-
-        self.add_settings_measures([Ct.length, Ct.width, Ct.height, Ct.vertical_separation, C.slot_width,
-                                    C.corner_gap, C.funnel_top_width, C.funnel_bottom_width, C.funnel_neck_height,
-                                    C.center_nose_width])
-
-        self.add_settings_enum({C.funnel: Funnel,
-                                C.enforce_design: EnfordeDesign,
-                                C.thumbhole: Thumbhole,
-                                })
-
-        self.add_settings_boolean([Ct.separated])
-
         self.load_settings(self.config_file_and_section)
 
-        self.settings[
-            'title'] = f'{self.get_project_name_for_title()}' \
-                       f'{self.__DEFAULT_FILENAME}-L{self.settings.get(Ct.length)}-W{self.settings.get(Ct.width)}-' \
-                       f'H{self.settings.get(Ct.height)}-S{self.settings.get(Ct.thickness)}-' \
-                       f'{datetime.now().strftime("%Y%m%d-%H%M%S")}'
-
-        self.convert_settings_measures_to_tdpi()
+        self.settings.title = f'{self.get_project_name_for_title()}' \
+                              f'{self.__DEFAULT_FILENAME}-L{self.settings.length}-W{self.settings.width}-' \
+                              f'H{self.settings.height}-S{self.settings.thickness}-' \
+                              f'{datetime.now().strftime("%Y%m%d-%H%M%S")}'
 
     def create(self, separated=False):
         self.__init_design()
-        base_cut = ''
-
-        if self.settings.get(C.funnel) is Funnel.DUAL:
-            # Two funnels
-            if self.settings.get(C.thumbhole) is Thumbhole.DUAL:
-                # Two funnels and two thumbholes
-                base_cut = Design.draw_paths(self.corners, self.cutlines_double_funnel_double_thumbholes)
-            elif self.settings.get(C.thumbhole) is Thumbhole.SINGLE:
-                # Two funnels and one thumbole
-                base_cut = Design.draw_paths(self.corners, self.cutlines_double_funnel_single_thumbhole)
-            else:
-                base_cut = Design.draw_paths(self.corners, self.cutlines_double_funnel_no_thumbholes)
-
-        else:
-            # One funnel
-            if self.settings.get(C.thumbhole) is Thumbhole.NONE:
-                # One funnel, no thumbholes
-                base_cut = Design.draw_paths(self.corners, self.cutlines_single_funnel_no_thumbholes)
-            else:
-                # One funnel, one thumbhole even if two are selected
-                base_cut = Design.draw_paths(self.corners, self.cutlines_single_funnel_single_thumbhole)
 
-        self.template_variables['TEMPLATE'] = self.__DEFAULT_TEMPLATE
-        self.template_variables[Cm.svgpath] = base_cut
+        variants = self.variants()
+        if variants:
+            self.__create_matrix(variants)
+            return
+
+        # only the cutlines of the selected variant are built
+        self.cutlines = self.variant_cutlines(self.settings.funnel, self.settings.thumbhole,
+                                              self.is_small_design(self.settings.enforce_design))
+        self.__write_variant()
+        print(f'CardBox {self.written_files()} created')
+
+    def __create_matrix(self, variants: list) -> None:
+        """ Writes all variants of the matrix. The corners are shared, only the cutlines differ.
+
+        :param variants: funnel, thumbhole and small design of every variant
+        :return:
+        """
+        filename, title = self.settings.filename, self.settings.title
+        parts, nowrite = self.parts, self.nowrite
+
+        sheet_parts = []
+        if self.settings.matrix_sheet:
+            # the variants are only drawn and collected for the sheet
+            self.parts, self.nowrite = sheet_parts, True
+
+        try:
+            for funnel, thumbhole, small in variants:
+                name = self.variant_name(funnel, thumbhole, small)
+                self.settings.filename = self.variant_filename(filename, name)
+                self.settings.title = f'{title}-{name}'
+
+                self.cutlines = self.variant_cutlines(funnel, thumbhole, small)
+                self.__write_variant()
+                print(f'CardBox {self.written_files()} created')
+        finally:
+            self.settings.filename, self.settings.title = filename, title
+            self.parts, self.nowrite = parts, nowrite
+
+        if self.settings.matrix_sheet:
+            CombinedSheet(**{Ct.options: {Ct.project_name: self.settings.project_name},
+                             Ct.parts: sheet_parts,
+                             Ct.force: self.force,
+                             Ct.nowrite: self.nowrite}).create(self.matrix_sheet_title())
+
+    def __write_variant(self) -> None:
+        """ Draws the cutlines and writes the drawing with the dimensions of the box """
+        base_cut = Design.draw_paths(self.corners, self.cutlines)
+
+        self.template_variables = {Ct.template_file: self.__DEFAULT_TEMPLATE,
+                                   Cm.svgpath: base_cut}
 
         viewbox_x, viewbox_y = self.get_viewbox(self.right_x, self.bottom_y)
 
@@ -165,7 +181,92 @@ class CardBox(Design):
         self.template_variables['$FOOTER_OUTER_HEIGHT$'] = self.outer_dimensions[2]
 
         self.write_to_file(self.template_variables)
-        print(f'CardBox \'{self.settings.get(Ct.filename)}\' created')
+
+    def variants(self) -> list:
+        """ The variants of the matrix as funnel, thumbhole and small design. Empty without a matrix """
+        settings = self.settings
+        if not (settings.matrix_funnel or settings.matrix_thumbhole or settings.matrix_enforce_design):
+            return []
+
+        funnels = self.__matrix_values(C.matrix_funnel, settings.matrix_funnel, Funnel, settings.funnel)
+        thumbholes = self.__matrix_values(C.matrix_thumbhole, settings.matrix_thumbhole, Thumbhole,
+                                          settings.thumbhole)
+        designs = self.__matrix_values(C.matrix_enforce_design, settings.matrix_enforce_design, EnfordeDesign,
+                                       settings.enforce_design)
+
+        # combinations that draw the same variant are written once, named after the drawn variant
+        return list(dict.fromkeys((funnel, self.drawn_thumbhole(funnel, thumbhole), self.is_small_design(design))
+                                  for funnel, thumbhole, design in itertools.product(funnels, thumbholes, designs)))
+
+    @staticmethod
+    def __matrix_values(key: str, text: str, enum, default) -> list:
+        """ The values of a matrix setting as enums
+
+        :param key: name of the setting
+        :param text: comma separated values
+        :param enum: type of the values
+        :param default: value of the box for an empty setting
+        :return: list of values
+        """
+        values = []
+        for value in (value.strip() for value in text.split(',')):
+            if not value:
+                continue
+            try:
+                values.append(enum(value.lower()))
+            except ValueError:
+                raise SettingsError(f'Unknown value "{value}" in {key}. Allowed values are '
+                                    f'{", ".join(item.value for item in enum if item.value)}')
+
+        return list(dict.fromkeys(values)) or [default]
+
+    @staticmethod
+    def variant_name(funnel: Funnel, thumbhole: Thumbhole, small: bool) -> str:
+        """ Name of a variant, i.e. single-double-small """
+        return f'{funnel.value}-{thumbhole.value}-{"small" if small else "large"}'
+
+    @staticmethod
+    def variant_filename(filename: str, name: str) -> str:
+        """ Filename of a variant next to the file of the box
+
+        :param filename: filename of the box
+        :param name: name of the variant
+        :return: filename with the name of the variant
+        """
+        return File.set_svg_extension(f'{os.path.splitext(filename)[0]}-{name}')
+
+    def matrix_sheet_title(self) -> str:
+        """ Title of the sheet with all variants, the filename is made from it """
+        return f'{os.path.splitext(self.settings.filename)[0]}-matrix'
+
+    def templates(self) -> list:
+        if self.variants() and self.settings.matrix_sheet:
+            return [self.__DEFAULT_TEMPLATE, self.__DEFAULT_TEMPLATE_MATRIX]
+
+        return [self.__DEFAULT_TEMPLATE]
+
+    def output_files(self) -> list:
+        variants = self.variants()
+        if not variants:
+            return super().output_files()
+
+        if self.settings.matrix_sheet:
+            return [File.set_svg_extension(Design.make_safe_filename(self.matrix_sheet_title()))]
+
+        files = []
+        filename = self.settings.filename
+        try:
+            for variant in variants:
+                self.settings.filename = self.variant_filename(filename, self.variant_name(*variant))
+                files += super().output_files()
+        finally:
+            self.settings.filename = filename
+
+        return files
+
+    def geometry_key(self):
+        # a matrix writes several drawings
+        return None if self.variants() else super().geometry_key()
 
     def __init_design(self):
         self.__init_base()
@@ -261,21 +362,22 @@ class CardBox(Design):
         #                         |                          length                                |
         #  ac                     19--------------------------------------------------------------61
 
-        length = self.settings.get(Ct.length_tdpi)
-        height = self.settings.get(Ct.height_tdpi)
-        width = self.settings.get(Ct.width_tdpi)
-        thickness = self.settings.get(Ct.thickness_tdpi)
+        settings = self.settings
+        length = settings.length_tdpi
+        height = settings.height_tdpi
+        width = settings.width_tdpi
+        thickness = settings.thickness_tdpi
 
-        slot_width = self.settings.get(C.slot_width_tdpi)
-        corner_gap = self.settings.get(C.corner_gap_tdpi)
-        neckheight = self.settings.get(C.funnel_neck_height_tdpi)
-        funneltopwidth = self.settings.get(C.funnel_top_width_tdpi)
-        funnelbottomwidth = self.settings.get(C.funnel_top_width_tdpi)
-        nosewidth = self.settings.get(C.center_nose_width_tdpi)
+        slot_width = settings.slot_width_tdpi
+        corner_gap = settings.corner_gap_tdpi
+        neckheight = settings.funnel_neck_height_tdpi
+        funneltopwidth = settings.funnel_top_width_tdpi
+        funnelbottomwidth = settings.funnel_top_width_tdpi
+        nosewidth = settings.center_nose_width_tdpi
 
         # noinspection DuplicatedCode
         # X - Points
-        a = self.settings.get(Ct.x_offset_tdpi)
+        a = settings.x_offset_tdpi
         b = a + height - neckheight
         c = a + int(height / 2)
         d = a + height
@@ -297,7 +399,7 @@ class CardBox(Design):
 
         # noinspection DuplicatedCode
         # Y - Points
-        p = self.settings.get(Ct.y_offset_tdpi)
+        p = settings.y_offset_tdpi
         q = p + int(height / 2)
         r = p + height
         s = r + thickness
@@ -336,10 +438,49 @@ class CardBox(Design):
         self.inner_dimensions = [self.tdpi_to_unit(j - e), self.tdpi_to_unit(z - s), self.tdpi_to_unit(d - a)]
         self.outer_dimensions = [self.tdpi_to_unit(k - d), self.tdpi_to_unit(aa - r), self.tdpi_to_unit(e - a)]
 
-        if self.settings.get(C.enforce_design) is EnfordeDesign.SMALL or \
-                (self.tdpi_to_unit(height) <= self.settings.get(C.small_height) and
-                 not self.settings.get(C.enforce_design) is EnfordeDesign.LARGE):
+        # detect boundaries of drawing
+
+        self.left_x, self.right_x, self.top_y, self.bottom_y = self.set_bounds(self.corners)
 
+        if self.verbose:
+            self.__print_dimensons()
+
+    def is_small_design(self, enforce_design: EnfordeDesign) -> bool:
+        """ The small design is used if it is enforced or if the box is not higher than the small height """
+        return enforce_design is EnfordeDesign.SMALL or \
+            (self.tdpi_to_unit(self.settings.height_tdpi) <= self.settings.small_height and
+             not enforce_design is EnfordeDesign.LARGE)
+
+    def variant_cutlines(self, funnel: Funnel, thumbhole: Thumbhole, small: bool) -> list:
+        """ The cutlines of one variant of the box. Only the selected variant is built, the cutlines are
+        indices of the corners and shared by all boxes in the process.
+
+        :param funnel: one or two funnels
+        :param thumbhole: number of thumbholes. A box with one funnel has one thumbhole at most
+        :param small: small or large design
+        :return: cutlines of the variant
+        """
+        thumbhole = self.drawn_thumbhole(funnel, thumbhole)
+
+        # a real funnel has different top and bottom widths
+        is_funnel = not self.settings.funnel_top_width == self.settings.funnel_bottom_width
+
+        key = (funnel, thumbhole, small, is_funnel)
+        cutlines = self.__cutlines_cache.get(key)
+        if cutlines is None:
+            cutlines = self.__build_cutlines(funnel, thumbhole, small, is_funnel)
+            self.__cutlines_cache.put(key, cutlines)
+
+        return cutlines
+
+    @staticmethod
+    def drawn_thumbhole(funnel: Funnel, thumbhole: Thumbhole) -> Thumbhole:
+        """ The thumbholes that are drawn. A box with one funnel has one thumbhole even if two are selected """
+        return Thumbhole.SINGLE if funnel is Funnel.SINGLE and thumbhole is Thumbhole.DUAL else thumbhole
+
+    @staticmethod
+    def __build_cutlines(funnel: Funnel, thumbhole: Thumbhole, small: bool, is_funnel: bool) -> list:
+        if small:
             # small design
             middle_top = [PathStyle.LINE, [21, 28, 29, 33, 32, 36, 37, 41, 40, 45]]
             middle_bottom = [PathStyle.LINE, [26, 31, 30, 34, 35, 39, 38, 42, 43, 50]]
@@ -348,44 +489,13 @@ class CardBox(Design):
             path_around_top = [14, 23, 22, 13, 12, 21, 20, 11, 10, 52, 53, 44, 45, 54, 55, 46, 47, 56]
             path_around_bottom = [48, 49, 58, 59, 50, 51, 60, 61, 19, 18, 27, 26, 17, 16, 25, 24, 15]
 
-            # left top flap path
-            # in all designs the same
             left_top_path = [12, 6, 7, 0]
-            # check if top and bottom funnel width is not equal, so set point 1
-            if not self.settings.get(C.funnel_top_width) == self.settings.get(C.funnel_bottom_width):
-                # there is really a funnel
-                left_top_path.append(1)
-            left_top_path += [4, 14]
-
-            # left bottom flap path
             left_bottom_path = [17, 9, 8, 3]
-            # check if top and bottom funnel width is not equal, so set point 2
-            if not self.settings.get(C.funnel_top_width) == self.settings.get(C.funnel_bottom_width):
-                # there is really a funnel
-                left_bottom_path.append(2)
-            left_bottom_path += [5, 15]
-
-            # right top flap path
-            # in all designs the same
             right_top_path = [54, 62, 63, 68]
-            # check if top and bottom funnel width is not equal, so set point 69
-            if not self.settings.get(C.funnel_top_width) == self.settings.get(C.funnel_bottom_width):
-                # there is really a funnel
-                right_top_path.append(69)
-            right_top_path += [66, 56]
-
-            # left bottom flap path
             right_bottom_path = [59, 65, 64, 71]
-            # check if top and bottom funnel width is not equal, so set point 70
-            if not self.settings.get(C.funnel_top_width) == self.settings.get(C.funnel_bottom_width):
-                # there is really a funnel
-                right_bottom_path.append(70)
-            right_bottom_path += [67, 57]
-
             right_no_funnel_path = [54, 62, 63, 68, 71, 64, 65, 59]
         else:
             # Large design
-            # in all designs the same
             middle_top = [PathStyle.LINE, [12, 28, 29, 33, 32, 36, 37, 41, 40, 54]]
             middle_bottom = [PathStyle.LINE, [17, 31, 30, 34, 35, 39, 38, 42, 43, 59]]
             left_thumbhole = [PathStyle.HALFCIRCLE_NOMOVE, [15, 14, Rotation.CCW]]
@@ -394,111 +504,41 @@ class CardBox(Design):
             path_around_top = [14, 23, 22, 13, 81, 87, 86, 80, 10, 52, 94, 90, 91, 95, 55, 46, 47, 56]
             path_around_bottom = [48, 49, 58, 98, 92, 93, 99, 61, 19, 85, 89, 88, 84, 16, 25, 24, 15]
 
-            # left top flap path
-            # in all designs the same
             left_top_path = [82, 77, 76, 72, 73, 0]
-            # check if top and bottom funnel width is not equal, so set point 1
-            if not self.settings.get(C.funnel_top_width) == self.settings.get(C.funnel_bottom_width):
-                # there is really a funnel
-                left_top_path.append(1)
-            left_top_path += [4, 14]
-
-            # left bottom flap path
             left_bottom_path = [83, 78, 79, 75, 74, 3]
-            # check if top and bottom funnel width is not equal, so set point 2
-            if not self.settings.get(C.funnel_top_width) == self.settings.get(C.funnel_bottom_width):
-                # there is really a funnel
-                left_bottom_path.append(2)
-            left_bottom_path += [5, 15]
-
-            # right top flap path
-            # in all designs the same
             right_top_path = [96, 101, 100, 104, 105, 68]
-            # check if top and bottom funnel width is not equal, so set point 69
-            if not self.settings.get(C.funnel_top_width) == self.settings.get(C.funnel_bottom_width):
-                # there is really a funnel
-                right_top_path.append(69)
-            right_top_path += [66, 56]
-
-            # left bottom flap path
             right_bottom_path = [97, 102, 103, 107, 106, 71]
-            # check if top and bottom funnel width is not equal, so set point 70
-            if not self.settings.get(C.funnel_top_width) == self.settings.get(C.funnel_bottom_width):
-                # there is really a funnel
-                right_bottom_path.append(70)
-            right_bottom_path += [67, 57]
-
             right_no_funnel_path = [96, 101, 100, 104, 105, 68, 71, 106, 107, 103, 102, 97]
 
-        self.cutlines_double_funnel_no_thumbholes = [
-            middle_top,
-            middle_bottom,
-            [PathStyle.LINE, left_top_path],
-            [PathStyle.LINE, left_bottom_path],
-            [PathStyle.LINE, right_top_path],
-            [PathStyle.LINE, right_bottom_path],
-            [PathStyle.LINE, path_around_top],
-            [PathStyle.LINE_NOMOVE, [57]],
-            [PathStyle.LINE_NOMOVE, path_around_bottom],
-            [PathStyle.LINE_NOMOVE, [14]],
-        ]
-
-        self.cutlines_double_funnel_single_thumbhole = [
-            middle_top,
-            middle_bottom,
-            [PathStyle.LINE, left_top_path],
-            [PathStyle.LINE, left_bottom_path],
-            [PathStyle.LINE, right_top_path],
-            [PathStyle.LINE, right_bottom_path],
-            [PathStyle.LINE, path_around_top],
-            [PathStyle.LINE_NOMOVE, [57]],
-            [PathStyle.LINE_NOMOVE, path_around_bottom],
-            left_thumbhole
-        ]
-
-        self.cutlines_double_funnel_double_thumbholes = [
-            middle_top,
-            middle_bottom,
-            [PathStyle.LINE, left_top_path],
-            [PathStyle.LINE, left_bottom_path],
-            [PathStyle.LINE, right_top_path],
-            [PathStyle.LINE, right_bottom_path],
-            [PathStyle.LINE, path_around_top],
-            right_thumbhole,
-            [PathStyle.LINE_NOMOVE, path_around_bottom],
-            left_thumbhole
-        ]
-
-        self.cutlines_single_funnel_no_thumbholes = [
-            middle_top,
-            middle_bottom,
-            [PathStyle.LINE, left_top_path],
-            [PathStyle.LINE, left_bottom_path],
-            [PathStyle.LINE, right_no_funnel_path],
-            [PathStyle.LINE, path_around_top],
-            [PathStyle.LINE_NOMOVE, [57]],
-            [PathStyle.LINE_NOMOVE, path_around_bottom],
-            [PathStyle.LINE_NOMOVE, [14]],
-        ]
-
-        self.cutlines_single_funnel_single_thumbhole = [
-            middle_top,
-            middle_bottom,
-            [PathStyle.LINE, left_top_path],
-            [PathStyle.LINE, left_bottom_path],
-            [PathStyle.LINE, right_no_funnel_path],
-            [PathStyle.LINE, path_around_top],
-            [PathStyle.LINE_NOMOVE, [57]],
-            [PathStyle.LINE_NOMOVE, path_around_bottom],
-            left_thumbhole
-        ]
-
-        # detect boundaries of drawing
+        # the flaps end at the funnel. With different top and bottom widths of the funnel there is a
+        # point 1, 2, 69 and 70 between them
+        left_top_path += ([1] if is_funnel else []) + [4, 14]
+        left_bottom_path += ([2] if is_funnel else []) + [5, 15]
+        right_top_path += ([69] if is_funnel else []) + [66, 56]
+        right_bottom_path += ([70] if is_funnel else []) + [67, 57]
 
-        self.left_x, self.right_x, self.top_y, self.bottom_y = self.set_bounds(self.corners)
+        if funnel is Funnel.DUAL:
+            right_paths = [[PathStyle.LINE, right_top_path], [PathStyle.LINE, right_bottom_path]]
+        else:
+            right_paths = [[PathStyle.LINE, right_no_funnel_path]]
 
-        if self.verbose:
-            self.__print_dimensons()
+        # the right thumbhole is only cut in boxes with two funnels
+        if funnel is Funnel.DUAL and thumbhole is Thumbhole.DUAL:
+            right_end = right_thumbhole
+        else:
+            right_end = [PathStyle.LINE_NOMOVE, [57]]
+
+        left_end = [PathStyle.LINE_NOMOVE, [14]] if thumbhole is Thumbhole.NONE else left_thumbhole
+
+        return [middle_top,
+                middle_bottom,
+                [PathStyle.LINE, left_top_path],
+                [PathStyle.LINE, left_bottom_path],
+                *right_paths,
+                [PathStyle.LINE, path_around_top],
+                right_end,
+                [PathStyle.LINE_NOMOVE, path_around_bottom],
+                left_end]
 
     def __print_dimensons(self):
         print(
@@ -1,5 +1,6 @@
 from datetime import datetime
 from classes.Design import Design
+from classes.Settings import Settings, Setting, number
 from classes.PathStyle import PathStyle
 from classes.Template import Template
 from classes.Direction import Rotation
@@ -14,12 +15,6 @@ class C:
     x_separation = 'x separation'
     y_separation = 'y separation'
 
-    x_measure_tdpi = f'{x_measure}{Ct.tdpi}'
-    y_measure_tdpi = f'{y_measure}{Ct.tdpi}'
-    corner_radius_tdpi = f'{corner_radius}{Ct.tdpi}'
-    x_separation_tdpi = f'{x_separation}{Ct.tdpi}'
-    y_separation_tdpi = f'{y_separation}{Ct.tdpi}'
-
     rows = 'rows'
     columns = 'columns'
     template_card_name = 'template card name'
@@ -30,26 +25,33 @@ class T:
     footer_card_height = '$FOOTER_CARD_HEIGHT$'
 
 
-class CardSheet(Design):
-    # Default values
-    __DEFAULT_FILENAME: str = 'CardSheet'
-    __DEFAULT_TEMPLATE_FILE: str = 'CardSheet.svg'
-    __DEFAULT_TEMPLATE_CARD_FILE: str = 'Card.svg'
+class CardSheetSettings(Settings):
+    __slots__ = ()
+
+    template_file = Setting(Ct.template_file, str, 'CardSheet.svg')
+    template_card_name = Setting(C.template_card_name, str, 'Card.svg')
 
     # number of rows and columns of cards per sheet
-    __DEFAULT_COLUMNS: int = 2
-    __DEFAULT_ROWS: int = 4
+    columns = Setting(C.columns, int, 2)
+    rows = Setting(C.rows, int, 4)
 
     # distance between single rows and columns
-    __DEFAULT_X_SEPARATION: float = 0.0
-    __DEFAULT_Y_SEPARATION: float = 0.0
+    x_separation = Setting(C.x_separation, number, 0.0, measure=True)
+    y_separation = Setting(C.y_separation, number, 0.0, measure=True)
 
     # corner radius of the cards. 0.0 produces rectangular cards
-    __DEFAULT_CORNER_RADIUS: float = 3.0
+    corner_radius = Setting(C.corner_radius, number, 3.0, measure=True)
 
     # standard size of cards is European
-    __DEFAULT_X_MEASURE: float = 89.0
-    __DEFAULT_Y_MEASURE: float = 55.0
+    x_measure = Setting(C.x_measure, number, 89.0, measure=True)
+    y_measure = Setting(C.y_measure, number, 55.0, measure=True)
+
+
+class CardSheet(Design):
+    # Default values
+    __DEFAULT_FILENAME: str = 'CardSheet'
+    __DEFAULT_TEMPLATE_FILE: str = 'CardSheet.svg'
+    __DEFAULT_TEMPLATE_CARD_FILE: str = 'Card.svg'
 
     # Enums
     # TODO: Inner class enums?
@@ -58,57 +60,39 @@ class CardSheet(Design):
     __CUTLINES_CARD_TOP_OPEN: int = 2
     __CUTLINES_CARD_TOPLEFT_OPEN: int = 3
 
+    settings_class = CardSheetSettings
+
     def __init__(self,  **kwargs):
         super().__init__(kwargs)
 
-        self.settings.update({C.x_measure: self.__DEFAULT_X_MEASURE,
-                              C.y_measure: self.__DEFAULT_Y_MEASURE,
-                              C.corner_radius: self.__DEFAULT_CORNER_RADIUS,
-                              C.x_separation: self.__DEFAULT_X_SEPARATION,
-                              C.y_separation: self.__DEFAULT_Y_SEPARATION,
-                              C.rows: self.__DEFAULT_ROWS,
-                              C.columns: self.__DEFAULT_COLUMNS,
-                              Ct.template_file: self.__DEFAULT_TEMPLATE_FILE,
-                              C.template_card_name: self.__DEFAULT_TEMPLATE_CARD_FILE,
-
-                              })
-        self.add_settings_measures([C.x_measure, C.y_measure, C.corner_radius, C.x_separation, C.y_separation])
-
         # : encloses config values to replace
-        self.settings[
-            Ct.title] = f'{self.get_project_name_for_title()}' \
-                        f'{self.__DEFAULT_FILENAME}-{self.settings.get(C.x_measure)}-{self.settings.get(C.y_measure)}' \
-                        f'-{datetime.now().strftime("%Y%m%d-%H%M%S")}'
+        self.settings.title = f'{self.get_project_name_for_title()}' \
+                              f'{self.__DEFAULT_FILENAME}-{self.settings.x_measure}-{self.settings.y_measure}' \
+                              f'-{datetime.now().strftime("%Y%m%d-%H%M%S")}'
 
         self.load_settings(self.config_file_and_section)
 
-        self.convert_settings_measures_to_tdpi()
-
     def create(self):
         # noinspection DuplicatedCode
         self.__init_design()
 
         card_template = Template.load_template(self.__DEFAULT_TEMPLATE_CARD_FILE)
 
-        if self.settings[C.corner_radius] == 0:
-            base_cut = [self.draw_paths(self.corners, self.cutlines_nocorners[self.__CUTLINES_CARD_FULL]),
-                        self.draw_paths(self.corners, self.cutlines_nocorners[self.__CUTLINES_CARD_TOP_OPEN]),
-                        self.draw_paths(self.corners, self.cutlines_nocorners[self.__CUTLINES_CARD_LEFT_OPEN]),
-                        self.draw_paths(self.corners, self.cutlines_nocorners[self.__CUTLINES_CARD_TOPLEFT_OPEN])
-                        ]
-        else:
-            base_cut = [self.draw_paths(self.corners, self.cutlines[self.__CUTLINES_CARD_FULL]),
-                        self.draw_paths(self.corners, self.cutlines[self.__CUTLINES_CARD_TOP_OPEN]),
-                        self.draw_paths(self.corners, self.cutlines[self.__CUTLINES_CARD_LEFT_OPEN]),
-                        self.draw_paths(self.corners, self.cutlines[self.__CUTLINES_CARD_TOPLEFT_OPEN])
-                        ]
-
-        rows = self.settings.get(C.rows)
-        columns = self.settings.get(C.columns)
-        x_separation = self.settings.get(C.x_separation)
-        y_separation = self.settings.get(C.y_separation)
-        x_measure = self.settings.get(C.x_measure)
-        y_measure = self.settings[C.y_measure]
+        cutlines = self.cutlines_nocorners if self.settings.corner_radius == 0 else self.cutlines
+        base_cut = [self.draw_path_data(self.corners, cutlines[self.__CUTLINES_CARD_FULL]),
+                    self.draw_path_data(self.corners, cutlines[self.__CUTLINES_CARD_TOP_OPEN]),
+                    self.draw_path_data(self.corners, cutlines[self.__CUTLINES_CARD_LEFT_OPEN]),
+                    self.draw_path_data(self.corners, cutlines[self.__CUTLINES_CARD_TOPLEFT_OPEN])
+                    ]
+
+        rows = self.settings.rows
+        columns = self.settings.columns
+        x_separation = self.settings.x_separation
+        y_separation = self.settings.y_separation
+        x_measure = self.settings.x_measure
+        y_measure = self.settings.y_measure
+        x_offset = self.settings.x_offset
+        y_offset = self.settings.y_offset
 
         output = ''
         for row in range(rows):
@@ -132,12 +116,12 @@ class CardSheet(Design):
                     elif row != 0 and col != 0:
                         svgpath = base_cut[self.__CUTLINES_CARD_TOPLEFT_OPEN]
 
+                # the card is moved to its place in the numeric path
+                svgpath = svgpath.translate(self.unit_to_tdpi(x_offset + (x_measure + x_separation) * col),
+                                            self.unit_to_tdpi(y_offset + (y_measure + y_separation) * row))
+
                 template = {Cm.id: f'{row} - {col}',
-                            Cm.svgpath: svgpath,
-                            Cm.translate: str(
-                                self.unit_to_dpi(
-                                    self.settings.get(Ct.x_offset) + (x_measure + x_separation) * col)) + ', ' + str(
-                                self.unit_to_dpi(self.settings.get(Ct.y_offset) + (y_measure + y_separation) * row))
+                            Cm.svgpath: svgpath.to_svg()
                             }
 
                 temp = card_template
@@ -149,19 +133,22 @@ class CardSheet(Design):
         self.template_variables[Ct.template_file] = self.__DEFAULT_TEMPLATE_FILE
         self.template_variables[Cm.svgpath] = output
 
-        self.template_variables[T.footer_card_width] = str(self.settings.get(C.x_measure)) + ' ' + self.settings.get(Ct.unit)
-        self.template_variables[T.footer_card_height] = str(self.settings.get(C.y_measure)) + ' ' + self.settings.get(Ct.unit)
+        self.template_variables[T.footer_card_width] = str(x_measure) + ' ' + self.settings.unit
+        self.template_variables[T.footer_card_height] = str(y_measure) + ' ' + self.settings.unit
 
-        viewbox_x = round(self.settings.get(Ct.x_offset_tdpi) + (self.right_x - self.left_x) * columns
+        viewbox_x = round(self.settings.x_offset_tdpi + (self.right_x - self.left_x) * columns
                           + x_separation * self.conversion_factor() * (columns - 1))
-        viewbox_y = round(self.settings.get(Ct.y_offset_tdpi) + (self.bottom_y - self.top_y) * rows
+        viewbox_y = round(self.settings.y_offset_tdpi + (self.bottom_y - self.top_y) * rows
                           + y_separation * self.conversion_factor() * (rows - 1))
 
         self.template_variables[Cm.viewbox_x] = viewbox_x
         self.template_variables[Cm.viewbox_y] = viewbox_y
 
         self.write_to_file(self.template_variables)
-        print(f'CardSheet "{self.settings.get(Ct.filename)}" created')
+        print(f'CardSheet {self.written_files()} created')
+
+    def templates(self) -> list:
+        return [self.__DEFAULT_TEMPLATE_FILE, self.__DEFAULT_TEMPLATE_CARD_FILE]
 
     def __init_design(self):
 
@@ -204,11 +191,11 @@ class CardSheet(Design):
         # |   TO   |  TLO   |
         # |--------|--------|
 
-        x_measure = self.settings.get(C.x_measure_tdpi)
-        y_meaure = self.settings.get(C.y_measure_tdpi)
-        corner_radius = self.settings.get(C.corner_radius_tdpi)
-        x_offset = self.settings.get(Ct.x_offset)
-        y_offset = self.settings.get(Ct.y_offset)
+        x_measure = self.settings.x_measure_tdpi
+        y_meaure = self.settings.y_measure_tdpi
+        corner_radius = self.settings.corner_radius_tdpi
+        x_offset = self.settings.x_offset
+        y_offset = self.settings.y_offset
 
         # X - Points
         a = x_offset
@@ -0,0 +1,147 @@
+import re
+from xml.etree import ElementTree
+from classes.Design import Design
+from classes.File import File
+from classes.Part import Part
+from classes.Settings import Settings, Setting, number
+from classes.StripDirection import StripDirection
+from classes.ConfigConstants import ConfigConstantsText as Ct
+from classes.ConfigConstants import ConfigConstantsTemplate as Cm
+
+
+class C:
+    combined = 'combined'
+    combined_spacing = 'combined spacing'
+    combined_direction = 'combined direction'
+
+    svg_namespace = 'http://www.w3.org/2000/svg'
+    xlink_namespace = 'http://www.w3.org/1999/xlink'
+    inkscape_namespace = 'http://www.inkscape.org/namespaces/inkscape'
+
+
+class CombinedSheetSettings(Settings):
+    __slots__ = ()
+
+    template_file = Setting(Ct.template_file, str, 'CombinedSheet.svg')
+
+    # distance between the parts and to the border of the sheet
+    combined_spacing = Setting(C.combined_spacing, number, 5, measure=True)
+
+    # the parts are placed in a row or in a column
+    combined_direction = Setting(C.combined_direction, StripDirection, StripDirection.HORIZONTAL)
+
+
+class CombinedSheet(Design):
+    """ Writes all parts of a project into one SVG. Every part is a layer of its own, the parts are placed
+    side by side along a strip. Styles used by several parts are written only once and the ids of each part
+    get the name of its layer as prefix that they are unique in the document.
+    """
+    __DEFAULT_FILENAME = 'Combined'
+
+    # url(#id) references in attributes
+    __URL_REFERENCE = re.compile(r'url\(#([^)]+)\)')
+
+    settings_class = CombinedSheetSettings
+
+    def __init__(self, **kwargs):
+        super().__init__(kwargs)
+
+        # the parts to combine. The combined sheet itself is no part
+        self.combined_parts = self.parts if self.parts is not None else []
+        self.parts = None
+
+        # the kerf is already compensated in the parts
+        self.settings.kerf = 0
+
+    def create(self, title: str = None) -> None:
+        """
+        :param title: title of the sheet, the filename is made from it. Without a title the sheet is named after
+                      the project
+        :return:
+        """
+        spacing = self.settings.combined_spacing_tdpi
+        horizontal = self.settings.combined_direction == StripDirection.HORIZONTAL
+
+        ElementTree.register_namespace('', C.svg_namespace)
+        ElementTree.register_namespace('xlink', C.xlink_namespace)
+        ElementTree.register_namespace('inkscape', C.inkscape_namespace)
+
+        styles = []
+        layers = []
+
+        # position along the strip and the size of the biggest part across the strip
+        position = spacing
+        extent = 0
+
+        for number_of_part, part in enumerate(self.combined_parts, start=1):
+            x, y = (position, spacing) if horizontal else (spacing, position)
+            layers.append(self.__layer(part, f'layer-{number_of_part}', x, y, styles))
+
+            position += (part.width if horizontal else part.height) + spacing
+            extent = max(extent, part.height if horizontal else part.width)
+
+        across = extent + 2 * spacing
+
+        self.settings.title = title or f'{self.get_project_name_for_title()}{self.__DEFAULT_FILENAME}'
+        self.settings.filename = File.set_svg_extension(Design.make_safe_filename(self.settings.title))
+
+        self.template_variables = {Ct.template_file: self.settings.template_file,
+                                   Cm.styles: ''.join(styles),
+                                   Cm.svgpath: ''.join(layers),
+                                   Cm.viewbox_x: position if horizontal else across,
+                                   Cm.viewbox_y: across if horizontal else position}
+
+        self.write_to_file(self.template_variables)
+        print(f'Combined sheet {self.written_files()} with {len(self.combined_parts)} parts created')
+
+    def __layer(self, part: Part, layer_id: str, x: int, y: int, styles: list) -> str:
+        """ The drawing of a part as layer without its labels. The styles of the part are added to the styles
+        of the document if they are new.
+
+        :param part: part to place
+        :param layer_id: id of the layer, prefix for the ids in the part
+        :param x: left side of the part on the sheet in tdpi
+        :param y: upper side of the part on the sheet in tdpi
+        :param styles: styles of the document
+        :return: SVG of the layer
+        """
+        root = ElementTree.fromstring(part.svg)
+        self.__prefix_ids(root, layer_id)
+
+        layer = ElementTree.Element(f'{{{C.svg_namespace}}}g',
+                                    {'id': layer_id,
+                                     f'{{{C.inkscape_namespace}}}groupmode': 'layer',
+                                     f'{{{C.inkscape_namespace}}}label': part.name,
+                                     'transform': f'translate({Design.tdpi_to_dpi(x)}, {Design.tdpi_to_dpi(y)})'})
+
+        for elem in root:
+            tag = elem.tag.rsplit('}', 1)[-1]
+            if tag == 'title' or elem.attrib.get('id') == f'{layer_id}-document-labels':
+                continue
+
+            if tag == 'style':
+                style = f'    {ElementTree.tostring(elem, encoding="unicode").strip()}\n'
+                if style not in styles:
+                    styles.append(style)
+                continue
+
+            layer.append(elem)
+
+        return f'    {ElementTree.tostring(layer, encoding="unicode")}\n'
+
+    @classmethod
+    def __prefix_ids(cls, root: ElementTree.Element, prefix: str) -> None:
+        """ Puts the prefix in front of all ids of the drawing and of the references to them """
+        ids = {elem.attrib['id'] for elem in root.iter() if 'id' in elem.attrib}
+
+        def reference(match) -> str:
+            return f'url(#{prefix}-{match.group(1)})' if match.group(1) in ids else match.group(0)
+
+        for elem in root.iter():
+            for name, value in list(elem.attrib.items()):
+                if name == 'id':
+                    elem.set(name, f'{prefix}-{value}')
+                elif name.endswith('href') and value.startswith('#') and value[1:] in ids:
+                    elem.set(name, f'#{prefix}-{value[1:]}')
+                elif 'url(#' in value:
+                    elem.set(name, cls.__URL_REFERENCE.sub(reference, value))
@@ -1,7 +1,8 @@
 import configparser
 import os
-import sys
 from classes.File import File
+from classes.LruCache import LruCache
+from classes.InsertMakerError import ConfigError
 from classes.ConfigConstants import ConfigConstantsText as c
 
 
@@ -11,6 +12,9 @@ class C:
 
 class Config:
 
+    # parsed configuration files of the process by their name with the time of the last modification and the size
+    __files = LruCache(256)
+
     @classmethod
     # def read_config(cls, filename: str, section: str, defaults=None):
     def read_config(cls, filename_and_section: str, defaults=None):
@@ -28,21 +32,60 @@ class Config:
 
         # read entries from the configuration file
         # config = configparser.ConfigParser(defaults=defaults)
-        config = configparser.ConfigParser()
-        config.read(config_file)
+        config = cls.read_config_file(config_file)
+
+        cls.check_section(config, config_file, config_section)
+
+        return config
+
+    @classmethod
+    def read_config_file(cls, config_file: str) -> configparser.ConfigParser:
+        """ Read all sections of a configuration file. A file is parsed only once as long as it is unchanged.
+        The config object is shared and must not be modified.
+
+        :param config_file: config filename
+        :return: config object
+        """
+        try:
+            status = os.stat(config_file)
+            key = (os.path.abspath(config_file), status.st_mtime_ns, status.st_size)
+        except OSError:
+            key = None
+
+        config = cls.__files.get(key) if key is not None else None
+        if config is None:
+            config = configparser.ConfigParser()
+            try:
+                config.read(config_file)
+            except configparser.DuplicateSectionError as e:
+                raise ConfigError(f'Duplicate Section {e.args[0]} in file {e.args[1]} in line {e.args[2]}'
+                                  f'\nPlease correct this line and run configMaker again.') from e
+            except configparser.Error as e:
+                raise ConfigError(f'Config file {config_file} can not be read. {e}') from e
+            if key is not None:
+                cls.__files.put(key, config)
 
+        return config
+
+    @staticmethod
+    def check_section(config: configparser.ConfigParser, config_file: str, config_section: str) -> None:
+        """ Raise an error if the section does not exist in the configuration
+
+        :param config: config object read from the file
+        :param config_file: config filename
+        :param config_section: section that must exist
+        :return:
+        """
         # Test if requested section exists
         if not config.has_section(config_section):
-            print(f'Sections in file {config_file}')
+            error = f'Sections in file {config_file}\n'
             for part in config.sections():
-                print(part)
-            print('Section ' + config_section + ' in config file ' + config_file)
+                error += f'{part}\n'
+            error += 'Section ' + config_section + ' in config file ' + config_file
             if config_section[0] == '"' or config_section[-1] == '"' or config_section[0] == '"' \
                     or config_section[-1] == '"':
-                print('Please remove the quotation marks around the section!')
-            sys.exit(-1)
-
-        return config
+                error += '\nPlease remove the quotation marks around the section!'
+            raise ConfigError(error)
 
     @classmethod
     # def get_style(cls, filename: str, section: str):
@@ -56,13 +99,12 @@ class Config:
 
         filename, section = Config.get_config_file_and_section(filename_and_section)
 
-        style = config.get(section, C.design)
+        style = config.get(section, C.design, fallback=None)
 
         if style is None:
-            print(f'Config file {filename} with Section {section} has no style entry.')
-            sys.exit(-1)
+            raise ConfigError(f'Config file {filename} with Section {section} has no style entry.')
 
-        return config.get(section, C.design)
+        return style
 
     @classmethod
     def get_sections(cls, file_and_path: str):
@@ -72,16 +114,7 @@ class Config:
         :return: list of section names that are in the given config file
         """
         cls.file_exists(file_and_path)
-        config = configparser.ConfigParser()
-        try:
-            config.read(file_and_path)
-
-        except configparser.DuplicateSectionError as e:
-            print(
-                f'Duplicate Section {e.args[0]} in file {e.args[1]} in line {e.args[2]}'
-                f'\nPlease correct this line and run configMaker again.')
-
-            sys.exit(-1)
+        config = cls.read_config_file(file_and_path)
 
         # return all sections in the project file
         return config.sections()
@@ -107,8 +140,7 @@ class Config:
         """
         # Test if configuration file exists
         if not os.path.isfile(file):
-            print('File ' + file + ' does not exist')
-            sys.exit(-1)
+            raise ConfigError('File ' + file + ' does not exist')
         return True
 
     @staticmethod
@@ -178,16 +210,15 @@ class Config:
 
         # If the separation character is missing here then there is no valid config information.
         if c.config_separator not in file_and_section:
-            print(f'Missing section for config file "{file_and_section}". I.e. /foo/bar#the_section')
-            sys.exit(-1)
+            raise ConfigError(f'Missing section for config file "{file_and_section}". I.e. /foo/bar#the_section')
 
         # split config informsation at config separator
         split = file_and_section.rsplit(c.config_separator)
 
         # Only one separation character is allowed.
         if len(split) != 2:
-            print(f'There must be only a single separator "{c.config_separator}" in the {file_and_section}.')
-            sys.exit(-1)
+            raise ConfigError(f'There must be only a single separator "{c.config_separator}" '
+                              f'in the {file_and_section}.')
 
         filename = split[0]
         section = split[1]
@@ -197,8 +228,7 @@ class Config:
 
         # Test if configuration file exists
         if not os.path.isfile(filename):
-            print(f'Config file  {filename} does not exist. ')
-            sys.exit(-1)
+            raise ConfigError(f'Config file  {filename} does not exist. ')
 
         return filename, section
 
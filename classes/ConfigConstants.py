@@ -2,6 +2,10 @@ class ConfigConstantsText:
     # command line text
     verbose = 'verbose'
     noprint = 'noprint'
+    force = 'force'
+    nowrite = 'nowrite'
+    keep_going = 'keep going'
+    drawings = 'drawings'
 
     # ConfigConstants for Project.py
     config_file = 'config file'
@@ -16,6 +20,9 @@ class ConfigConstantsText:
     project_name = 'project name'
     template_file = 'template file'
     options = 'option'
+    layers = 'layers'
+    parts = 'parts'
+    settings = 'settings'
     tdpi = '_tdpi'
 
     # General ConfigConstant
@@ -30,6 +37,12 @@ class ConfigConstantsText:
     stroke_width = 'stroke width'
     vertical_separation = 'vertical separation'
     y_text_spacing = 'y text spacing'
+    arc_tolerance = 'arc tolerance'
+    kerf = 'kerf'
+    export_formats = 'export formats'
+    targets = 'targets'
+    feed_rate = 'feed rate'
+    travel_rate = 'travel rate'
 
     x_offset_tdpi = 'x offset_tdpi'
     y_offset_tdpi = 'y offset_tdpi'
@@ -70,6 +83,7 @@ class ConfigConstantsTemplate:
     viewbox = '$VIEWBOX$'
     id = '$ID$'
     svgpath = '$SVGPATH$'
+    styles = '$STYLES$'
     translate = '$TRANSLATE$'
     translate_x = '$TRANSLATE_X$'
     translate_y = '$TRANSLATE_Y$'
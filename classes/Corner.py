@@ -6,6 +6,7 @@ from datetime import datetime
 from classes.Design import Design
 from classes.Direction import Direction
 from classes.PathStyle import PathStyle
+from classes.InsertMakerError import ConfigError
 
 
 class Corner:
@@ -39,8 +40,7 @@ class Corner:
         if self.args.c:
             # config file was chosen
             if not self.args.C:
-                print("No section of config file\n-c <config-file> -C <section of config file>")
-                sys.exit(-1)
+                raise ConfigError("No section of config file\n-c <config-file> -C <section of config file>")
             self.__config_from_file(self.args.c, self.args.C)
         else:
             # CLI was chosen
@@ -144,16 +144,14 @@ class Corner:
         config_file = 'config/' + filename + ".config"
         # Read default values from the config file
         if not os.path.isfile(config_file):
-            print("Config file config/" + filename + ".config not found")
-            sys.exit(-1)
+            raise ConfigError("Config file config/" + filename + ".config not found")
 
         # read entries from the configuration file
         config = configparser.ConfigParser(defaults=defaults)
         config.read(config_file)
 
         if not config.has_section(section):
-            print("Section " + section + " in config file config/" + filename + ".config not found")
-            sys.exit(-1)
+            raise ConfigError("Section " + section + " in config file config/" + filename + ".config not found")
 
         self.project = config[section]['project name'].strip('"')
         self.outfile = config[section]['filename'].strip('"')
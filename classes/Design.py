@@ -1,15 +1,30 @@
+import os
+import re
 import sys
 import json
+import hashlib
 from json import JSONDecodeError
 from xml.etree import ElementTree
 from xml.dom import minidom
 from datetime import datetime
 from abc import ABC, abstractmethod
 from classes.Config import Config
+from classes.ProjectLock import ProjectLock
 from classes.Direction import Direction, Rotation
 from classes.PathStyle import PathStyle
 from classes.Template import Template
 from classes.File import File
+from classes.Writer import Writer
+from classes.Part import Part
+from classes.PathGeometry import PathGeometry
+from classes.PathData import PathData
+from classes.Kerf import Kerf
+from classes.Exporter import Exporter
+from classes.Target import Target
+from classes.Settings import Settings, SettingsLayers
+from classes.Plan import Plan
+from classes.Plan import C as Cp
+from classes.InsertMakerError import DesignError, SettingsError
 from classes.ConfigConstants import ConfigConstantsText as Ct
 from classes.ConfigConstants import ConfigConstantsTemplate as Cm
 
@@ -32,15 +47,6 @@ class Design(ABC):
     __DEFAULT_SECTION_NAME = 'STANDARD'
     __DEFAULT_CONFIG_FILE = 'InsertMaker.config'
 
-    # Fallback settings when InsertMaker.config is missing
-    __DEFAULT_X_OFFSET = 1.0
-    __DEFAULT_Y_OFFSET = 2.0
-    __DEFAULT_Y_TEXT_SPACING = 7
-    __DEFAULT_THICKNESS = 1.5
-    __DEFAULT_STROKE_COLOR = '#aaaaaa'
-    __DEFAULT_STROKE_DASHARRAY = '0,0'
-    __DEFAULT_STROKE_WIDTH = 2
-
     # Default path  and extension definitions
     __TEMPLATE_PATH = 'templates'
 
@@ -49,46 +55,38 @@ class Design(ABC):
     __UNIT_MIL_TEXT = Ct.unit_mil
     __DEFAULT_UNIT = __UNIT_MM_TEXT
 
-    # Default measure keys, text keys
-    # x offset       : left offset of the whole SVG drawing
-    # y offset       : top offset of the whole SVG drawing
-    # y text spacing : vertical spacing of the describing text lines at the bottom of the drawing
-    # thickness      : thickness of the uses material
-    # stroke width   : stroke width of the lines in the SVG drawing
-    __settings_standard_measures = [Ct.x_offset, Ct.y_offset, Ct.y_text_spacing, Ct.thickness, Ct.stroke_width,
-                                    Ct.resolution]
+    # typed settings of the design. Overridden by the designs with their own settings
+    settings_class = Settings
 
-    # unit             : used unit in the settings (mm or mil)
-    # stroke color     : color of the lines drawn in the SVG image
-    # stroke dasharray : pattern of the lines drawn in the SVG image
-    # resolution       : resolution of the SVG drawing
-    __settings_standard_texts = [Ct.unit, Ct.stroke_color, Ct.stroke_dasharray, Ct.resolution]
+    # conversion values for unit<->tdpi
+    __conversion_factor = {Ct.unit_mm: (__RESOLUTION * (10 ** __PRECISION)) / 25.4,
+                           Ct.unit_mil: (__RESOLUTION * (10 ** __PRECISION))
+                           }
 
-    # The nonstandard keys are design dependend and cannot be in the global settings InsertMaker.config
-    # title         : title of the drawing
-    # filename      : filename of the utput file
-    # project name  : project (i.e. boardgame) to which the design belongs
-    # template name : SVG template to use for the design
-    __settings_nonstandards = [Ct.title, Ct.filename, Ct.project_name, Ct.template_file]
+    __default_configuration = {}
 
-    # all measure keys
-    __settings_measures = __settings_standard_measures
+    # format of the drawing itself. The other formats are written by the exporters
+    __SVG_FORMAT = 'svg'
 
-    # all text keys. Standard and nonstandard
-    __settings_texts = __settings_standard_texts + __settings_nonstandards
+    # settings that change only the labels and the written files of a drawing, not its paths
+    __LABEL_SETTINGS = (Ct.title, Ct.filename, Ct.project_name, Ct.export_formats, Ct.feed_rate, Ct.travel_rate,
+                        Ct.targets)
 
-    # boolean configuration keys
-    __settings_boolean = []
+    # time of the run at the end of the default titles
+    __TITLE_TIMESTAMP = re.compile(r'\d{8}-\d{6}$')
 
-    # enumerations in config
-    __settings_enum = {}
+    # values of a template with path elements, the values are separated while their paths are changed together
+    __PATH_ELEMENT = re.compile(r'<(path|use)\b')
+    __VALUE_SEPARATOR = '<!--$VALUE$-->'
 
-    # conversion values for unit<->tdpi
-    __conversion_factor = {Ct.unit_mm: (__RESOLUTION * (10 ** __PRECISION)) / 25.4,
-                           Ct.unit_mil: (__RESOLUTION * (10 ** __PRECISION))
-                           }
+    # group around the path elements of a drawing without its template
+    __PATHS_ROOT = ('<g xmlns="http://www.w3.org/2000/svg" xmlns:xlink="http://www.w3.org/1999/xlink">', '</g>')
 
-    __default_configuration = {}
+    # d attribute of a path element
+    __PATH_DATA = re.compile(r'(<path\b[^>]*?\sd=")([^"]*)(")')
+
+    # settings from the InsertMaker.config, shared by all designs
+    __standard_layers = None
 
     measures = {}
 
@@ -96,32 +94,31 @@ class Design(ABC):
 
         self.config_file_and_section = args.get(Ct.config_file_and_section)
 
-        # default settings
-        self.settings = {Ct.x_offset: self.__DEFAULT_X_OFFSET,
-                         Ct.y_offset: self.__DEFAULT_Y_OFFSET,
-                         Ct.y_text_spacing: self.__DEFAULT_Y_TEXT_SPACING,
-                         Ct.thickness: self.__DEFAULT_THICKNESS,
-                         Ct.title: f'{__class__.__name__}-{datetime.now().strftime("%Y%m%d-%H%M%S")}',
-                         Ct.filename: '',
-                         Ct.project_name: '',
-                         Ct.template_file: '',
-                         Ct.unit: self.__DEFAULT_UNIT,
-                         Ct.resolution: self.__RESOLUTION,
-                         Ct.stroke_color: self.__DEFAULT_STROKE_COLOR,
-                         Ct.stroke_width: self.__DEFAULT_STROKE_WIDTH,
-                         Ct.stroke_dasharray: self.__DEFAULT_STROKE_DASHARRAY,
-                         }
-
-        # Overwrite the internal default config with the settings from the Insertmaker.config
-        self.__read_config(f'{self.__DEFAULT_CONFIG_FILE}{Ct.config_separator}{self.__DEFAULT_SECTION_NAME}')
+        # The default settings of the settings class are overwritten by the shared layers with the
+        # settings from the InsertMaker.config and the project
+        layers = args.get(Ct.layers)
+        if layers is None:
+            layers = Design.standard_layers()
 
         # Overwrite the combined default/InsertMaker settings with the ones from the command line
         if Ct.options in args:
-            options = args.get(Ct.options)
-            self.__update_settings_with_options(options)
+            layers = layers.new_child(args.get(Ct.options))
+
+        self.settings = self.new_settings(layers)
+        self.settings.title = f'{__class__.__name__}-{datetime.now().strftime("%Y%m%d-%H%M%S")}'
 
         self.verbose = args.get(Ct.verbose, False)
         self.noprint = args.get(Ct.noprint, False)
+        self.force = args.get(Ct.force, False)
+
+        # list that collects the written drawings, i.e. to place them on sheets
+        self.parts = args.get(Ct.parts)
+
+        # settings of a batch request. They are used instead of the section of a config file
+        self.request_settings = args.get(Ct.settings)
+
+        # drawings are only created but not written, i.e. to deliver them inline
+        self.nowrite = args.get(Ct.nowrite, False)
 
         # corner points for the design
         self.corners: list[float] = []
@@ -138,6 +135,9 @@ class Design(ABC):
         # content for the template
         self.template_variables = {}
 
+        # template values of the written drawing before the labels are added. Reused by designs with the same geometry
+        self.drawing = None
+
         # command line as string
         self.args_string: str = ' '.join(sys.argv[1:])
 
@@ -147,38 +147,34 @@ class Design(ABC):
         """
         pass
 
-    def __update_settings_with_options(self, options: dict) -> None:
-        """ Updates the settings with the items from the options
-        :param options: Options from the command line
-        :return:
-        """
-        self.settings = self.settings | options
-        return
+    @classmethod
+    def standard_layers(cls) -> SettingsLayers:
+        """ Settings from the InsertMaker.config as layer for the settings of all designs. The file is
+        read only once.
 
-    def convert_settings_measures_to_tdpi(self) -> None:
-        """
-            Convert the measures from their nativ unint (mm/mil) to dpi * 10000 (tdpi)
-        :return: nothing
+        :return: layers with the standard settings
         """
+        if Design.__standard_layers is None:
+            filename_and_section = f'{cls.__DEFAULT_CONFIG_FILE}{Ct.config_separator}{cls.__DEFAULT_SECTION_NAME}'
+            config = Config.read_config(filename_and_section)
+            Design.__standard_layers = SettingsLayers().new_child(dict(config.items(cls.__DEFAULT_SECTION_NAME)))
 
-        # remove all keys ending with '_tdpi'.
-        # https://stackoverflow.com/questions/11358411/silently-removing-key-from-a-python-dict
-        for k in self.__settings_measures:
-            # with pop missing keys will not raise an exception
-            self.settings.pop(k + Ct.tdpi, None)
+        return Design.__standard_layers
 
-        # copy all measure keys to tdpi and add '_tdpi' to the key from the list of measures to be converted
-        self.settings.update(
-            {k + Ct.tdpi: self.unit_to_tdpi(self.settings[k]) for k in self.__settings_measures})
+    def new_settings(self, layers: SettingsLayers = None) -> Settings:
+        """ Creates empty settings of the design on top of the given layers
 
-        return
+        :param layers: shared settings of the new settings
+        :return: settings object
+        """
+        return self.settings_class(Design.__conversion_factor, layers)
 
     def conversion_factor(self) -> float:
         """
         Delivers the factor for a unit to convert to tdpi
         :return: conversion factor
         """
-        return Design.__conversion_factor[self.settings[Ct.unit]]
+        return self.settings.conversion_factor()
 
     def unit_to_tdpi(self, value: float) -> int:
         """ Converts a native unit (mm/mil) to tdpi
@@ -217,6 +213,15 @@ class Design(ABC):
             result = Design.__tdpi_to_dpi(value)
         return result
 
+    @staticmethod
+    def dpi_to_tdpi(value: float) -> int:
+        """ Converts dpi to tdpi
+
+        :param value: value in dpi
+        :return: value rounded to tdpi
+        """
+        return round(float(value) * 10 ** Design.__PRECISION)
+
     @staticmethod
     def ctdpi_to_dpi(point: (int, int)) -> (float, float):
         retval = []
@@ -225,56 +230,49 @@ class Design(ABC):
         return retval
 
     @staticmethod
-    def draw_line(corners: list, points: list, move_to=True) -> str:
+    def draw_line(path: PathData, corners: list, points: list, move_to=True) -> None:
         """
         Draws a line from the start to the end coordinates
-        :return: path string with
+        :param path: path to draw to
+        :param corners: all points of the drawing
+        :param points: indices of the points of the line
+        :param move_to: Optional. True include an M to move, False not
         """
-        path = ""
-
         start = 1
         if move_to:
-            x, y = Design.ctdpi_to_dpi(corners[points[0]])
-            path = f'M {x} {y} '
+            path.move_to(*corners[points[0]])
         else:
             start = 0
 
-        if start > len(points):
-            return ''
-
         for point in points[start:]:
-            x, y = Design.ctdpi_to_dpi(corners[point])
-            path += f'L {x} {y} '
-
-        return path
+            path.line_to(*corners[point])
 
     @staticmethod
-    def draw_halfcircle(corners: list, points: list, move_to=True) -> str:
+    def draw_halfcircle(path: PathData, corners: list, points: list, move_to=True) -> None:
         """
         Draws a half circle SVG path
+        :param path: path to draw to
         :param corners: all points of the drawing
         :param points: start and end points, directon of arc
         :param move_to: Optional. True include an M to move, False not
-        :return: string with <path />
         """
         start, end, diameter, rotation = Design.get_coords_for_arc(corners, points)
         radius = int(diameter / 2)
 
-        return Design.draw_arc(start, radius, rotation, end, move_to)
+        Design.draw_arc(path, start, radius, rotation, end, move_to)
 
     @staticmethod
-    def draw_quartercircle(corners: list, points: list, move_to=True):
+    def draw_quartercircle(path: PathData, corners: list, points: list, move_to=True) -> None:
         """
         Draws a quarter circle SVG path
+        :param path: path to draw to
         :param corners: all points of the drawing
         :param move_to: Optional. True include an M to move, False not
         :param points: Start and endpoints
-        :return: XML string with <path />
         """
-        path = ''
         start, end, radius, rotation = Design.get_coords_for_arc(corners, points)
 
-        return Design.draw_arc(start, radius, rotation, end, move_to)
+        Design.draw_arc(path, start, radius, rotation, end, move_to)
 
     @staticmethod
     def get_coords_for_arc(corners: list, path: list):
@@ -295,14 +293,14 @@ class Design(ABC):
         return [start_x, start_y], [end_x, end_y], radius, rotation.value
 
     @staticmethod
-    def draw_thumbhole_path(corners: list, path: list):
+    def draw_thumbhole_path(path: PathData, corners: list, values: list) -> None:
         """
         Creates an --\\----/--- for thumb retrieve
+        :param path: path to draw to
         :param corners: Corners of design
-        :param path: path for the thumbhole
-        :return:
+        :param values: path for the thumbhole
         """
-        start, smallradius, thumbholeradius, direction, orientation = path
+        start, smallradius, thumbholeradius, direction, orientation = values
         start_x, start_y = start
 
         delta = {
@@ -316,75 +314,75 @@ class Design(ABC):
                              [smallradius, -smallradius, 1 - direction]],
         }
 
-        xmlstring = ''
-        for values in delta[orientation]:
-            end = start + values
-            outstring = Design.draw_arc(start, smallradius, direction, end)
-            xmlstring += outstring
-            start = end
-
-        return xmlstring
+        for delta_x, delta_y, _ in delta[orientation]:
+            end = [start_x + delta_x, start_y + delta_y]
+            Design.draw_arc(path, [start_x, start_y], smallradius, direction, end)
+            start_x, start_y = end
 
     @staticmethod
-    def draw_arc(start, radius, direction, end, move_to=True):
-        """
-        Draws an scg arv
-        :param start_x x startcoordinate
-        :param start_y y startcoordinate
-        :param radius of the arc
-        :param end_x x endcoordinate
-        :param end_y y endcoordinate
+    def draw_arc(path: PathData, start, radius, direction, end, move_to=True) -> None:
+        """
+        Draws an svg arc
+        :param path: path to draw to
+        :param start: x and y of the start
+        :param radius: radius of the arc
+        :param direction: sweep flag of the arc
+        :param end: x and y of the end
         :param move_to: Optional. True include an M to move, False not
-        :return: string with <path />
         """
-        start_x, start_y = start
-        end_x, end_y = end
-
-        output = ''
         if radius == 0:
-            return ''
+            return
 
         if move_to:
-            output += f'M {Design.tdpi_to_dpi(start_x)} {Design.tdpi_to_dpi(start_y)} '
-
-        output += f'A {Design.tdpi_to_dpi(radius)} {Design.tdpi_to_dpi(radius)} 0 0 {direction} ' \
-                  f'{Design.tdpi_to_dpi(end_x)} {Design.tdpi_to_dpi(end_y)}'
+            path.move_to(*start)
 
-        return output
+        path.arc_to(radius, radius, direction, *end)
 
     @staticmethod
-    def draw_paths(corners: list, lines: list, noxml=False) -> str:
+    def draw_path_data(corners: list, lines: list) -> PathData:
         """
-        Drav path according using the list of lines with the given corners.
+        Draws the numeric path using the list of lines with the given corners.
         :param corners: corner coordinates
         :param lines: Style and information for drawing lines, arcs, thumbhiles, ...
-        :return: XML Path element
+        :return: numeric path in tdpi
         """
-        xml_lines = ''
+        path = PathData()
         for command, values in lines:
             if command == PathStyle.LINE:
-                xml_lines += Design.draw_line(corners, values)
+                Design.draw_line(path, corners, values)
             elif command == PathStyle.LINE_NOMOVE:
-                xml_lines += Design.draw_line(corners, values, move_to=False)
+                Design.draw_line(path, corners, values, move_to=False)
             elif command == PathStyle.QUARTERCIRCLE:
-                xml_lines += Design.draw_quartercircle(corners, values)
+                Design.draw_quartercircle(path, corners, values)
             elif command == PathStyle.QUARTERCIRCLE_NOMOVE:
-                xml_lines += Design.draw_quartercircle(corners, values, move_to=False)
+                Design.draw_quartercircle(path, corners, values, move_to=False)
             elif command == PathStyle.HALFCIRCLE:
-                xml_lines += Design.draw_halfcircle(corners, values)
+                Design.draw_halfcircle(path, corners, values)
             elif command == PathStyle.HALFCIRCLE_NOMOVE:
-                xml_lines += Design.draw_halfcircle(corners, values, move_to=False)
+                Design.draw_halfcircle(path, corners, values, move_to=False)
             # not yet used
             elif command == PathStyle.THUMBHOLE:
-                xml_lines += Design.draw_thumbhole_path(corners, values)
+                Design.draw_thumbhole_path(path, corners, values)
             elif command == PathStyle.PAIR:
                 for start, end in zip(values[::2], values[1::2]):
-                    xml_lines += Design.draw_line(corners[start], corners[end])
+                    Design.draw_line(path, corners, [start, end])
+
+        return path
+
+    @staticmethod
+    def draw_paths(corners: list, lines: list, noxml=False) -> str:
+        """
+        Drav path according using the list of lines with the given corners.
+        :param corners: corner coordinates
+        :param lines: Style and information for drawing lines, arcs, thumbhiles, ...
+        :return: XML Path element
+        """
+        path = Design.draw_path_data(corners, lines)
 
         if noxml:
-            return xml_lines.strip()
+            return path.to_d()
 
-        return f'<path d="{xml_lines.strip()}"/>'
+        return path.to_svg()
 
     def set_bounds(self, corners):
         """
@@ -407,29 +405,31 @@ class Design(ABC):
         :return:
         """
 
-        output_filename = self.settings.get(Ct.filename, output_filename).strip()
+        output_filename = self.settings.filename.strip()
         if (output_filename == '' or output_filename is None) and nowrite is False:
-            raise 'No filename given'
+            raise DesignError('No filename given')
+
+        self.drawing = dict(template_values)
 
         template_file = template_values.get(Ct.template_file, template_file)
 
         if template_file is None or template_file == '':
-            raise 'No template file given.'
+            raise DesignError(f'No template file given for {self.__class__.__name__}.')
 
         if Cm.viewbox_x not in template_values and not noviewbox:
-            raise 'VIEWBOX X is missing'
+            raise DesignError('VIEWBOX X is missing')
 
         if Cm.viewbox_y not in template_values and not noviewbox:
-            raise 'VIEWBOX Y is missing'
+            raise DesignError('VIEWBOX Y is missing')
 
-        template_values[Cm.unit] = self.settings.get(Ct.unit, self.__DEFAULT_UNIT)
+        template_values[Cm.unit] = self.settings.unit
 
         # modify FILENAME with leading and trailing $
-        template_values[Cm.footer_project_name] = self.settings.get(Ct.project_name, '')
-        template_values[Cm.footer_title] = self.settings.get(Ct.title, '')
-        template_values[Cm.header_title] = self.settings.get(Ct.title, '')
+        template_values[Cm.footer_project_name] = self.settings.project_name
+        template_values[Cm.footer_title] = self.settings.title
+        template_values[Cm.header_title] = self.settings.title
 
-        template_values[Cm.footer_filename] = self.settings.get(Ct.filename, '')
+        template_values[Cm.footer_filename] = self.settings.filename
         template_values[Cm.footer_args_string] = self.args_string
         # template_values[Cm.footer_overall_width] = round(
         #     template_values[Cm.viewbox_x] / self.conversion_factor(), 2)
@@ -440,20 +440,242 @@ class Design(ABC):
 
         ycoord = template_values[Cm.viewbox_y]
         template_values[Cm.label_project_y] = self.tdpi_to_dpi(
-            ycoord + self.settings[Ct.y_text_spacing_tdpi])
-        template_values[Cm.label_y_spacing] = self.tdpi_to_dpi(self.settings[Ct.y_text_spacing_tdpi])
+            ycoord + self.settings.y_text_spacing_tdpi)
+        template_values[Cm.label_y_spacing] = self.tdpi_to_dpi(self.settings.y_text_spacing_tdpi)
 
         all_footers = [i for i in template_values if i.startswith(Cm.footer_dash)]
         template_values[Cm.viewbox] = f'{self.tdpi_to_dpi(template_values[Cm.viewbox_x])} ' \
-                                      f' {Design.tdpi_to_dpi(template_values[Cm.viewbox_y] + (len(all_footers) + 2) * self.settings[Ct.y_text_spacing_tdpi])} '
+                                      f' {Design.tdpi_to_dpi(template_values[Cm.viewbox_y] + (len(all_footers) + 2) * self.settings.y_text_spacing_tdpi)} '
+
+        # the exporters get the paths without the template
+        paths = self.change_paths(template_values)
+
+        formats = self.export_formats()
+        targets = self.targets()
+
+        # the template is only filled for the SVG files and the drawings of the sheets
+        template_string = None
+        if (not self.nowrite and (Design.__SVG_FORMAT in formats or targets)) or self.parts is not None:
+            template_string = self.fill_template(template_values)
+
+        if not self.nowrite:
+            # unchanged files are not touched unless writing is forced
+            if Design.__SVG_FORMAT in formats:
+                Writer.write_file(self.settings.filename, template_string, skip_unchanged=not self.force,
+                                  ignore=self.title_pattern(), inputs=self.input_files())
 
-        template_string = self.fill_template(template_values)
+            self.export(paths, template_values[Cm.viewbox_y],
+                        [name for name in formats if name != Design.__SVG_FORMAT])
 
-        with open(f'{self.settings.get(Ct.filename)}', 'w') as f:
-            f.write(template_string)
+            # the same drawing for other machines
+            for target in targets:
+                Writer.write_file(self.target_filename(target), target.emit(template_string, Design.__RESOLUTION),
+                                  skip_unchanged=not self.force, ignore=self.title_pattern(),
+                                  inputs=self.input_files())
+
+        if self.parts is not None:
+            self.parts.append(Part(self.settings.filename, template_values[Cm.viewbox_x],
+                                   template_values[Cm.viewbox_y], template_string))
 
         return template_string
 
+    def title_pattern(self):
+        """ The title with any time of the run. A default title ends with the time of the run, a file that
+        differs only in the time of its title is not written again.
+
+        :return: compiled pattern of bytes or None if the title does not end with a time
+        """
+        match = Design.__TITLE_TIMESTAMP.search(self.settings.title or '')
+        if match is None:
+            return None
+
+        return re.compile(re.escape(self.settings.title[:match.start()].encode('utf-8')) + rb'\d{8}-\d{6}')
+
+    def geometry_key(self):
+        """ Hash of the design and all its settings that change the paths of the drawing. Designs with the same
+        key draw the same paths and differ only in their labels and files.
+
+        :return: key of the geometry or None for designs that can not be reused, i.e. if they write several drawings
+        """
+        values = sorted((key, repr(value)) for key, value in self.settings.values().items()
+                        if key not in Design.__LABEL_SETTINGS)
+
+        return hashlib.sha256(repr((self.__class__.__name__, values)).encode('utf-8')).hexdigest()
+
+    def create_or_reuse(self, drawings: dict) -> None:
+        """ Creates the design. If a design with the same geometry was created before, its drawing is written
+        again with the labels and files of this design instead.
+
+        :param drawings: filename, bounds and drawing of the created designs by their geometry key
+        :return:
+        """
+        key = self.geometry_key()
+        created = drawings.get(key) if key is not None else None
+
+        if created is None:
+            self.create()
+            if key is not None and self.drawing is not None:
+                drawings[key] = (self.settings.filename, (self.left_x, self.right_x, self.top_y, self.bottom_y),
+                                 self.drawing)
+            return
+
+        # the labels are placed at the bounds of the drawing
+        filename, (self.left_x, self.right_x, self.top_y, self.bottom_y), drawing = created
+        self.write_to_file(dict(drawing))
+        print(f'{self.__class__.__name__} {self.written_files()} created with the drawing of "{filename}"')
+
+    def export_formats(self) -> list:
+        """ The formats of the files to write from the settings. Raises an error for unknown formats
+
+        :return: list of format names
+        """
+        formats = [name.strip().lower() for name in self.settings.export_formats.split(',') if name.strip()]
+
+        unknown = [name for name in formats if name != Design.__SVG_FORMAT and name not in Exporter.formats]
+        if unknown:
+            raise SettingsError(f'Unknown export format {", ".join(unknown)} for "{self.settings.filename}". '
+                                f'Allowed formats are {", ".join([Design.__SVG_FORMAT] + list(Exporter.formats))}')
+
+        return formats
+
+    def export(self, paths: str, height: int, formats: list) -> None:
+        """
+        Writes the paths of the drawing in the machine formats next to the SVG file. The exporters write directly
+        to the files
+        :param paths: path elements of the drawing
+        :param height: height of the drawing in tdpi
+        :param formats: names of the machine formats
+        :return:
+        """
+        # the files are written later in the background, the next design may change the settings
+        height_dpi = float(self.tdpi_to_dpi(height))
+        feed_rate, travel_rate = self.settings.feed_rate, self.settings.travel_rate
+
+        for name in formats:
+            def write(stream, name=name) -> None:
+                Exporter.create(name, stream, height_dpi, Design.__RESOLUTION, feed_rate, travel_rate).export(
+                    ElementTree.fromstring(Design.paths_root(paths)))
+
+            Writer.write_stream(self.export_filename(name), write, skip_unchanged=not self.force,
+                                inputs=self.input_files())
+
+    def written_files(self) -> str:
+        """ The files written by the design for its messages. A drawing that is not written is named by its
+        filename
+
+        :return: names of the files in quotes
+        """
+        files = [] if self.nowrite else self.output_files()
+        return ', '.join(f'"{file}"' for file in files or [self.settings.filename])
+
+    def export_filename(self, name: str) -> str:
+        """ Filename of an export next to the SVG file
+
+        :param name: name of the machine format
+        :return: filename with the extension of the format
+        """
+        return File.set_file_extension(os.path.splitext(self.settings.filename)[0], Exporter.formats[name].extension)
+
+    def targets(self) -> list:
+        """ The additional output profiles of the drawing from the settings """
+        return Target.parse_targets(self.settings.targets)
+
+    def target_filename(self, target: Target) -> str:
+        """ Filename of the drawing for a target next to the SVG file
+
+        :param target: output profile
+        :return: filename with the name of the target
+        """
+        return File.set_svg_extension(f'{os.path.splitext(self.settings.filename)[0]}-{target.name}')
+
+    def plan(self) -> dict:
+        """ The node of the design in the plan of a build. Only the settings are used, nothing is drawn.
+
+        :return: design class, templates, config files, outputs and dependencies of the design
+        """
+        templates = self.templates()
+        configs = self.config_files()
+
+        return {Cp.section: self.config_file_and_section,
+                Cp.design: self.__class__.__name__,
+                Cp.templates: templates,
+                Cp.configs: configs,
+                Cp.outputs: Plan.outputs(self.output_files(), self.input_files()),
+                Cp.dependencies: [design.plan() for design in self.dependencies()]}
+
+    def templates(self) -> list:
+        """ Names of the templates used by the design """
+        return [self.settings.template_file]
+
+    def config_files(self) -> list:
+        """ Config files with the settings of the design """
+        configs = [Design.__DEFAULT_CONFIG_FILE]
+        if self.config_file_and_section:
+            configs.append(Config.get_config_file_and_section(self.config_file_and_section)[0])
+
+        return configs
+
+    def input_files(self) -> list:
+        """ Template files and config files the outputs of the design are created from """
+        return [Template.template_file(template) for template in self.templates()] + self.config_files()
+
+    def output_files(self) -> list:
+        """ Files written by the design """
+        formats = self.export_formats()
+
+        files = [self.settings.filename] if Design.__SVG_FORMAT in formats else []
+        files += [self.export_filename(name) for name in formats if name != Design.__SVG_FORMAT]
+
+        return files + [self.target_filename(target) for target in self.targets()]
+
+    def dependencies(self) -> list:
+        """ Designs created by the design """
+        return []
+
+    def change_paths(self, template_values: dict) -> str:
+        """
+        Compensates the kerf and replaces the arcs in the paths of the template values. The paths of all values
+        are changed together, the kerf joins the lines of different values, i.e. the partition cuts of an ItemBox
+        with its outline.
+        :param template_values: values of the template, the values with paths are replaced
+        :return: path elements of all values
+        """
+        keys = [key for key, value in template_values.items()
+                if isinstance(value, str) and Design.__PATH_ELEMENT.search(value)]
+        paths = Design.__VALUE_SEPARATOR.join(template_values[key] for key in keys)
+
+        if not keys or (self.settings.kerf <= 0 and self.settings.arc_tolerance <= 0):
+            return paths
+
+        if self.settings.kerf > 0:
+            root = Kerf.compensate(Design.paths_root(paths), float(self.tdpi_to_dpi(self.settings.kerf_tdpi)) / 2)
+            paths = root[len(Design.__PATHS_ROOT[0]):-len(Design.__PATHS_ROOT[1])]
+
+        if self.settings.arc_tolerance > 0:
+            paths = self.flatten_arcs(paths)
+
+        for key, value in zip(keys, paths.split(Design.__VALUE_SEPARATOR)):
+            template_values[key] = value
+
+        return paths
+
+    @staticmethod
+    def paths_root(paths: str) -> str:
+        """ SVG group around the path elements of a drawing without its template """
+        return f'{Design.__PATHS_ROOT[0]}{paths}{Design.__PATHS_ROOT[1]}'
+
+    def flatten_arcs(self, template_string: str) -> str:
+        """
+        Replaces the arcs in all paths by lines for cutters without arc support
+        :param template_string: SVG with the paths
+        :return: SVG without arcs
+        """
+        tolerance = float(self.tdpi_to_dpi(self.settings.arc_tolerance_tdpi))
+
+        return self.__PATH_DATA.sub(
+            lambda match: f'{match.group(1)}{PathGeometry.flatten_arcs(match.group(2), tolerance)}{match.group(3)}',
+            template_string)
+
     def fill_template(self, template_values: dict, template_string: str=None) -> str:
 
         if not template_string:
@@ -498,39 +720,16 @@ class Design(ABC):
         """
         return int(value * self.conversion_factor()) / (10 ** self.__PRECISION)
 
-    def add_settings_boolean(self, keys: list) -> None:
+    def units_to_dpi(self, values: list) -> list:
         """
-        Add list of config keys that represent a boolean value
-
-        :param keys: keys to add to boolean config list
-        :return:
+        convert a list of measures from mil/mm to DPI. The factor is calculated once, the values are
+        converted one by one in a list comprehension
+        :param values: values to convert
+        :return: DPI values
         """
-        self.__settings_boolean = self.__settings_boolean + keys
-
-    def add_settings_enum(self, keys: dict) -> None:
-        """
-        Add list of config keys that represent an enum value
-
-        :param keys: keys to add to enum config list
-        :return:
-        """
-        self.__settings_enum.update(keys)
-
-    def add_settings_measures(self, keys: list) -> None:
-        """
-        Add list of config measure keys to standard measure keys for converting unit -> tdpi
-        :param keys: list of keys
-        :return:
-        """
-        self.__settings_measures = self.__settings_measures + keys
-
-    def add_config_texts(self, texts: list) -> None:
-        """
-        Add list of text config text keys. These are nonstandard keys
-        :param texts:
-        :return:
-        """
-        self.__settings_texts += texts
+        factor = self.conversion_factor()
+        divisor = 10 ** self.__PRECISION
+        return [int(value * factor) / divisor for value in values]
 
     def set_title_and_outfile(self, default_value: str) -> None:
         """
@@ -541,70 +740,99 @@ class Design(ABC):
         if default_value is None or default_value.strip() == '':
             return
 
-        if Ct.title not in self.settings:
+        if not self.settings.title:
             # set default title
-            self.settings[Ct.title] = default_value
+            self.settings.title = default_value
 
         # set default filename for output
-        filename = self.settings.get(Ct.filename, default_value)
+        filename = self.settings.filename
         if len(filename.strip()) == 0:
             filename = Design.make_safe_filename(default_value)
 
-        self.settings[Ct.filename] = File.set_svg_extension(filename)
+        self.settings.filename = File.set_svg_extension(filename)
 
     def load_settings(self, config_file_and_section: str) -> None:
         """
         Reads in a section from a configuration file.
         :param config_file_and_section: filename with path of the config file
-        :param verbose: be verbose of the import
-        :param payload: default and optional values
-        :return: config object
+        :return:
+        """
+        if self.request_settings is not None:
+            self.__read_values(self.request_settings.items(), 'request')
+            self.set_title_and_outfile(f'{self.__class__.__name__}-{datetime.now().strftime("%Y%m%d-%H%M%S")}')
+            return
+
+        filename, section = Config.get_config_file_and_section(config_file_and_section)
+
+        self.load_settings_from_file(filename, section)
+
+    def load_settings_from_file(self, filename: str, section: str) -> None:
+        """
+        Takes the settings from a section of a configuration file. In a project with a valid lock the
+        typed settings are taken from the lock without reading the file.
+        :param filename: filename of the config file
+        :param section: section with the settings
+        :return:
         """
-        self.__read_config(config_file_and_section)
+        lock = ProjectLock.active
+        locked = lock.get_section(filename, section) if lock is not None else None
+
+        if locked is None:
+            config = Config.read_config_file(filename)
+            Config.check_section(config, filename, section)
+            self.load_settings_from_config(config, filename, section)
+            return
+
+        _, values = locked
+        self.settings.update(values)
+
+        self.set_title_and_outfile(f'{self.__class__.__name__}-{datetime.now().strftime("%Y%m%d-%H%M%S")}')
+
+    def load_settings_from_config(self, config, filename: str, section: str) -> None:
+        """
+        Takes the settings from a section of an already read configuration file.
+        :param config: config object with the section
+        :param filename: filename of the config file for error messages
+        :param section: section with the settings
+        :return:
+        """
+        self.__read_config(config, filename, section)
+
+        # the typed settings of the section are kept for repeated builds of the project
+        if ProjectLock.active is not None:
+            ProjectLock.active.set_section(filename, section, self.__class__.__name__,
+                                           {key: self.settings[key] for key in config.options(section)})
 
         self.set_title_and_outfile(f'{self.__class__.__name__}-{datetime.now().strftime("%Y%m%d-%H%M%S")}')
 
-    def __read_config(self, filename_and_section: str):
-        """ Read configuration from file and convert numbers from string to int/float
+    def __read_config(self, config, filename: str, section: str):
+        """ Copy the settings from a section of the configuration. The settings convert the text to their type
 
-        :param filename_and_section Filename and section of configuration to load
+        :param config: config object with the section
+        :param filename: filename of the config file for error messages
+        :param section: section with the settings
+        """
+        self.__read_values(((key, config.get(section, key)) for key in config.options(section)),
+                           f'{filename} section {section}')
+
+    def __read_values(self, items, source: str):
+        """ Copy the settings from key and value pairs. The settings convert the text to their type
+
+        :param items: key and value of the settings
+        :param source: origin of the settings for error messages
         """
 
         error = ""
-        config = Config.read_config(filename_and_section)
-        filename, section = Config.get_config_file_and_section(filename_and_section)
-
-        # copy values of all key in the config to the settings. Convert numbers from string to int/float
-        self.settings.update({k: self.try_float(config.get(section, k)) for k in config.options(section) if
-                              config.has_option(section, k) and section not in self.__settings_enum})
-
-        # iterate through all enums of the settings
-        for key in self.__settings_enum:
-            # enum_item is a dict with settings name as the key and the enm as value
-            # test if the config file has the key
-            if config.has_option(section, key):
-                # retrieve the data from the config
-                value = config.get(section, key)
-                try:
-                    # convert the config data into an enum by string
-                    self.settings[key] = self.__settings_enum[key](value)
-                except ValueError as e:
-                    error += f'Unknown value for {key} in {filename} section {section}. Current value \'{value}\'. ' \
-                             f'Allowed values are {[e.value for e in self.__settings_enum[key]]}'
-
-        # iterate through all boolean settings
-        for key in self.__settings_boolean:
-            if config.has_option(section, key):
-                self.settings[key] = False
-                value = config.get(section, key)
-                if value.lower() in ['y', 'yes', '1', 't', 'true']:
-                    self.settings[key] = True
 
-        if len(error) != 0:
-            print(error)
-            sys.exit(1)
+        # copy values of all key to the settings. The settings convert the text to their type
+        for key, value in items:
+            try:
+                self.settings[key] = value
+            except ValueError as e:
+                error += f'Wrong value in {source}. {e}\n'
 
-        return config
+        if len(error) != 0:
+            raise SettingsError(error.rstrip())
 
     @staticmethod
     def is_float(value):
@@ -614,24 +842,11 @@ class Design(ABC):
         except ValueError:
             return False
 
-    @staticmethod
-    def try_float(value: str):
-
-        try:
-            if value.__contains__('.'):
-                float(value)
-                return float(value)
-            else:
-                int(value)
-                return int(value)
-        except ValueError:
-            return value
-
     def get_project_name_for_title(self, prefix='', postfix='-'):
-        return f'{"" if len(self.settings.get(Ct.project_name)) == 0 else prefix + self.settings.get(Ct.project_name) + postfix}'
+        return f'{"" if len(self.settings.project_name) == 0 else prefix + self.settings.project_name + postfix}'
 
     def get_viewbox(self, x: int, y: int) -> (int, int):
-        return round(self.settings.get(Ct.x_offset_tdpi) + x), round(self.settings.get(Ct.y_offset_tdpi) + y)
+        return round(self.settings.x_offset_tdpi + x), round(self.settings.y_offset_tdpi + y)
 
     @staticmethod
     def make_safe_filename(filename: str) -> str:
@@ -0,0 +1,265 @@
+import math
+from abc import ABC, abstractmethod
+from typing import TextIO
+from xml.etree import ElementTree
+from classes.PathGeometry import PathGeometry
+
+
+class Exporter(ABC):
+    """ Writes the paths of a drawing in the format of a plotter, laser or CNC machine to a stream.
+
+    The exporters get the commands of the paths (move, line and arc) with the coordinates in mm. The origin
+    of the machine is the lower left corner of the drawing, the y axis points upwards. Every exporter
+    registers itself with its format name, that new formats only need a new subclass.
+    """
+
+    # name of the format in the settings and extension of the written file. Set by the exporters
+    format_name = ''
+    extension = ''
+
+    # exporters by their format name
+    formats = {}
+
+    # maximal distance between an arc and its lines if an arc cannot be exported as arc (dpi)
+    __TOLERANCE = 0.1
+
+    # mm per inch
+    __MM_PER_INCH = 25.4
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.format_name:
+            Exporter.formats[cls.format_name] = cls
+
+    def __init__(self, stream: TextIO, height: float, resolution: float, feed_rate: float, travel_rate: float):
+        """
+        :param stream: stream to write to
+        :param height: height of the drawing in dpi. Needed to turn the y axis
+        :param resolution: resolution of the drawing in dpi
+        :param feed_rate: speed while cutting or drawing in mm/min
+        :param travel_rate: speed while moving without cutting in mm/min
+        """
+        self.stream = stream
+        self.height = height
+        self.scale = self.__MM_PER_INCH / resolution
+        self.feed_rate = feed_rate
+        self.travel_rate = travel_rate
+
+        # current position in mm
+        self.x = 0.0
+        self.y = 0.0
+
+    @classmethod
+    def create(cls, format_name: str, stream: TextIO, height: float, resolution: float, feed_rate: float,
+               travel_rate: float):
+        """ Creates the exporter of a format
+
+        :param format_name: name of the format, i.e. gcode
+        :return: exporter or None for an unknown format
+        """
+        exporter = cls.formats.get(format_name)
+        if exporter is None:
+            return None
+
+        return exporter(stream, height, resolution, feed_rate, travel_rate)
+
+    def export(self, root: ElementTree.Element) -> None:
+        """ Writes all paths of the drawing
+
+        :param root: root element of the SVG drawing
+        :return:
+        """
+        self.begin()
+        for element, matrix in PathGeometry.path_elements(root, ids=PathGeometry.ids(root)):
+            self.export_path(element.get('d'), matrix)
+        self.end()
+
+    def export_path(self, path: str, matrix: tuple = PathGeometry.IDENTITY) -> None:
+        """ Writes the commands of the d attribute of a path
+
+        :param path: d attribute of the path
+        :param matrix: transformation of the path
+        :return:
+        """
+        a, b, c, d, e, f = matrix
+
+        # circles stay circles if the transformation only moves, rotates, mirrors and scales evenly
+        conformal = math.isclose(a, d) and math.isclose(b, -c) or math.isclose(a, -d) and math.isclose(b, c)
+        determinant = a * d - b * c
+
+        for _, segments, _ in PathGeometry.subpaths(path):
+            if not segments:
+                continue
+
+            self.move_to(*self.__point(matrix, *segments[0][1]))
+
+            for command, (start_x, start_y), (end_x, end_y), values in segments:
+                if command == 'A' and values[0] != 0 and values[1] != 0 and (start_x, start_y) != (end_x, end_y):
+                    if conformal and values[0] == values[1]:
+                        center_x, center_y, _, _, _, delta = \
+                            PathGeometry.arc_center(start_x, start_y, *values[:3], values[3] != 0, values[4] != 0,
+                                                    end_x, end_y)
+
+                        # the y axis of the machine points upwards, that turns the direction of the arc
+                        angle = -math.degrees(delta) if determinant > 0 else math.degrees(delta)
+                        self.arc_to(*self.__point(matrix, end_x, end_y), *self.__point(matrix, center_x, center_y),
+                                    angle)
+                        continue
+
+                    for x, y in PathGeometry.arc_points(start_x, start_y, *values[:3], values[3] != 0,
+                                                        values[4] != 0, end_x, end_y, self.__TOLERANCE):
+                        self.line_to(*self.__point(matrix, x, y))
+                    continue
+
+                self.line_to(*self.__point(matrix, end_x, end_y))
+
+    def __point(self, matrix: tuple, x: float, y: float) -> tuple:
+        """ Transforms a point of the drawing to the coordinates of the machine in mm """
+        a, b, c, d, e, f = matrix
+        return (a * x + c * y + e) * self.scale, (self.height - (b * x + d * y + f)) * self.scale
+
+    @staticmethod
+    def number(value: float) -> str:
+        return f'{value:.4f}'
+
+    @abstractmethod
+    def begin(self) -> None:
+        pass
+
+    @abstractmethod
+    def move_to(self, x: float, y: float) -> None:
+        """ Moves without cutting to the point """
+        pass
+
+    @abstractmethod
+    def line_to(self, x: float, y: float) -> None:
+        """ Cuts a line from the current position to the point """
+        pass
+
+    @abstractmethod
+    def arc_to(self, x: float, y: float, center_x: float, center_y: float, angle: float) -> None:
+        """ Cuts a circular arc from the current position to the point
+
+        :param x: x of the end point
+        :param y: y of the end point
+        :param center_x: x of the center of the arc
+        :param center_y: y of the center of the arc
+        :param angle: angle of the arc in degrees. Positive angles are counterclockwise
+        """
+        pass
+
+    @abstractmethod
+    def end(self) -> None:
+        pass
+
+
+class GcodeExporter(Exporter):
+    """ G-code for lasers and CNC machines. The tool is switched on with M3 and off with M5 """
+    format_name = 'gcode'
+    extension = 'gcode'
+
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.tool_on = False
+
+    def begin(self) -> None:
+        # mm and absolute coordinates
+        self.stream.write('G21\nG90\nM5\n')
+
+    def move_to(self, x: float, y: float) -> None:
+        self.__tool(False)
+        self.stream.write(f'G0 X{self.number(x)} Y{self.number(y)} F{self.number(self.travel_rate)}\n')
+        self.x, self.y = x, y
+
+    def line_to(self, x: float, y: float) -> None:
+        self.__tool(True)
+        self.stream.write(f'G1 X{self.number(x)} Y{self.number(y)}\n')
+        self.x, self.y = x, y
+
+    def arc_to(self, x: float, y: float, center_x: float, center_y: float, angle: float) -> None:
+        self.__tool(True)
+        command = 'G3' if angle > 0 else 'G2'
+        self.stream.write(f'{command} X{self.number(x)} Y{self.number(y)} '
+                          f'I{self.number(center_x - self.x)} J{self.number(center_y - self.y)}\n')
+        self.x, self.y = x, y
+
+    def end(self) -> None:
+        self.__tool(False)
+        self.stream.write(f'G0 X0 Y0 F{self.number(self.travel_rate)}\nM2\n')
+
+    def __tool(self, on: bool) -> None:
+        if on == self.tool_on:
+            return
+
+        if on:
+            self.stream.write(f'M3\nG1 F{self.number(self.feed_rate)}\n')
+        else:
+            self.stream.write('M5\n')
+        self.tool_on = on
+
+
+class HpglExporter(Exporter):
+    """ HPGL for pen plotters and cutters """
+    format_name = 'hpgl'
+    extension = 'plt'
+
+    # plotter units per mm
+    __UNITS_PER_MM = 40
+
+    def begin(self) -> None:
+        # the velocity of the pen is given in cm/s
+        self.stream.write(f'IN;SP1;VS{round(self.feed_rate / 600, 1)};\n')
+
+    def move_to(self, x: float, y: float) -> None:
+        self.stream.write(f'PU{self.__units(x)},{self.__units(y)};\n')
+        self.x, self.y = x, y
+
+    def line_to(self, x: float, y: float) -> None:
+        self.stream.write(f'PD{self.__units(x)},{self.__units(y)};\n')
+        self.x, self.y = x, y
+
+    def arc_to(self, x: float, y: float, center_x: float, center_y: float, angle: float) -> None:
+        self.stream.write(f'PD;AA{self.__units(center_x)},{self.__units(center_y)},{round(angle, 3)};\n')
+        self.x, self.y = x, y
+
+    def end(self) -> None:
+        self.stream.write('PU;SP0;\n')
+
+    def __units(self, value: float) -> int:
+        return round(value * self.__UNITS_PER_MM)
+
+
+class DxfExporter(Exporter):
+    """ DXF (AutoCAD R12) with LINE and ARC entities. DXF knows no speeds, the rates are ignored """
+    format_name = 'dxf'
+    extension = 'dxf'
+
+    __LAYER = '0'
+
+    def begin(self) -> None:
+        # $INSUNITS 4 is mm
+        self.stream.write('0\nSECTION\n2\nHEADER\n9\n$INSUNITS\n70\n4\n0\nENDSEC\n0\nSECTION\n2\nENTITIES\n')
+
+    def move_to(self, x: float, y: float) -> None:
+        self.x, self.y = x, y
+
+    def line_to(self, x: float, y: float) -> None:
+        self.stream.write(f'0\nLINE\n8\n{self.__LAYER}\n10\n{self.number(self.x)}\n20\n{self.number(self.y)}\n'
+                          f'11\n{self.number(x)}\n21\n{self.number(y)}\n')
+        self.x, self.y = x, y
+
+    def arc_to(self, x: float, y: float, center_x: float, center_y: float, angle: float) -> None:
+        # DXF arcs are always counterclockwise from the start to the end angle
+        start_angle = math.degrees(math.atan2(self.y - center_y, self.x - center_x))
+        end_angle = math.degrees(math.atan2(y - center_y, x - center_x))
+        if angle < 0:
+            start_angle, end_angle = end_angle, start_angle
+
+        radius = math.hypot(self.x - center_x, self.y - center_y)
+        self.stream.write(f'0\nARC\n8\n{self.__LAYER}\n10\n{self.number(center_x)}\n20\n{self.number(center_y)}\n'
+                          f'40\n{self.number(radius)}\n50\n{self.number(start_angle % 360)}\n'
+                          f'51\n{self.number(end_angle % 360)}\n')
+        self.x, self.y = x, y
+
+    def end(self) -> None:
+        self.stream.write('0\nENDSEC\n0\nEOF\n')
@@ -1,8 +1,24 @@
 import os
+import filecmp
+import hashlib
+import tempfile
+import threading
 
 
 class File:
 
+    # statistics of the written files of the current run
+    __files_written = 0
+    __files_unchanged = 0
+
+    # files are also written by the threads of the background writer
+    __statistics_lock = threading.Lock()
+
+    # permissions of new files as open() would set them. The umask can only be read by setting it.
+    __UMASK = os.umask(0)
+    os.umask(__UMASK)
+    __DEFAULT_MODE = 0o666 & ~__UMASK
+
     # https://stackoverflow.com/questions/3430372/how-do-i-get-the-full-path-of-the-current-files-directory
     # print(os.path.abspath(os.getcwd()))
 
@@ -28,3 +44,139 @@ class File:
             filename += extension
 
         return filename
+
+    @classmethod
+    def write_file(cls, filename: str, content, skip_unchanged=True, count=True, durable=False, ignore=None) -> bool:
+        """ Writes the content to a file. The content is written to a temporary file in the same
+        directory which is then renamed to the target. An interrupted run never leaves a half written file.
+
+        :param filename: file with path to write
+        :param content: text or bytes of the file
+        :param skip_unchanged: True leaves the file untouched when its content is identical
+        :param count: False writes the file without counting it in the statistics, i.e. for internal files
+        :param durable: True forces the content to the disk before the file is renamed and the rename after it
+        :param ignore: pattern of bytes that are not compared, i.e. the title with the time of the run. The
+                       file is kept if only they differ
+        :return: True if the file was written, False if it was unchanged
+        """
+        data = content if isinstance(content, bytes) else content.encode('utf-8')
+
+        if skip_unchanged and cls.__has_same_content(filename, data, ignore):
+            cls.__count(count, False)
+            return False
+
+        cls.__replace(filename, lambda f: f.write(data), True, durable)
+
+        cls.__count(count, True)
+        return True
+
+    @classmethod
+    def write_stream(cls, filename: str, write, skip_unchanged=True, count=True, durable=False) -> bool:
+        """ Writes a file with a function that writes the text to a stream. The content is never complete in
+        memory. Like write_file the text goes to a temporary file which is then renamed to the target.
+
+        :param filename: file with path to write
+        :param write: function that writes the text to the stream it gets
+        :param skip_unchanged: True leaves the file untouched when its content is identical
+        :param count: False writes the file without counting it in the statistics, i.e. for internal files
+        :param durable: True forces the content to the disk before the file is renamed and the rename after it
+        :return: True if the file was written, False if it was unchanged
+        """
+        written = cls.__replace(filename, write, False, durable, skip_unchanged)
+
+        cls.__count(count, written)
+        return written
+
+    @classmethod
+    def __replace(cls, filename: str, write, binary: bool, durable: bool, skip_unchanged=False) -> bool:
+        """ Writes a temporary file and renames it to the target
+
+        :param filename: file with path to write
+        :param write: function that writes the content to the temporary file
+        :param binary: True for bytes, False for text
+        :param durable: True forces the content to the disk before the file is renamed and the rename after it
+        :param skip_unchanged: True removes the temporary file if the target has the same content
+        :return: True if the file was replaced, False if it was unchanged
+        """
+        # the temporary file must be on the same file system for an atomic rename
+        directory = os.path.dirname(os.path.abspath(filename))
+        mode = os.stat(filename).st_mode & 0o777 if os.path.isfile(filename) else cls.__DEFAULT_MODE
+        handle, temp_filename = tempfile.mkstemp(dir=directory, prefix='.', suffix='.tmp')
+        try:
+            with os.fdopen(handle, 'wb') if binary else os.fdopen(handle, 'w', encoding='utf-8', newline='') as f:
+                write(f)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+
+            if skip_unchanged and os.path.isfile(filename) and filecmp.cmp(filename, temp_filename, shallow=False):
+                os.remove(temp_filename)
+                return False
+
+            os.chmod(temp_filename, mode)
+            os.replace(temp_filename, filename)
+        except BaseException:
+            # remove the remains of the temporary file
+            if os.path.exists(temp_filename):
+                os.remove(temp_filename)
+            raise
+
+        # the rename is on the disk only with the directory. Directories can not be opened on Windows
+        if durable and os.name != 'nt':
+            handle = os.open(directory, os.O_RDONLY)
+            try:
+                os.fsync(handle)
+            finally:
+                os.close(handle)
+
+        return True
+
+    @classmethod
+    def __count(cls, count: bool, written: bool) -> None:
+        """ Counts a written or unchanged file in the statistics """
+        if not count:
+            return
+
+        with cls.__statistics_lock:
+            if written:
+                cls.__files_written += 1
+            else:
+                cls.__files_unchanged += 1
+
+    @staticmethod
+    def __has_same_content(filename: str, data: bytes, ignore=None) -> bool:
+        """ Test if a file exists and has exactly the given content
+
+        :param filename: file with path to compare
+        :param data: new content of the file
+        :param ignore: compiled pattern of bytes that are removed from both contents before they are compared
+        :return: True if the content is identical, False if not
+        """
+        if not os.path.isfile(filename):
+            return False
+
+        # without a pattern the contents must have the same size
+        if ignore is None and os.path.getsize(filename) != len(data):
+            return False
+
+        with open(filename, 'rb') as f:
+            old_data = f.read()
+
+        if ignore is not None:
+            old_data, data = ignore.sub(b'', old_data), ignore.sub(b'', data)
+
+        return hashlib.sha256(old_data).digest() == hashlib.sha256(data).digest()
+
+    @classmethod
+    def get_statistics(cls) -> (int, int):
+        """ Number of written and unchanged files of the current run
+
+        :return: written files, unchanged files
+        """
+        return cls.__files_written, cls.__files_unchanged
+
+    @classmethod
+    def print_statistics(cls) -> None:
+        """ Prints the summary of the written files of the current run """
+        written, unchanged = cls.get_statistics()
+        print(f'Files written: {written}, unchanged: {unchanged}')
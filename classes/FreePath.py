@@ -1,7 +1,14 @@
-import sys
+from xml.etree import ElementTree
+from xml.sax.saxutils import escape
 from datetime import datetime
 from classes.Design import Design
+from classes.Settings import Settings, Setting, number
 from classes.Template import Template
+from classes.PathGeometry import PathGeometry
+from classes.OverlapCheck import OverlapCheck
+from classes.InsertMakerError import DesignError
+from classes.FreePathScript import FreePathScript, FreePathImport, FreePathSyntaxError, Rectangle, Circle, Line, \
+    Color, Dasharray, Repeat
 from classes.ConfigConstants import ConfigConstantsText as Ct
 from classes.ConfigConstants import ConfigConstantsTemplate as Cm
 
@@ -12,9 +19,28 @@ class C:
     max_y = 'max y'
     # template_name = 'template name'
     template_group = 'template group'
+    import_file = 'import file'
+    template_use = 'template use'
+    overlap_check = 'overlap check'
 
-    max_x_tdpi = f'{max_x}{Ct.tdpi}'
-    max_y_tdpi = f'{max_y}{Ct.tdpi}'
+
+class FreePathSettings(Settings):
+    __slots__ = ()
+
+    template_file = Setting(Ct.template_file, str, 'FreePath.svg')
+    template_group = Setting(C.template_group, str, 'FreePathGroup.svg')
+    template_use = Setting(C.template_use, str, 'FreePathUse.svg')
+    paths = Setting(C.paths, str, '')
+
+    # stop if the groups of the drawing cross each other
+    overlap_check = Setting(C.overlap_check, bool, False)
+
+    # CSV or JSON file with additional rectangles, circles and lines
+    import_file = Setting(C.import_file, str, '')
+
+    # set defaults to A4 paper size
+    max_x = Setting(C.max_x, number, 210, measure=True)
+    max_y = Setting(C.max_y, number, 297, measure=True)
 
 
 class FreePath(Design):
@@ -23,201 +49,181 @@ class FreePath(Design):
     __DEFAULT_TEMPLATE_FILE: str = 'FreePath.svg'
     __DEFAULT_TEMPLATE_FILE_GROUP: str = 'FreePathGroup.svg'
 
-    # set defaults to A4 paper size
-    __DEFAULT_MAX_X = 210
-    __DEFAULT_MAX_Y = 297
+    settings_class = FreePathSettings
 
     def __init__(self, **kwargs):
         super().__init__(kwargs)
 
-        self.settings.update({Ct.template_file: self.__DEFAULT_TEMPLATE_FILE})
-
-        self.settings.update({C.paths: [],
-                              C.max_x: self.__DEFAULT_MAX_X,
-                              C.max_y: self.__DEFAULT_MAX_Y,
-                              # Ct.template_name: self.__DEFAULT_TEMPLATE_FILE,
-                              C.template_group: self.__DEFAULT_TEMPLATE_FILE_GROUP
-                              })
-
-        self.add_settings_measures([C.max_x, C.max_y])
-
-        self.settings[
-            Ct.title] = f'{"" if self.settings.get(Ct.project_name) is None else self.settings.get(Ct.project_name)}' \
-                        f'{self.__DEFAULT_FILENAME}-{datetime.now().strftime("%Y%m%d-%H%M%S")}'
+        self.settings.title = f'{self.settings.project_name}' \
+                              f'{self.__DEFAULT_FILENAME}-{datetime.now().strftime("%Y%m%d-%H%M%S")}'
 
         # : encloses config values to replace
         self.load_settings(self.config_file_and_section)
 
-        self.convert_settings_measures_to_tdpi()
-
     def create(self):
         self.__init_design()
 
-        # list of path elements with their method for indirect function call
-        functions = {'R': self.__rectangle,
-                     'C': self.__circle,
-                     'F': self.__color,
-                     'D': self.__dasharray,
-                     'L': self.__line}
-
-        output = ""
-        card_template = Template.load_template(self.settings.get(C.template_group))
+        try:
+            groups = FreePathScript.compile(self.settings.paths)
+            if self.settings.import_file:
+                groups += FreePathImport.load(self.settings.import_file)
+        except FreePathSyntaxError as e:
+            raise DesignError(f'Error in paths of {self.config_file_and_section}\n{e}') from e
+
+        # drawing commands with their methods for the measures and the path
+        measures = {Rectangle: self.__rectangle_measures,
+                    Circle: self.__circle_measures,
+                    Line: self.__line_measures}
+        functions = {Rectangle: self.__rectangle,
+                     Circle: self.__circle,
+                     Line: self.__line}
+
+        # the measures of all commands are collected and converted to dpi in one call
+        x_offset = self.settings.x_offset
+        y_offset = self.settings.y_offset
+        values = []
+        for group in groups:
+            for command in group:
+                if type(command) in measures:
+                    values.extend(measures[type(command)](command, x_offset, y_offset))
+        dpi = iter(self.units_to_dpi(values))
+
+        output = []
+        card_template = Template.load_template(self.settings.template_group)
+        use_template = None
         id_count = 1
 
-        path_groups = self.settings.get(C.paths).split("\n\n")
-
-        for pathlist in path_groups:
-            # split path list for a group by carrage return
-            # there is only one command per line allowed
-            paths = [i.upper() for i in pathlist.split('\n')]
-            group_output = ''
-            items = {'color': self.settings['stroke color'],
-                     'dasharray': self.settings['stroke dasharray']
-                     }
-
-            for path in paths:
-                # find in configuration entry the occurance of first ' '
-                # left of ' ' is the command, right of ' ' is the data for the command
-                split_index = path.find(' ')
-
-                command = path
-                data = ""
-                if split_index != -1:
-                    # split config line only if there is at least one ' ' in the line
-                    command = path[0:split_index]
-                    data = path[split_index + 1:]
-
-                if command in functions:
-                    # call the function inderectly that serves the command
-                    # group_output += functions[command](data)
-                    result = functions[command](data)
-                    if type(result) is dict:
-                        # https://stackoverflow.com/questions/61225806/how-do-you-find-the-first-item-in-a-dictionary
-                        items[next(iter(result))] = next(iter(result.values()))
-                    else:
-                        group_output += result
+        for group in groups:
+            group_output = ''.join([functions[type(command)](dpi) for command in group
+                                    if type(command) in functions])
 
             if group_output != '':
                 a = card_template
                 a = a.replace(Cm.id, f'{id_count}')
-                a = a.replace(Cm.color, self.settings.get(Ct.stroke_color))
-                a = a.replace(Cm.dasharray, self.settings.get(Ct.stroke_dasharray))
+                a = a.replace(Cm.color, self.__style(group, Color, self.settings.stroke_color))
+                a = a.replace(Cm.dasharray, self.__style(group, Dasharray, self.settings.stroke_dasharray))
 
-                id_count += 1
-                group_output = a.replace(Cm.svgpath, group_output)
+                output.append(a.replace(Cm.svgpath, group_output))
 
-                output += group_output
-        self.template_variables[Ct.template_file] = self.__DEFAULT_TEMPLATE_FILE
-        self.template_variables[Cm.svgpath] = output
+                # copies of a repeated group only reference the group
+                repeat = next((command for command in group if type(command) is Repeat), None)
+                if repeat is not None:
+                    if use_template is None:
+                        use_template = Template.load_template(self.settings.template_use)
+                    output.append(self.__repeat(repeat, use_template, id_count))
 
-        self.template_variables[Cm.viewbox_x] = self.settings.get(C.max_x_tdpi)
-        self.template_variables[Cm.viewbox_y] = self.settings.get(C.max_y_tdpi)
+                id_count += 1
 
-        self.write_to_file(self.template_variables)
-        print(f'FreePath "{self.settings.get(Ct.filename)}" created')
+        if self.settings.overlap_check:
+            self.__check_overlaps(output)
 
-    def __init_design(self):
-        pass
+        self.template_variables[Ct.template_file] = self.__DEFAULT_TEMPLATE_FILE
+        self.template_variables[Cm.svgpath] = ''.join(output)
 
-    def __print_variables(self):
-        print(self.__dict__)
+        self.template_variables[Cm.viewbox_x] = self.settings.max_x_tdpi
+        self.template_variables[Cm.viewbox_y] = self.settings.max_y_tdpi
 
-    def __rectangle(self, command: str) -> str:
-        error = ''
-        parameter = command.split(' ')
+        self.write_to_file(self.template_variables)
+        print(f'FreePath {self.written_files()} created')
 
-        # test on validity
-        if len(parameter) != 5:
-            print('Number of parameters is wrong\n')
-            sys.exit(-1)
+    def __check_overlaps(self, output: list) -> None:
+        """ Terminates if groups or copies of groups cross each other
 
-        if parameter[1] != 'W' and parameter[3] != 'H':
-            error = 'W and/or H not on correct position\n'
+        :param output: SVG of the groups
+        :return:
+        """
+        root = ElementTree.fromstring(f'<svg xmlns="http://www.w3.org/2000/svg" '
+                                      f'xmlns:xlink="http://www.w3.org/1999/xlink">{"".join(output)}</svg>')
+        ids = PathGeometry.ids(root)
 
-        if not self.is_float(parameter[2]) or not self.is_float(parameter[4]):
-            error += 'Width and/or height not a float\n'
+        check = OverlapCheck()
+        for number, element in enumerate(root, start=1):
+            check.add_element(element.get('id') or f'copy-{number}', element, ids=ids)
 
-        start_xy = parameter[0].split(',')
-        if len(start_xy) != 2:
-            error += 'Start point of rectangle must be x,y\n'
+        conflicts = check.conflicts()
+        if conflicts:
+            error = ''
+            for conflict in conflicts:
+                error += f'{conflict.first} crosses {conflict.second} ' \
+                         f'at {round(conflict.x, 2)}, {round(conflict.y, 2)}\n'
+            raise DesignError(f'{error}Overlapping groups in paths of {self.config_file_and_section}')
 
-        if not self.is_float(start_xy[0]) or not self.is_float(start_xy[1]):
-            error += 'x and y of start must be of type float'
+    def templates(self) -> list:
+        return [self.__DEFAULT_TEMPLATE_FILE, self.settings.template_group, self.settings.template_use]
 
-        if error:
-            print('Error in config file R ' + command + '\n' + error)
-            sys.exit(-1)
+    def config_files(self) -> list:
+        # the imported commands are part of the drawing like the paths in the config
+        configs = super().config_files()
+        if self.settings.import_file:
+            configs.append(self.settings.import_file)
 
-        start_x = self.unit_to_dpi(float(start_xy[0]) + self.settings.get(Ct.x_offset))
-        start_y = self.unit_to_dpi(float(start_xy[1]) + self.settings.get(Ct.y_offset))
-        width = self.unit_to_dpi(float(parameter[2]))
-        height = self.unit_to_dpi(float(parameter[4]))
+        return configs
 
-        return f'M {start_x} {start_y} h {width} v {height} h {-width} z '
+    def __init_design(self):
+        pass
 
-    def __circle(self, command: str) -> str:
-        error = ''
-        parameter = command.split(' ')
+    @staticmethod
+    def __style(group: tuple, style, default: str) -> str:
+        """ The color or dasharray of a group. The last one in the group is used, without one the default
 
-        # test on validity
-        if len(parameter) != 2:
-            print('Number of parameters is wrong in C ' + command)
-            sys.exit(-1)
+        :param group: commands of the group
+        :param style: Color or Dasharray
+        :param default: value from the settings
+        :return: value for the attribute in the template
+        """
+        value = next((command[1] for command in reversed(group) if type(command) is style), default)
 
-        start_xy = parameter[0].split(',')
-        if len(start_xy) != 2:
-            print('Start point of rectangle must be x,y\n')
-            sys.exit(-1)
+        # the value is put between the quotes of the attribute
+        return escape(value, {'"': '&quot;'})
 
-        if not [float(f) for f in start_xy]:
-            print('All parameter must be of type float. C ' + command)
-            sys.exit(-1)
+    def __print_variables(self):
+        print(self.__dict__)
 
-        start_x = self.unit_to_dpi(float(start_xy[0]) + self.settings.get(Ct.x_offset))
-        start_y = self.unit_to_dpi(float(start_xy[1]) + self.settings.get(Ct.y_offset))
-        radius = self.unit_to_dpi(float(parameter[1]))
-        start_x_left = start_x - radius
+    def __repeat(self, repeat: Repeat, template: str, group_id: int) -> str:
+        columns = self.units_to_dpi([column * repeat.step_x for column in range(repeat.count_x)])
+        rows = self.units_to_dpi([row * repeat.step_y for row in range(repeat.count_y)])
 
-        # https: // www.mediaevent.de / tutorial / svg - circle - arc.html
-        return f'M {start_x_left} {start_y} a {radius} {radius} 0 1 1 0 1 z '
+        uses = []
+        for row, translate_y in enumerate(rows):
+            for column, translate_x in enumerate(columns):
+                # the first copy is the group itself
+                if row == 0 and column == 0:
+                    continue
 
-    def __color(self, command: str) -> dict:
-        return {'color': command}
+                a = template.replace(Cm.id, f'{group_id}')
+                a = a.replace(Cm.translate_x, f'{translate_x}')
+                uses.append(a.replace(Cm.translate_y, f'{translate_y}'))
 
-    def __dasharray(self, command: str) -> dict:
-        return {'dasharray': command}
+        return ''.join(uses)
 
-    def __line(self, command: str) -> str:
-        error = ''
-        parameter = command.split(' ')
+    @staticmethod
+    def __rectangle_measures(rectangle: Rectangle, x_offset: float, y_offset: float) -> tuple:
+        return rectangle.x + x_offset, rectangle.y + y_offset, rectangle.width, rectangle.height
 
-        # test on validity
-        if len(parameter) != 2:
-            print('Number of parameters is wrong in L ' + command)
-            sys.exit(-1)
+    @staticmethod
+    def __rectangle(dpi) -> str:
+        start_x, start_y, width, height = next(dpi), next(dpi), next(dpi), next(dpi)
 
-        start = parameter[0].split(',')
-        end = parameter[1].split(',')
+        return f'M {start_x} {start_y} h {width} v {height} h {-width} z '
 
-        if len(start) != 2:
-            print('Start point of rectangle must be x,y\n')
-            sys.exit(-1)
+    @staticmethod
+    def __circle_measures(circle: Circle, x_offset: float, y_offset: float) -> tuple:
+        return circle.x + x_offset, circle.y + y_offset, circle.radius
 
-        if len(end) != 2:
-            print('End point of rectangle must be x,y\n')
-            sys.exit(-1)
+    @staticmethod
+    def __circle(dpi) -> str:
+        start_x, start_y, radius = next(dpi), next(dpi), next(dpi)
+        start_x_left = start_x - radius
 
-        if not [float(f) for f in start]:
-            print('Start parameter must be of type float. C ' + command)
-            sys.exit(-1)
+        # https: // www.mediaevent.de / tutorial / svg - circle - arc.html
+        return f'M {start_x_left} {start_y} a {radius} {radius} 0 1 1 0 1 z '
 
-        if not [float(f) for f in end]:
-            print('End parameter must be of type float. C ' + command)
-            sys.exit(1)
+    @staticmethod
+    def __line_measures(line: Line, x_offset: float, y_offset: float) -> tuple:
+        return line.start_x + x_offset, line.start_y + y_offset, line.end_x + x_offset, line.end_y + y_offset
 
-        start_x = self.unit_to_dpi(float(start[0]) + self.settings.get(Ct.x_offset))
-        start_y = self.unit_to_dpi(float(start[1]) + self.settings.get(Ct.y_offset))
-        end_x = self.unit_to_dpi(float(end[0]) + self.settings.get(Ct.x_offset))
-        end_y = self.unit_to_dpi(float(end[1]) + self.settings.get(Ct.y_offset))
+    @staticmethod
+    def __line(dpi) -> str:
+        start_x, start_y, end_x, end_y = next(dpi), next(dpi), next(dpi), next(dpi)
 
         return f' M {start_x} {start_y} L {end_x} {end_y}'
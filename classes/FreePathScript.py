@@ -0,0 +1,320 @@
+import os
+import csv
+import json
+from typing import NamedTuple
+from classes.LruCache import LruCache
+
+
+# Commands of the FreePath language. Every command keeps its line in the paths for messages.
+# Measures are in the unit of the design without offsets.
+class Rectangle(NamedTuple):
+    line: int
+    x: float
+    y: float
+    width: float
+    height: float
+
+
+class Circle(NamedTuple):
+    line: int
+    x: float
+    y: float
+    radius: float
+
+
+class Line(NamedTuple):
+    line: int
+    start_x: float
+    start_y: float
+    end_x: float
+    end_y: float
+
+
+class Color(NamedTuple):
+    line: int
+    color: str
+
+
+class Dasharray(NamedTuple):
+    line: int
+    dasharray: str
+
+
+class Repeat(NamedTuple):
+    line: int
+    count_x: int
+    count_y: int
+    step_x: float
+    step_y: float
+
+
+class FreePathSyntaxError(ValueError):
+    """ All errors found in the paths of a FreePath """
+
+    def __init__(self, diagnostics: list):
+        self.diagnostics = diagnostics
+        super().__init__('\n'.join(diagnostics))
+
+
+class FreePathScript:
+    """ Compiles the paths of a FreePath to groups of commands.
+
+    Groups are separated by an empty line. There is only one command per line
+        R x,y W width H height   rectangle
+        C x,y radius             circle
+        L x,y x,y                line
+        F color                  color of the group
+        D dasharray              dasharray of the group
+        A count_x,count_y x,y    repeat the group count_x times with step x and count_y times with step y
+    Lines with [ or ] that enclose the paths are ignored.
+    """
+
+    __BRACKETS = ('[', ']')
+    __STYLES = ('F', 'D')
+
+    # compiled paths by their text. Unchanged paths are not parsed again
+    __cache = LruCache(64)
+
+    @classmethod
+    def compile(cls, text: str) -> tuple:
+        """ Compiles the paths to a tuple of groups. Each group is a tuple of commands
+
+        :param text: paths from the config file
+        :return: groups of commands
+        """
+        groups = cls.__cache.get(text)
+        if groups is None:
+            groups = cls.__parse(text)
+            cls.__cache.put(text, groups)
+
+        return groups
+
+    @classmethod
+    def __parse(cls, text: str) -> tuple:
+        parsers = {'R': cls.__rectangle,
+                   'C': cls.__circle,
+                   'L': cls.__line,
+                   'F': cls.__color,
+                   'D': cls.__dasharray,
+                   'A': cls.__repeat}
+
+        groups = []
+        group = []
+        diagnostics = []
+
+        for line_number, line in enumerate(text.split('\n'), start=1):
+            tokens = line.upper().split()
+
+            # an empty line ends the group
+            if not tokens:
+                if group:
+                    groups.append(tuple(group))
+                    group = []
+                continue
+
+            command = tokens[0]
+            if command in cls.__BRACKETS:
+                continue
+
+            if command not in parsers:
+                diagnostics.append(f'Line {line_number}: unknown command {command}')
+                continue
+
+            # colors and dasharrays keep their case
+            parameters = line.split()[1:] if command in cls.__STYLES else tokens[1:]
+
+            try:
+                item = parsers[command](line_number, parameters)
+            except ValueError as e:
+                diagnostics.append(f'Line {line_number}: {line.strip()}: {e}')
+                continue
+
+            if type(item) is Repeat and any(type(previous) is Repeat for previous in group):
+                diagnostics.append(f'Line {line_number}: only one repeat per group allowed')
+                continue
+
+            group.append(item)
+
+        if group:
+            groups.append(tuple(group))
+
+        if diagnostics:
+            raise FreePathSyntaxError(diagnostics)
+
+        return tuple(groups)
+
+    @staticmethod
+    def __number(token: str, name: str) -> float:
+        try:
+            return float(token)
+        except ValueError:
+            raise ValueError(f'{name} must be a number, not {token}')
+
+    @classmethod
+    def __point(cls, token: str, name: str) -> (float, float):
+        xy = token.split(',')
+        if len(xy) != 2:
+            raise ValueError(f'{name} must be x,y')
+
+        return cls.__number(xy[0], f'x of {name}'), cls.__number(xy[1], f'y of {name}')
+
+    @staticmethod
+    def __check_count(parameters: list, count: int) -> None:
+        if len(parameters) != count:
+            raise ValueError(f'{count} parameters expected, {len(parameters)} given')
+
+    @classmethod
+    def __rectangle(cls, line_number: int, parameters: list) -> Rectangle:
+        cls.__check_count(parameters, 5)
+
+        if parameters[1] != 'W' or parameters[3] != 'H':
+            raise ValueError('W and/or H not on correct position')
+
+        x, y = cls.__point(parameters[0], 'start point')
+        return Rectangle(line_number, x, y,
+                         cls.__number(parameters[2], 'width'), cls.__number(parameters[4], 'height'))
+
+    @classmethod
+    def __circle(cls, line_number: int, parameters: list) -> Circle:
+        cls.__check_count(parameters, 2)
+
+        x, y = cls.__point(parameters[0], 'center')
+        return Circle(line_number, x, y, cls.__number(parameters[1], 'radius'))
+
+    @classmethod
+    def __line(cls, line_number: int, parameters: list) -> Line:
+        cls.__check_count(parameters, 2)
+
+        start_x, start_y = cls.__point(parameters[0], 'start point')
+        end_x, end_y = cls.__point(parameters[1], 'end point')
+        return Line(line_number, start_x, start_y, end_x, end_y)
+
+    @staticmethod
+    def __color(line_number: int, parameters: list) -> Color:
+        if not parameters:
+            raise ValueError('color missing')
+
+        return Color(line_number, ' '.join(parameters))
+
+    @staticmethod
+    def __dasharray(line_number: int, parameters: list) -> Dasharray:
+        if not parameters:
+            raise ValueError('dasharray missing')
+
+        return Dasharray(line_number, ' '.join(parameters))
+
+    @classmethod
+    def __repeat(cls, line_number: int, parameters: list) -> Repeat:
+        cls.__check_count(parameters, 2)
+
+        counts = parameters[0].split(',')
+        if len(counts) != 2 or not all(count.isdigit() and int(count) > 0 for count in counts):
+            raise ValueError('counts must be count_x,count_y with positive integers')
+
+        step_x, step_y = cls.__point(parameters[1], 'step')
+        return Repeat(line_number, int(counts[0]), int(counts[1]), step_x, step_y)
+
+
+class FreePathImport:
+    """ Loads the geometry of a FreePath from a CSV or JSON file, i.e. exported from a spreadsheet.
+
+    Every row is one rectangle, circle or line with these columns
+        group       name of the group. Rows of a group are drawn together
+        command     R, C or L
+        x, y        start point of R and L, center of C
+        width       R only
+        height      R only
+        radius      C only
+        end x       L only
+        end y       L only
+        color       optional color of the group
+        dasharray   optional dasharray of the group
+    A JSON file is a list of objects with the same keys.
+    """
+
+    __COLUMNS = {'R': ('x', 'y', 'width', 'height'),
+                 'C': ('x', 'y', 'radius'),
+                 'L': ('x', 'y', 'end x', 'end y')}
+
+    __COMMANDS = {'R': Rectangle, 'C': Circle, 'L': Line}
+
+    # loaded files by filename, modification time and size
+    __cache = LruCache(16)
+
+    @classmethod
+    def load(cls, filename: str) -> tuple:
+        """ Loads the file to a tuple of groups. Each group is a tuple of commands
+
+        :param filename: CSV or JSON file
+        :return: groups of commands
+        """
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            raise FreePathSyntaxError([f'Import file {filename} does not exist'])
+
+        key = (filename, stat.st_mtime_ns, stat.st_size)
+        groups = cls.__cache.get(key)
+        if groups is None:
+            groups = cls.__groups(cls.__rows(filename))
+            cls.__cache.put(key, groups)
+
+        return groups
+
+    @staticmethod
+    def __rows(filename: str) -> list:
+        """ Reads the rows of the file with their line or position in the file """
+        extension = os.path.splitext(filename)[1].lower()
+
+        if extension == '.csv':
+            with open(filename, newline='') as f:
+                reader = csv.DictReader(f, skipinitialspace=True)
+                return [(reader.line_num, row) for row in reader]
+
+        if extension == '.json':
+            with open(filename) as f:
+                try:
+                    rows = json.load(f)
+                except json.JSONDecodeError as e:
+                    raise FreePathSyntaxError([f'{filename}: {e}'])
+
+            if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+                raise FreePathSyntaxError([f'{filename}: a list of objects expected'])
+            return list(enumerate(rows, start=1))
+
+        raise FreePathSyntaxError([f'Import file {filename} must be a CSV or JSON file'])
+
+    @classmethod
+    def __groups(cls, rows: list) -> tuple:
+        groups = {}
+        diagnostics = []
+
+        for line_number, row in rows:
+            command = str(row.get('command') or '').strip().upper()
+            if command not in cls.__COLUMNS:
+                diagnostics.append(f'Line {line_number}: unknown command {command}')
+                continue
+
+            group = groups.setdefault(str(row.get('group') or ''), [])
+
+            # color and dasharray are taken from the first row of the group that has them
+            for name, style in (('color', Color), ('dasharray', Dasharray)):
+                value = str(row.get(name) or '').strip()
+                if value and not any(type(item) is style for item in group):
+                    group.append(style(line_number, value))
+
+            try:
+                values = [float(row[column]) for column in cls.__COLUMNS[command]]
+            except KeyError as e:
+                diagnostics.append(f'Line {line_number}: column {e} missing for {command}')
+                continue
+            except (TypeError, ValueError):
+                diagnostics.append(f'Line {line_number}: {", ".join(cls.__COLUMNS[command])} must be numbers')
+                continue
+
+            group.append(cls.__COMMANDS[command](line_number, *values))
+
+        if diagnostics:
+            raise FreePathSyntaxError(diagnostics)
+
+        return tuple(tuple(group) for group in groups.values())
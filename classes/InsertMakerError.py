@@ -0,0 +1,48 @@
+class InsertMakerError(Exception):
+    """ Base of all errors in the input of the InsertMaker. The message is the complete text for the user.
+    A failing design raises the error instead of terminating, so the process can go on with other designs.
+    """
+
+    @staticmethod
+    def text(error: Exception) -> str:
+        """ Text of an error for reports. Unexpected errors are named with their type
+
+        :param error: raised error
+        :return: message of the error
+        """
+        if isinstance(error, InsertMakerError):
+            return str(error)
+
+        return f'{type(error).__name__}: {error}'
+
+
+class ConfigError(InsertMakerError):
+    """ Missing or malformed config files, sections and projects """
+
+
+class SettingsError(InsertMakerError):
+    """ Wrong values in the settings of a design """
+
+
+class TemplateError(InsertMakerError):
+    """ Missing templates """
+
+
+class DesignError(InsertMakerError):
+    """ Unknown designs and designs that can not be drawn with their settings """
+
+
+class NestingError(InsertMakerError):
+    """ Parts that can not be placed on the sheets """
+
+
+class WriteError(InsertMakerError):
+    """ Files that could not be written """
+
+    def __init__(self, message: str, designs: dict = None):
+        """
+        :param message: text for the user
+        :param designs: messages of the files by the design that handed them over
+        """
+        super().__init__(message)
+        self.designs = {} if designs is None else designs
@@ -1,7 +1,10 @@
 from datetime import datetime
 from enum import Enum
 from classes.Design import Design
+from classes.PathData import PathData
+from classes.Settings import Settings, Setting, number
 from classes.PathStyle import PathStyle
+from classes.LruCache import LruCache
 from classes.Direction import Rotation
 from classes.ThumbholeStyle import ThumbholeStyle
 from classes.ItemBoxPartition import ItemBoxPartition
@@ -23,11 +26,6 @@ class C:
     corner_gap = 'corner gap'
     small_height = 'small height'
 
-    thumbhole_radius_tdpi = f'{thumbhole_radius}{Ct.tdpi}'
-    slot_width_tdpi = f'{slot_width}{Ct.tdpi}'
-    corner_gap_tdpi = f'{corner_gap}{Ct.tdpi}'
-    small_height_tdpi = f'{small_height}{Ct.tdpi}'
-
 
 class EnfordeDesign(Enum):
     NONE = 'none'
@@ -42,84 +40,67 @@ class Thumbhole(Enum):
     NONE = 'none'
 
 
+class ItemBoxSettings(Settings):
+    __slots__ = ()
+
+    template_file = Setting(Ct.template_file, str, 'ItemBox.svg')
+
+    length = Setting(Ct.length, number, 60, measure=True)
+    width = Setting(Ct.width, number, 40, measure=True)
+    height = Setting(Ct.height, number, 25, measure=True)
+    vertical_separation = Setting(Ct.vertical_separation, number, 3, measure=True)
+    thumbhole_radius = Setting(C.thumbhole_radius, number, 10, measure=True)
+    slot_width = Setting(C.slot_width, number, 10, measure=True)
+    corner_gap = Setting(C.corner_gap, number, 10, measure=True)
+    small_height = Setting(C.small_height, number, 20)
+
+    separated = Setting(Ct.separated, bool, False)
+    thumbhole = Setting(C.thumbhole, Thumbhole, Thumbhole.NONE)
+    enforce_design = Setting(C.enforce_design, EnfordeDesign, EnfordeDesign.NONE)
+
+    partitions_main_config = Setting(C.partitions_main_config, str, 'ITEMBOXPARTITION')
+    partitions_config = Setting(C.partitions_config, str, '')
+
+
 class ItemBox(Design):
     __DEFAULT_FILENAME = 'ItemBox'
     __DEFAULT_TEMPLATE_FILE = 'ItemBox.svg'
     __DEFAULT_TEMPLATE_SEPARATED = 'ItemBoxSeparated.svg'
 
-    __DEFAULT_VERTICAL_SEPARATION = 3
-
     __DEFAULT_THUMBHOLE_SMALL_RADIUS = 2
-    __DEFAULT_THUMBHOLE_RADIUS = 10
-
-    __DEFAULT_SLOT_WIDTH = 10
-    __DEFAULT_CORNER_GAP = 10
-
-    __DEFAULT_SMALL_HEIGHT = 20
 
-    __DEFAULT_LENGTH = 60
-    __DEFAULT_WIDTH = 40
-    __DEFAULT_HEIGHT = 25
+    # cutlines of the variants by thumbhole and design. Shared by all boxes in the process
+    __cutlines_cache = LruCache(16)
 
-    __DEFAULT_ENFORCEDESIGN = EnfordeDesign.NONE
-    __DEFAULT_THUMBHOLE = Thumbhole.NONE
-
-    __DEFAULT_PARTITIONS_MAIN_CONFIG = 'ITEMBOXPARTITION'
+    settings_class = ItemBoxSettings
 
     def __init__(self, **kwargs):
         super().__init__(kwargs)
 
-        self.settings.update({Ct.template_file: self.__DEFAULT_TEMPLATE_FILE})
-
         self.inner_dimensions = []
         self.outer_dimensions = []
         self.side_and_bottom_cuts = {}
         self.translate_partition = []
 
-        self.settings.update({Ct.length: self.__DEFAULT_LENGTH,
-                              Ct.width: self.__DEFAULT_WIDTH,
-                              Ct.height: self.__DEFAULT_HEIGHT,
-                              Ct.separated: False,
-                              C.thumbhole: self.__DEFAULT_THUMBHOLE,
-                              C.thumbhole_radius: self.__DEFAULT_THUMBHOLE_RADIUS,
-                              C.enforce_design: self.__DEFAULT_ENFORCEDESIGN,
-                              Ct.vertical_separation: self.__DEFAULT_VERTICAL_SEPARATION,
-                              C.slot_width: self.__DEFAULT_SLOT_WIDTH,
-                              C.corner_gap: self.__DEFAULT_CORNER_GAP,
-                              C.small_height: self.__DEFAULT_SMALL_HEIGHT,
-                              C.partitions_main_config: self.__DEFAULT_PARTITIONS_MAIN_CONFIG,
-                              }
-                             )
-
-        self.add_settings_measures([Ct.length, Ct.width, Ct.height, Ct.vertical_separation, C.thumbhole_radius,
-                                    C.corner_gap, C.slot_width,
-                                    ])
-
-        self.add_settings_enum({C.enforce_design: EnfordeDesign,
-                                C.thumbhole: Thumbhole,
-                                })
-
-        self.add_settings_boolean([Ct.separated])
-
         self.load_settings(self.config_file_and_section)
 
-        self.settings[
-            Ct.title] = f'{self.__DEFAULT_FILENAME}-L{self.settings[Ct.length]}-W{self.settings[Ct.width]}-' \
-                        f'H{self.settings[Ct.height]}-S{self.settings[Ct.thickness]}-' \
-                        f'{datetime.now().strftime("%Y%m%d-%H%M%S")}'
-
-        self.convert_settings_measures_to_tdpi()
+        self.settings.title = f'{self.__DEFAULT_FILENAME}-L{self.settings.length}-W{self.settings.width}-' \
+                              f'H{self.settings.height}-S{self.settings.thickness}-' \
+                              f'{datetime.now().strftime("%Y%m%d-%H%M%S")}'
 
     def create(self):
         # noinspection DuplicatedCode
         self.__init_design()
 
+        # only the cutlines of the selected variant are built
+        self.cutlines = self.variant_cutlines(self.settings.thumbhole,
+                                              self.is_small_design(self.settings.enforce_design))
         base_cut = Design.draw_paths(self.corners, self.cutlines)
 
         partitions_cut = None
 
         # make partitions
-        if C.partitions_config in self.settings:
+        if self.settings.partitions_config:
             partitions_cut = self.__make_partitions()
 
         self.template_variables[Ct.template_file] = self.__DEFAULT_TEMPLATE_FILE
@@ -150,20 +131,16 @@ class ItemBox(Design):
             for partition in partitions_cut:
                 cut = partitions_cut[partition]
                 translate_x = translate_x + cut['separation distance_tdpi'] - (cut['tolerance_tdpi'] >> 1)
-                template_variables = {}
-                template_variables.update({Cm.translate_x: Design.tdpi_to_dpi(translate_x),
-                                           Cm.translate_y: Design.tdpi_to_dpi(translate_y_top)
-                                           })
-                cut_string += self.fill_template(template_variables, template_string=cut['Sidecut'])
-
-                template_variables[Cm.translate_y] = Design.tdpi_to_dpi(translate_y_bottom)
-                cut_string += self.fill_template(template_variables, template_string=cut['Sidecut-mirrored'])
 
-                template_variables[Cm.translate_y] = Design.tdpi_to_dpi(
-                    translate_y_medium + (self.settings.get(Ct.width_tdpi) >> 1))
-                cut_string += self.fill_template(template_variables, template_string=cut['Bottomcut'])
+                # the numeric paths of the cuts are moved to their places and written as one path
+                path = PathData()
+                path.extend(cut['Sidecut'].translate(translate_x, translate_y_top))
+                path.extend(cut['Sidecut-mirrored'].translate(translate_x, translate_y_bottom))
+                path.extend(cut['Bottomcut'].translate(translate_x,
+                                                       translate_y_medium + (self.settings.width_tdpi >> 1)))
+                cut_string += cut['Cut-group'].replace(Cm.svgpath, path.to_svg())
 
-                translate_x += self.settings[Ct.thickness_tdpi] + (cut['tolerance_tdpi'] >> 1)
+                translate_x += self.settings.thickness_tdpi + (cut['tolerance_tdpi'] >> 1)
 
             self.template_variables['$SVGPATH_PARTITION_CUTS$'] = cut_string
 
@@ -179,6 +156,16 @@ class ItemBox(Design):
             f'Outer Width: {self.outer_dimensions[1]} , '
             f'Outer Height: {self.outer_dimensions[2]}')
 
+    def templates(self) -> list:
+        return [self.__DEFAULT_TEMPLATE_FILE]
+
+    def geometry_key(self):
+        # the partitions are written as drawings of their own
+        return None if self.settings.partitions_config else super().geometry_key()
+
+    def dependencies(self) -> list:
+        return [self.__partition_design()] if self.settings.partitions_config else []
+
     def __init_design(self):
         self.__init_base()
 
@@ -282,18 +269,19 @@ class ItemBox(Design):
         #                         |                          length                                |
         #  ab                     21--------------------------------------------------------------61
 
-        length = self.settings.get(Ct.length_tdpi)
-        height = self.settings.get(Ct.height_tdpi)
-        width = self.settings.get(Ct.width_tdpi)
-        thickness = self.settings.get(Ct.thickness_tdpi)
+        settings = self.settings
+        length = settings.length_tdpi
+        height = settings.height_tdpi
+        width = settings.width_tdpi
+        thickness = settings.thickness_tdpi
 
-        slot_width = self.settings.get(C.slot_width_tdpi)
-        thumbholeradius = self.settings.get(C.thumbhole_radius_tdpi)
-        corner_gap = self.settings.get(C.corner_gap_tdpi)
+        slot_width = settings.slot_width_tdpi
+        thumbholeradius = settings.thumbhole_radius_tdpi
+        corner_gap = settings.corner_gap_tdpi
 
         # noinspection DuplicatedCode
         # X - Points
-        a = self.settings.get(Ct.x_offset_tdpi)
+        a = settings.x_offset_tdpi
         b = a + int(height / 2) - int(slot_width / 2)
         c = a + int(height / 2) + int(slot_width / 2)
         d = a + height
@@ -312,7 +300,7 @@ class ItemBox(Design):
 
         # noinspection DuplicatedCode
         # Y - Points
-        q = self.settings.get(Ct.y_offset_tdpi)
+        q = settings.y_offset_tdpi
         r = q + int(height / 2) - int(slot_width / 2)
         s = q + int(height / 2) + int(slot_width / 2)
         t = q + height
@@ -351,106 +339,131 @@ class ItemBox(Design):
         # noinspection DuplicatedCode
         self.inner_dimensions = [self.tdpi_to_unit(j - e), self.tdpi_to_unit(x - u), self.tdpi_to_unit(d - a)]
         self.outer_dimensions = [self.tdpi_to_unit(k - d), self.tdpi_to_unit(y - t), self.tdpi_to_unit(e - a)]
-        self.cutlines = []
         self.translate_partition = [[e, q], [e, ab], [e, t]]
 
-        if self.settings.get(C.enforce_design) is EnfordeDesign.SMALL or \
-                (self.tdpi_to_unit(height) <= self.settings.get(C.small_height) and
-                 not self.settings.get(C.enforce_design) is EnfordeDesign.LARGE):
-
-            # right with no thumbhole
-            right_full = [PathStyle.LINE, [53, 102, 103, 70, 71, 104, 105, 58]]
-
-            # left with no thumbhole
-            left_full = [PathStyle.LINE, [13, 86, 87, 0, 1, 88, 89, 18]]
-
-            # left with thumbhole
-            left_thumbhole_top = [PathStyle.LINE, [13, 86, 87, 0, 82]]
-            left_thumbhole_bottom = [PathStyle.LINE, [83, 1, 88, 89, 18]]
-
-            # right with thumbhole
-            right_thumbhole_top = [PathStyle.LINE, [53, 102, 103, 70, 84]]
-            right_thumbhole_bottom = [PathStyle.LINE, [85, 71, 104, 105, 58]]
+        # detect boundaries of drawing
+        self.left_x, self.right_x, self.top_y, self.bottom_y = self.set_bounds(self.corners)
 
+    def is_small_design(self, enforce_design: EnfordeDesign) -> bool:
+        """ The small design is used if it is enforced or if the box is not higher than the small height """
+        return enforce_design is EnfordeDesign.SMALL or \
+            (self.tdpi_to_unit(self.settings.height_tdpi) <= self.settings.small_height and
+             not enforce_design is EnfordeDesign.LARGE)
+
+    def variant_cutlines(self, thumbhole: Thumbhole, small: bool) -> list:
+        """ The cutlines of one variant of the box. Only the selected variant is built, the cutlines are
+        indices of the corners and shared by all boxes in the process.
+
+        :param thumbhole: number of thumbholes
+        :param small: small or large design
+        :return: cutlines of the variant
+        """
+        key = (thumbhole, small)
+        cutlines = self.__cutlines_cache.get(key)
+        if cutlines is None:
+            cutlines = self.__build_cutlines(thumbhole, small)
+            self.__cutlines_cache.put(key, cutlines)
+
+        return cutlines
+
+    @staticmethod
+    def __build_cutlines(thumbhole: Thumbhole, small: bool) -> list:
+        cutlines = []
+
+        if small:
             # upper
-            self.cutlines.append([PathStyle.LINE, [93, 92, 90, 10, 50, 100, 96, 97]])
+            cutlines.append([PathStyle.LINE, [93, 92, 90, 10, 50, 100, 96, 97]])
             # middle top
-            self.cutlines.append([PathStyle.LINE, [13, 28, 29, 33, 32, 36, 37, 41, 40, 53]])
+            cutlines.append([PathStyle.LINE, [13, 28, 29, 33, 32, 36, 37, 41, 40, 53]])
             # middle bottom
-            self.cutlines.append([PathStyle.LINE, [18, 31, 30, 34, 35, 39, 38, 42, 43, 58]])
+            cutlines.append([PathStyle.LINE, [18, 31, 30, 34, 35, 39, 38, 42, 43, 58]])
             # lower
-            self.cutlines.append([PathStyle.LINE, [94, 95, 91, 21, 61, 101, 99, 98]])
+            cutlines.append([PathStyle.LINE, [94, 95, 91, 21, 61, 101, 99, 98]])
             # middle left
-            self.cutlines.append([PathStyle.LINE, [13, 15, 24, 25, 16, 18]])
+            cutlines.append([PathStyle.LINE, [13, 15, 24, 25, 16, 18]])
             # middle right
-            self.cutlines.append([PathStyle.LINE, [53, 55, 46, 47, 56, 58]])
-        else:
-            # right with no thumbhole
-            right_full = [PathStyle.LINE, [54, 63, 62, 66, 67, 70, 71, 68, 69, 65, 64, 57]]
+            cutlines.append([PathStyle.LINE, [53, 55, 46, 47, 56, 58]])
 
-            # left with no thumbhole
-            left_full = [PathStyle.LINE, [14, 7, 6, 2, 3, 0, 1, 4, 5, 9, 8, 17]]
+            if thumbhole is Thumbhole.NONE:
+                return cutlines + [[PathStyle.LINE, [53, 102, 103, 70, 71, 104, 105, 58]],
+                                   [PathStyle.LINE, [13, 86, 87, 0, 1, 88, 89, 18]]]
 
             # left with thumbhole
-            left_thumbhole_top = [PathStyle.LINE, [14, 7, 6, 2, 3, 0, 82]]
-            left_thumbhole_bottom = [PathStyle.LINE, [83, 1, 4, 5, 9, 8, 17]]
-
-            # right with thumbhole
-            right_thumbhole_top = [PathStyle.LINE, [53, 54, 63, 62, 66, 67, 70, 84]]
-            right_thumbhole_bottom = [PathStyle.LINE, [85, 71, 68, 69, 65, 64, 57]]
+            left_thumbhole_top = [PathStyle.LINE, [13, 86, 87, 0, 82]]
+            left_thumbhole_bottom = [PathStyle.LINE, [83, 1, 88, 89, 18]]
 
+            if thumbhole is Thumbhole.SINGLE:
+                # right with no thumbhole
+                right = [[PathStyle.LINE, [53, 102, 103, 70, 71, 104, 105, 58]]]
+            else:
+                # right with thumbhole
+                right = [[PathStyle.LINE, [53, 102, 103, 70, 84]],
+                         [PathStyle.LINE, [85, 71, 104, 105, 58]]]
+        else:
             # Top upper, middle left and right, Bottom lower
-            self.cutlines.append([PathStyle.LINE,
-                                  [10, 11, 22, 23, 12, 15, 24, 25, 16, 19, 26, 27, 20, 21, 61, 60, 49, 48, 59, 56, 47,
-                                   46, 55, 52, 45, 44, 51, 50, 10]])
+            cutlines.append([PathStyle.LINE,
+                             [10, 11, 22, 23, 12, 15, 24, 25, 16, 19, 26, 27, 20, 21, 61, 60, 49, 48, 59, 56, 47,
+                              46, 55, 52, 45, 44, 51, 50, 10]])
 
             # middle upper
-            self.cutlines.append([PathStyle.LINE, [13, 28, 29, 33, 32, 36, 37, 41, 40, 53]])
+            cutlines.append([PathStyle.LINE, [13, 28, 29, 33, 32, 36, 37, 41, 40, 53]])
 
             # middle lower
-            self.cutlines.append([PathStyle.LINE, [18, 31, 30, 34, 35, 39, 38, 42, 43, 58]])
+            cutlines.append([PathStyle.LINE, [18, 31, 30, 34, 35, 39, 38, 42, 43, 58]])
 
-        if not self.settings.get(C.thumbhole):
-            self.cutlines.append(left_full)
-            self.cutlines.append(right_full)
-        else:
-            if self.settings.get(C.thumbhole) is Thumbhole.SINGLE:
-                self.cutlines.append(left_thumbhole_top)
-                self.cutlines.append(left_thumbhole_bottom)
-                self.cutlines.append([PathStyle.HALFCIRCLE, [83, 82, Rotation.CCW]]),
-                self.cutlines.append(right_full)
-            elif self.settings.get(C.thumbhole) is Thumbhole.DOUBLE:
-                self.cutlines.append(left_thumbhole_top)
-                self.cutlines.append(left_thumbhole_bottom)
-                self.cutlines.append([PathStyle.HALFCIRCLE, [83, 82, Rotation.CCW]]),
-                self.cutlines.append(right_thumbhole_top)
-                self.cutlines.append(right_thumbhole_bottom)
-                self.cutlines.append([PathStyle.HALFCIRCLE, [84, 85, Rotation.CCW]]),
+            if thumbhole is Thumbhole.NONE:
+                return cutlines + [[PathStyle.LINE, [54, 63, 62, 66, 67, 70, 71, 68, 69, 65, 64, 57]],
+                                   [PathStyle.LINE, [14, 7, 6, 2, 3, 0, 1, 4, 5, 9, 8, 17]]]
+
+            # left with thumbhole
+            left_thumbhole_top = [PathStyle.LINE, [14, 7, 6, 2, 3, 0, 82]]
+            left_thumbhole_bottom = [PathStyle.LINE, [83, 1, 4, 5, 9, 8, 17]]
+
+            if thumbhole is Thumbhole.SINGLE:
+                # right with no thumbhole
+                right = [[PathStyle.LINE, [54, 63, 62, 66, 67, 70, 71, 68, 69, 65, 64, 57]]]
             else:
-                self.cutlines.append(right_full)
-                self.cutlines.append(left_full)
+                # right with thumbhole
+                right = [[PathStyle.LINE, [53, 54, 63, 62, 66, 67, 70, 84]],
+                         [PathStyle.LINE, [85, 71, 68, 69, 65, 64, 57]]]
 
-        # detect boundaries of drawing
-        self.left_x, self.right_x, self.top_y, self.bottom_y = self.set_bounds(self.corners)
+        cutlines += [left_thumbhole_top, left_thumbhole_bottom, [PathStyle.HALFCIRCLE, [83, 82, Rotation.CCW]]]
+        cutlines += right
+
+        if thumbhole is Thumbhole.DOUBLE:
+            cutlines.append([PathStyle.HALFCIRCLE, [84, 85, Rotation.CCW]])
+
+        return cutlines
 
     def __make_partitions(self):
+        itemboxpartition = self.__partition_design()
+        itemboxpartition.create()
+        return itemboxpartition.get_side_and_bottom_cuts()
+
+    def __partition_design(self) -> ItemBoxPartition:
+        """ The partitions of the box with the measures of the box """
         itembox_separation_arguments = {}
 
-        fn, _ = Config.get_config_file_and_section(self.config_file_and_section)
+        # designs of a batch request have no config file. Their partitions config needs file and section
+        fn = None
+        if self.config_file_and_section:
+            fn, _ = Config.get_config_file_and_section(self.config_file_and_section)
         itembox_separation_arguments.update(
             {Ct.config_file_and_section: Config.normalize_config_file_and_section(
-                self.settings.get(C.partitions_config), fn)})
+                self.settings.partitions_config, fn)})
 
         # noinspection DuplicatedCode
         itembox_separation_arguments.update(
             {
-                Ct.options: {Ct.width: self.settings[Ct.width],
-                             Ct.height: self.settings[Ct.height],
-                             Ct.thickness: self.settings[Ct.thickness],
-                             Ct.project_name: self.settings.get(Ct.project_name)}
+                Ct.options: {Ct.width: self.settings.width,
+                             Ct.height: self.settings.height,
+                             Ct.thickness: self.settings.thickness,
+                             Ct.project_name: self.settings.project_name}
             }
         )
 
-        itemboxpartition = ItemBoxPartition(**itembox_separation_arguments)
-        itemboxpartition.create()
-        return itemboxpartition.get_side_and_bottom_cuts()
+        # the partitions are parts of the project, too
+        itembox_separation_arguments[Ct.parts] = self.parts
+        itembox_separation_arguments[Ct.nowrite] = self.nowrite
+
+        return ItemBoxPartition(**itembox_separation_arguments)
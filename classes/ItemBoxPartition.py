@@ -1,9 +1,13 @@
 from datetime import datetime
 from classes.Design import Design
+from classes.PathData import PathData
+from classes.Settings import Settings, Setting, number
 from classes.PathStyle import PathStyle
 from classes.Direction import Rotation
 from classes.ThumbholeStyle import ThumbholeStyle
 from classes.Config import Config
+from classes.Template import Template
+from classes.LruCache import LruCache
 from classes.ConfigConstants import ConfigConstantsText as Ct
 from classes.ConfigConstants import ConfigConstantsTemplate as Cm
 
@@ -18,139 +22,124 @@ class C:
     tolerance = 'tolerance'
     height_reduction = 'height reduction'
     thumbhole_style = 'thumbhole style'
-    general_filename = 'general filename'
     separation_distance = "separation distance"
     cut_template = "cut template"
 
-    thumbhole_radius_tdpi = f'{thumbhole_radius}{Ct.tdpi}'
-    thumbhole_small_radius_tdpi = f'{thumbhole_small_radius}{Ct.tdpi}'
-    longhole_radius_tdpi = f'{longhole_radius}{Ct.tdpi}'
-    longhole_rest_height_tdpi = f'{longhole_rest_height}{Ct.tdpi}'
-    mounting_hole_length_tdpi = f'{mounting_hole_length}{Ct.tdpi}'
     tolerance_tdpi = f'{tolerance}{Ct.tdpi}'
-    height_reduction_tdpi = f'{height_reduction}{Ct.tdpi}'
     separation_distance_tdpi = f'{separation_distance}{Ct.tdpi}'
 
     path_side = "path_side"
     path_bottom = 'path_bottom'
-    path_side_noxml = f'{path_side}_noxml'
-    path_bottom_noxml = f'{path_bottom}_noxml'
 
 
-class ItemBoxPartition(Design):
-    __DEFAULT_FILENAME = 'ItemBoxPartition'
-    __DEFAULT_TEMPLATE_FILE = 'ItemBoxPartition.svg'
-    __DEFAULT_CUT_TEMPLATE_FILE = 'ItemBoxPartitionCut.svg'
+class ItemBoxPartitionSettings(Settings):
+    __slots__ = ()
+
+    template_file = Setting(Ct.template_file, str, 'ItemBoxPartition.svg')
+    cut_template = Setting(C.cut_template, str, 'ItemBoxPartitionCut.svg')
+    partitions = Setting(C.partitions, str, '')
 
-    __DEFAULT_VERTICAL_SEPARATION = 3
+    # Default sizes
+    width = Setting(Ct.width, number, 60, measure=True)
+    height = Setting(Ct.height, number, 40, measure=True)
+    thickness = Setting(Ct.thickness, number, 1.5, measure=True)
+    vertical_separation = Setting(Ct.vertical_separation, number, 3, measure=True)
 
-    __DEFAULT_THUMBHOLE_SMALL_RADIUS = 2
-    __DEFAULT_THUMBHOLE_RADIUS = 10
-    __DEFAULT_LONGHOLE_RADIUS = 10
-    __DEFAULT_LONGHOLE_REST_HEIGHT = 2
+    thumbhole_style = Setting(C.thumbhole_style, ThumbholeStyle, ThumbholeStyle.NONE)
+    thumbhole_radius = Setting(C.thumbhole_radius, number, 10, measure=True)
+    thumbhole_small_radius = Setting(C.thumbhole_small_radius, number, 2, measure=True)
+    longhole_radius = Setting(C.longhole_radius, number, 10, measure=True)
+    longhole_rest_height = Setting(C.longhole_rest_height, number, 2, measure=True)
 
-    # default tolerance for slots for better mounting
-    __DEFAULT_TOLERANCE = 0.2
+    # tolerance for slots for better mounting
+    tolerance = Setting(C.tolerance, number, 0.2, measure=True)
 
     # reducing of the height of the separator
-    __DEFAULT_HEIGHT_REDUCTION = 0
+    height_reduction = Setting(C.height_reduction, number, 0, measure=True)
 
-    # default length for the slot for mounting the separator in the box
-    __DEFAULT_MOUNTING_HOLE_LENGTH = 10
+    # length for the slot for mounting the separator in the box
+    mounting_hole_length = Setting(C.mounting_hole_length, number, 10, measure=True)
 
-    # default separation distance
-    __DEFAULT_SEPARATION_DISTANCE = 10
+    # distance of the separator to the previous one
+    separation_distance = Setting(C.separation_distance, number, 10, measure=True)
 
-    # default style of thumbhole
-    __DEFAULT_THUMBHOLE_STYLE = ThumbholeStyle.NONE
+    separated = Setting(Ct.separated, bool, False)
 
-    # Default sizes
-    __DEFAULT_WIDTH = 60
-    __DEFAULT_HEIGHT = 40
-    __DEFAULT_THICKNESS = 1.5
+
+class ItemBoxPartition(Design):
+    __DEFAULT_FILENAME = 'ItemBoxPartition'
+    __DEFAULT_TEMPLATE_FILE = 'ItemBoxPartition.svg'
+    __DEFAULT_CUT_TEMPLATE_FILE = 'ItemBoxPartitionCut.svg'
+
+    # paths of the side and bottom cuts by their geometry and the finished cuts of a partition.
+    # Shared by all partitions of all item boxes in the process
+    __paths_cache = LruCache(64)
+    __cuts_cache = LruCache(256)
+
+    settings_class = ItemBoxPartitionSettings
 
     def __init__(self, **kwargs):
         super().__init__(kwargs)
 
-        self.settings.update({Ct.template_file: self.__DEFAULT_TEMPLATE_FILE})
-
         self.inner_dimensions = []
         self.outer_dimensions = []
         self.partition_settings = []
         self.partitions_corners_and_cuts = {}
 
-        # ensure that option exists in kwargs
-        _ = kwargs.setdefault(Ct.options, {})
-
-        self.settings.update({Ct.thickness: kwargs[Ct.options].get(Ct.thickness, self.__DEFAULT_THICKNESS),
-                              Ct.width: kwargs[Ct.options].get(Ct.width, self.__DEFAULT_WIDTH),
-                              Ct.height: kwargs[Ct.options].get(Ct.height, self.__DEFAULT_HEIGHT),
-                              Ct.project_name: kwargs[Ct.options].get(Ct.project_name, ''),
-                              C.thumbhole_style: self.__DEFAULT_THUMBHOLE_STYLE,
-                              C.thumbhole_radius: self.__DEFAULT_THUMBHOLE_RADIUS,
-                              C.thumbhole_small_radius: self.__DEFAULT_THUMBHOLE_SMALL_RADIUS,
-                              C.longhole_radius: self.__DEFAULT_LONGHOLE_RADIUS,
-                              C.longhole_rest_height: self.__DEFAULT_LONGHOLE_REST_HEIGHT,
-                              Ct.vertical_separation: self.__DEFAULT_VERTICAL_SEPARATION,
-                              C.separation_distance: self.__DEFAULT_SEPARATION_DISTANCE,
-                              C.mounting_hole_length: self.__DEFAULT_MOUNTING_HOLE_LENGTH,
-                              C.tolerance: self.__DEFAULT_TOLERANCE,
-                              C.height_reduction: self.__DEFAULT_HEIGHT_REDUCTION,
-                              C.partitions: '',
-                              C.cut_template: self.__DEFAULT_CUT_TEMPLATE_FILE,
-                              }
-                             )
-
-        self.add_settings_measures([Ct.thickness, Ct.width, Ct.height, C.thumbhole_radius, C.thumbhole_small_radius,
-                                    C.longhole_radius, C.longhole_rest_height, Ct.vertical_separation,
-                                    C.longhole_rest_height, C.tolerance, C.height_reduction, C.separation_distance])
-
-        self.add_settings_enum({C.thumbhole_style: ThumbholeStyle,
-                                })
-
-        self.add_settings_boolean([Ct.separated])
+        # the loaded cut template
+        self.cut_template = None
 
         # General settings are loaded. Overwritten later by settings for each separation
         self.load_settings(self.config_file_and_section)
 
-        self.settings[
-            Ct.title] = f'{self.__DEFAULT_FILENAME}-W{self.settings[Ct.width]}-' \
-                        f'H{self.settings[Ct.height]}-S{self.settings[Ct.thickness]}-' \
-                        f'{datetime.now().strftime("%Y%m%d-%H%M%S")}'
-        self.settings[C.general_filename] = self.settings.get(Ct.title)
+        self.settings.title = f'{self.__DEFAULT_FILENAME}-W{self.settings.width}-' \
+                              f'H{self.settings.height}-S{self.settings.thickness}-' \
+                              f'{datetime.now().strftime("%Y%m%d-%H%M%S")}'
+        self.general_filename = self.settings.title
 
-        # copy the settings for later use when making the partitions. Before creating a partition
-        # the general settings must be restored
-        self.general_settings = self.settings.copy()
+        # the general settings are the shared layer for the settings of every partition
+        self.general_layers = self.settings.as_layers()
 
-        if C.partitions in self.settings:
-            self.settings[C.partitions] = Config.split_config_lines_to_list(self.settings[C.partitions], 3)
-
-        self.convert_settings_measures_to_tdpi()
+        self.partitions = Config.split_config_lines_to_list(self.settings.partitions, 3)
 
     def create(self, output=True):
         # noinspection DuplicatedCode
 
-        for idx, partition in enumerate(self.settings[C.partitions]):
+        # the settings of all partitions are resolved before any geometry is created
+        self.__resolve_partitions()
+
+        for config_section, settings in self.partition_settings:
+            self.settings = settings
+
+            if output:
+                self.__create_single_separation()
+
+            if config_section not in self.partitions_corners_and_cuts:
+                self.__create_additional_cuts(config_section)
 
-            main_file, _ = Config.get_config_file_and_section(self.config_file_and_section)
+    def __resolve_partitions(self):
+        """ Creates the settings for every partition. Each config file is read only once for all
+        partitions in it.
+        """
+        if self.partition_settings:
+            return
+
+        main_file, _ = Config.get_config_file_and_section(self.config_file_and_section)
+        general_settings = self.settings
+
+        for idx, partition in enumerate(self.partitions):
             config_file, config_section = Config.get_config_file_and_section(partition, main_file)
 
-            # restore the general settings that the settings from the last separator are
-            # reverted.
-            self.settings = self.general_settings.copy()
-            self.settings[Ct.filename] = self.settings[C.general_filename] + '-' + str(idx + 1)
+            # start with empty settings on top of the general settings that the settings from the
+            # previous separator are not used.
+            self.settings = self.new_settings(self.general_layers)
+            self.settings.filename = self.general_filename + '-' + str(idx + 1)
 
             # load the settings for the new partition
-            self.load_settings(f'{config_file}{Ct.config_separator}{config_section}')
-            # self.convert_settings_measures_to_tdpi()
-            # self.partition_settings.append(self.settings)
+            self.load_settings_from_file(config_file, config_section)
+            self.partition_settings.append((config_section, self.settings))
 
-            if output:
-                self.__create_single_separation()
-                if config_section not in self.partitions_corners_and_cuts:
-                    self.__create_additional_cuts(config_section)
-        pass
+        self.settings = general_settings
 
     def __create_single_separation(self):
 
@@ -187,6 +176,37 @@ class ItemBoxPartition(Design):
             f'Outer Width: {self.outer_dimensions[1]} , '
             f'Outer Height: {self.outer_dimensions[2]}')
 
+    def templates(self) -> list:
+        return [self.__DEFAULT_TEMPLATE_FILE, self.__DEFAULT_CUT_TEMPLATE_FILE]
+
+    def geometry_key(self):
+        # every partition is a drawing of its own
+        return None
+
+    def config_files(self) -> list:
+        # the settings of the partitions are in their own sections
+        configs = super().config_files()
+        main_file, _ = Config.get_config_file_and_section(self.config_file_and_section)
+
+        for partition in self.partitions:
+            config_file, _ = Config.get_config_file_and_section(partition, main_file)
+            if config_file not in configs:
+                configs.append(config_file)
+
+        return configs
+
+    def output_files(self) -> list:
+        # every partition is written with its own settings
+        self.__resolve_partitions()
+        general_settings = self.settings
+
+        files = []
+        for _, self.settings in self.partition_settings:
+            files += super().output_files()
+
+        self.settings = general_settings
+        return files
+
     def __init_design(self):
         self.__init_base()
 
@@ -210,37 +230,32 @@ class ItemBoxPartition(Design):
         #                          |        |
         #   n                      08-------10
 
-        self.add_settings_measures([Ct.thickness, Ct.width, Ct.height, C.thumbhole_radius, C.longhole_radius,
-                                    C.longhole_rest_height, C.mounting_hole_length,
-                                    C.tolerance, C.height_reduction, C.thumbhole_small_radius])
+        settings = self.settings
+        height = settings.height_tdpi
+        width = settings.width_tdpi
+        thickness = settings.thickness_tdpi
 
-        self.convert_settings_measures_to_tdpi()
+        thumbhole_radius = settings.thumbhole_radius_tdpi
+        longhole_radius = settings.longhole_radius_tdpi
+        longhole_rest_height = settings.longhole_rest_height_tdpi
+        mounting_hole_length = settings.mounting_hole_length_tdpi
+        tolerance = settings.tolerance_tdpi
+        height_reduction = settings.height_reduction_tdpi
+        thumbhole_small_radius = settings.thumbhole_small_radius_tdpi
 
-        height = self.settings.get(Ct.height_tdpi)
-        width = self.settings.get(Ct.width_tdpi)
-        thickness = self.settings.get(Ct.thickness_tdpi)
-
-        thumbhole_radius = self.settings.get(C.thumbhole_radius_tdpi)
-        longhole_radius = self.settings.get(C.longhole_radius_tdpi)
-        longhole_rest_height = self.settings.get(C.longhole_rest_height_tdpi)
-        mounting_hole_length = self.settings[C.mounting_hole_length_tdpi]
-        tolerance = self.settings.get(C.tolerance_tdpi)
-        height_reduction = self.settings.get(C.height_reduction_tdpi)
-        thumbhole_small_radius = self.settings.get(C.thumbhole_small_radius_tdpi)
-
-        print(self.settings.get(C.thumbhole_style))
+        print(settings.thumbhole_style)
         # noinspection DuplicatedCode
         # X - Points
-        a = self.settings.get(Ct.x_offset_tdpi)
+        a = settings.x_offset_tdpi
         b = int(a + thickness + tolerance)
-        if self.settings.get(C.thumbhole_style) is ThumbholeStyle.THUMBHOLE:
+        if settings.thumbhole_style is ThumbholeStyle.THUMBHOLE:
             c = int(a + thickness + width / 2 - thumbhole_radius)
         else:
             c = int(a + thickness + width / 2 - longhole_radius)
         d = int(a + thickness + width / 2 - mounting_hole_length / 2)
         h = int(a + width + 2 * thickness)
         e = int(h - thickness - width / 2 + (mounting_hole_length / 2))
-        if self.settings.get(C.thumbhole_style) is ThumbholeStyle.THUMBHOLE:
+        if settings.thumbhole_style is ThumbholeStyle.THUMBHOLE:
             f = int(h - thickness - width / 2 + thumbhole_radius)
         else:
             f = int(h - thickness - width / 2 + longhole_radius)
@@ -251,7 +266,7 @@ class ItemBoxPartition(Design):
 
         # noinspection DuplicatedCode
         # Y - Points
-        i = self.settings.get(Ct.y_offset_tdpi)
+        i = settings.y_offset_tdpi
 
         j = int(i + (height - height_reduction) / 2)
         m = i + height - height_reduction
@@ -269,14 +284,14 @@ class ItemBoxPartition(Design):
         self.inner_dimensions = [self.tdpi_to_unit(thickness), self.tdpi_to_unit(g - b), self.tdpi_to_unit(m - i)]
         self.outer_dimensions = [self.tdpi_to_unit(thickness), self.tdpi_to_unit(h - a), self.tdpi_to_unit(n - i)]
 
-        if self.settings['thumbhole style'] is ThumbholeStyle.THUMBHOLE:
+        if settings.thumbhole_style is ThumbholeStyle.THUMBHOLE:
             self.cutlines = [
                 [PathStyle.LINE, [17, 1, 2, 3, 4, 7, 8, 10, 9, 14, 13, 16, 15, 20]],
                 [PathStyle.QUARTERCIRCLE_NOMOVE, [20, 19, Rotation.CCW]],
                 [PathStyle.HALFCIRCLE_NOMOVE, [19, 18, Rotation.CW]],
                 [PathStyle.QUARTERCIRCLE_NOMOVE, [18, 17, Rotation.CCW]]
             ]
-        elif self.settings['thumbhole style'] is ThumbholeStyle.LONGHOLE:
+        elif settings.thumbhole_style is ThumbholeStyle.LONGHOLE:
             self.cutlines = [
                 [PathStyle.LINE, [17, 1, 2, 3, 4, 7, 8, 10, 9, 14, 13, 16, 15, 20]],
                 [PathStyle.QUARTERCIRCLE_NOMOVE, [20, 19, Rotation.CCW]],
@@ -294,38 +309,54 @@ class ItemBoxPartition(Design):
         self.left_x, self.right_x, self.top_y, self.bottom_y = self.set_bounds(self.corners)
 
     def __create_additional_cuts(self, partition_name: str):
-        template_variables = {}
-        template_variables[Ct.template_file] = self.__DEFAULT_CUT_TEMPLATE_FILE
-        template_variables['$DESCRIPTION$'] = f'SIDE-CUT-TOP-{partition_name}'
-        template_variables[Cm.scale_x] = 1
-        template_variables[Cm.scale_y] = 1
-
-        path_side_cut = self.__create_side_cut()
-        path_side_cut_noxml = self.__create_side_cut(noxml=True)
-        self.partitions_corners_and_cuts[partition_name] = {}
-        self.partitions_corners_and_cuts[partition_name][C.path_side] = path_side_cut
-        self.partitions_corners_and_cuts[partition_name][C.path_side_noxml] = path_side_cut_noxml
-
-        template_variables[Cm.svgpath] = path_side_cut
-        self.partitions_corners_and_cuts[partition_name]['Sidecut'] = self.fill_template(template_variables)
-        template_variables[Cm.scale_y] = -1
-        self.partitions_corners_and_cuts[partition_name]['Sidecut-mirrored'] = self.fill_template(template_variables)
-
-        path_bottom_cut = self.__create_bottom_cut()
-        path_bottom_cut_noxml = self.__create_bottom_cut(noxml=True)
-        self.partitions_corners_and_cuts[partition_name][C.path_bottom] = path_bottom_cut
-        self.partitions_corners_and_cuts[partition_name][C.path_bottom_noxml] = path_bottom_cut_noxml
-        self.partitions_corners_and_cuts[partition_name][C.separation_distance] = self.settings[C.separation_distance]
-        self.partitions_corners_and_cuts[partition_name][C.separation_distance_tdpi] = self.settings[
-            C.separation_distance_tdpi]
-
-        template_variables[Cm.svgpath] = path_bottom_cut
-        template_variables[Cm.scale_y] = 1
-        self.partitions_corners_and_cuts[partition_name]['Bottomcut'] = self.fill_template(template_variables)
-        self.partitions_corners_and_cuts[partition_name]['Bottomcut-offset_y'] = 0
-
-        self.partitions_corners_and_cuts[partition_name][C.tolerance] = self.settings.get(C.tolerance)
-        self.partitions_corners_and_cuts[partition_name][C.tolerance_tdpi] = self.settings.get(C.tolerance_tdpi)
+        settings = self.settings
+
+        # the paths of the cuts only depend on these measures. Partitions with the same
+        # geometry share their paths
+        geometry = (settings.thickness_tdpi, settings.height_tdpi, settings.tolerance_tdpi,
+                    settings.height_reduction_tdpi, settings.mounting_hole_length_tdpi)
+
+        # item boxes of a project often have the same partitions. The finished cuts are kept for the whole process
+        key = geometry + (partition_name, self.noprint, settings.tolerance, settings.separation_distance,
+                          settings.separation_distance_tdpi)
+        cuts = ItemBoxPartition.__cuts_cache.get(key)
+        if cuts is None:
+            cuts = self.__create_cuts(partition_name, geometry)
+            ItemBoxPartition.__cuts_cache.put(key, cuts)
+
+        # the cached cuts are shared. Every caller gets its own dict
+        self.partitions_corners_and_cuts[partition_name] = dict(cuts)
+
+    def __create_cuts(self, partition_name: str, geometry: tuple) -> dict:
+        settings = self.settings
+
+        paths = ItemBoxPartition.__paths_cache.get(geometry)
+        if paths is None:
+            paths = {C.path_side: self.__create_side_cut(),
+                     C.path_bottom: self.__create_bottom_cut()}
+            ItemBoxPartition.__paths_cache.put(geometry, paths)
+
+        if self.cut_template is None:
+            self.cut_template = Template.load_template(self.__DEFAULT_CUT_TEMPLATE_FILE)
+
+        cuts = dict(paths)
+
+        # the cuts are numeric paths at the origin. The item box moves them to their places
+        cuts['Sidecut'] = paths[C.path_side]
+        cuts['Sidecut-mirrored'] = paths[C.path_side].mirror_y()
+        cuts['Bottomcut'] = paths[C.path_bottom]
+        cuts['Bottomcut-offset_y'] = 0
+
+        # group for all cuts of the partition. The paths are filled in by the item box
+        cuts['Cut-group'] = self.cut_template.replace('$DESCRIPTION$', f'SIDE-CUT-TOP-{partition_name}')
+
+        cuts[C.separation_distance] = settings.separation_distance
+        cuts[C.separation_distance_tdpi] = settings.separation_distance_tdpi
+
+        cuts[C.tolerance] = settings.tolerance
+        cuts[C.tolerance_tdpi] = settings.tolerance_tdpi
+
+        return cuts
 
         # < g id = "base" transform = "translate($TRANSLATE_X$, $TRANSLATE_Y$, scale = ( $SCALE_X$, $SCALE_Y$ )" >
         #    < g id = "cut-$DESCRIPTON$>" class ="cut" fill='none' stroke='#d41a5a' stroke-width='1' >
@@ -337,7 +368,7 @@ class ItemBoxPartition(Design):
         # template_variables[Cm.translate_y] = Design.unit_to_dpi(translate_top[1])
         ...
 
-    def __create_side_cut(self, noxml=False) -> str:
+    def __create_side_cut(self) -> PathData:
         #    a     b
         # c -00----03
         #           |
@@ -352,24 +383,23 @@ class ItemBoxPartition(Design):
         #
         # f   ---------  bottom
 
-        tolerance_tdpi = self.settings.get(C.tolerance_tdpi)
-        height_reduction_tdpi = self.settings.get(C.height_reduction_tdpi)
+        tolerance_tdpi = self.settings.tolerance_tdpi
+        height_reduction_tdpi = self.settings.height_reduction_tdpi
         a = 0
-        b = a + self.settings.get(Ct.thickness_tdpi) + tolerance_tdpi
+        b = a + self.settings.thickness_tdpi + tolerance_tdpi
 
         c = 0
         d = c + height_reduction_tdpi
-        f = c + self.settings.get(Ct.height_tdpi)
+        f = c + self.settings.height_tdpi
         # e = int((f - d) >> 1) + tolerance_tdpi
-        e = height_reduction_tdpi + ((self.settings.get(Ct.height_tdpi) - height_reduction_tdpi) >> 1) + tolerance_tdpi
+        e = height_reduction_tdpi + ((self.settings.height_tdpi - height_reduction_tdpi) >> 1) + tolerance_tdpi
 
         corners = [[a, c], [a, e], [b, c], [b, e]]
         cutlines = [[PathStyle.LINE, [0, 1, 3, 2]]]
-        path = Design.draw_paths(corners, cutlines, noxml)
 
-        return path
+        return Design.draw_path_data(corners, cutlines)
 
-    def __create_bottom_cut(self, noxml=False) -> str:
+    def __create_bottom_cut(self) -> PathData:
         #     a       b
         #  c  00-----02
         #     |       |
@@ -378,23 +408,21 @@ class ItemBoxPartition(Design):
         #     |       |
         #  d  01-----03
 
-        tolerance = self.settings.get(C.tolerance_tdpi)
+        tolerance = self.settings.tolerance_tdpi
         a = 0
-        b = a + self.settings.get(Ct.thickness_tdpi) + tolerance
+        b = a + self.settings.thickness_tdpi + tolerance
 
         c = 0
-        d = self.settings.get(C.mounting_hole_length_tdpi) + tolerance
+        d = self.settings.mounting_hole_length_tdpi + tolerance
         c = (c - d) >> 1
         d = c + d
         corners = [[a, c], [a, d], [b, c], [b, d]]
         cutlines = [[PathStyle.LINE, [0, 1, 3, 2, 0]]]
-        path = Design.draw_paths(corners, cutlines, noxml)
 
-        return path
+        return Design.draw_path_data(corners, cutlines)
 
     def get_side_and_bottom_cuts(self) -> dict:
         if len(self.partitions_corners_and_cuts) == 0:
-            for idx, partition in enumerate(self.settings[C.partitions]):
-                self.__create_additional_cuts(partition)
+            self.create(output=False)
 
         return self.partitions_corners_and_cuts
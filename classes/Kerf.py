@@ -0,0 +1,824 @@
+import re
+import math
+from xml.etree import ElementTree
+from classes.PathGeometry import PathGeometry
+from classes.InsertMakerError import DesignError
+
+
+class Kerf:
+    """ Compensates the kerf of the cutter.
+
+    The lines of all paths are joined into one drawing: at their end points, where a line ends on another line
+    and where lines cross. The joined lines divide the drawing into faces. The faces of connected lines are
+    parts if the lines are inside of an even number of other connected lines, otherwise they are holes and
+    slots. A line between a part and a hole or the outside is moved by half of the kerf away from the part,
+    that outlines grow and holes and slots shrink. A line between two parts is a common cut that can not be
+    compensated. It stays and its ends reach the moved lines. Lines that are not between faces are not changed.
+
+    An open subpath with both ends on the lines of an earlier path cuts a slot into a part, its lines move into
+    the slot. Lines that are drawn twice are moved together.
+
+    Circular arcs are moved to concentric arcs. Corners get a miter, other corners of a subpath that do not meet
+    are connected by a line. A face that does not grow or shrink by half of the kerf along its moved lines
+    raises an error instead of writing partly moved lines.
+    """
+
+    # tolerance for the arcs and for points that are equal in the unit of the drawing (dpi)
+    __TOLERANCE = 0.01
+
+    # longest miter as multiple of the offset. Longer miters are cut off
+    __MITER_LIMIT = 4
+
+    # d attribute of a path element
+    __PATH_DATA = re.compile(r'(<path\b[^>]*?\sd=")([^"]*)(")')
+
+    def __init__(self, offset: float):
+        self.offset = offset
+
+        # points of the drawing and their index by the cell of the tolerance
+        self.points = []
+        self.cells = {}
+
+        # edges between two points: [command, start, end, values in the drawing, values of the path]. The command
+        # is L for lines, A for circular arcs and E for other arcs that are moved like lines
+        self.edges = []
+
+        # for each path its transformation and its subpaths as [tokens, edges, closed]
+        self.paths = []
+
+        # center, radius, start angle and angle of the circular arcs
+        self.arcs = {}
+
+        # points of each edge, edges drawn twice with the earlier edge and True for the same direction
+        self.lines = []
+        self.twins = {}
+
+        # directions leaving each point by their angle and the position of a direction (edge, forward) there
+        self.leaving = []
+        self.positions = {}
+
+        # face of each direction, directions around each face, area of the face and True if it is a part
+        self.faces = {}
+        self.face_edges = []
+        self.areas = []
+        self.parts = []
+
+        # distance of each edge to its right side, moved edge and its new start and end point
+        self.distances = []
+        self.moved = []
+        self.starts = []
+        self.ends = []
+
+    @classmethod
+    def compensate(cls, svg: str, offset: float) -> str:
+        """ Moves the lines of the SVG by the offset
+
+        :param svg: SVG of the drawing
+        :param offset: half of the kerf in the unit of the drawing (dpi)
+        :return: SVG with the moved lines
+        """
+        kerf = cls(offset)
+        for element, matrix in PathGeometry.path_elements(ElementTree.fromstring(svg)):
+            kerf.add_path(element.get('d'), matrix)
+
+        if not kerf.edges:
+            return svg
+
+        new_paths = iter(kerf.moved_paths())
+
+        return cls.__PATH_DATA.sub(lambda match: f'{match.group(1)}{next(new_paths)}{match.group(3)}', svg)
+
+    def add_path(self, path: str, matrix: tuple) -> None:
+        """ Adds the subpaths of a path in the coordinates of the drawing
+
+        :param path: d attribute of the path
+        :param matrix: transformation of the path
+        :return:
+        """
+        a, b, c, d, e, f = matrix
+        determinant = a * d - b * c
+        scale = math.sqrt(abs(determinant))
+        rotation = math.degrees(math.atan2(b, a))
+
+        # circles stay circles without shear and with the same scale in both directions
+        similar = abs(a * a + b * b - c * c - d * d) < 1e-9 and abs(a * c + b * d) < 1e-9
+
+        subpaths = []
+        for tokens, segments, closed in PathGeometry.subpaths(path):
+            edges = []
+            for command, (x1, y1), (x2, y2), values in segments:
+                start = self.__point_index(a * x1 + c * y1 + e, b * x1 + d * y1 + f)
+                end = self.__point_index(a * x2 + c * y2 + e, b * x2 + d * y2 + f)
+                if start == end:
+                    continue
+
+                drawing_values = []
+                if command == 'A' and values[0] != 0 and values[1] != 0:
+                    drawing_values = [abs(values[0]) * scale, abs(values[1]) * scale, values[2] + rotation,
+                                      values[3] != 0, (values[4] != 0) != (determinant < 0)]
+                    if not similar or values[0] != values[1]:
+                        command = 'E'
+                else:
+                    command = 'L'
+
+                edges.append(len(self.edges))
+                self.edges.append([command, start, end, drawing_values, values])
+
+            if edges:
+                closed = closed or self.edges[edges[0]][1] == self.edges[edges[-1]][2]
+            subpaths.append([tokens, edges, closed])
+
+        self.paths.append((matrix, subpaths))
+
+    def moved_paths(self) -> list:
+        """ Moves the lines between parts and waste
+
+        :return: new d attribute for each path
+        """
+        self.__split_edges()
+
+        self.lines = [self.__line(index) for index in range(len(self.edges))]
+        self.__find_twins()
+        self.__trace_faces()
+        self.__find_parts()
+        self.__move_edges()
+        self.__join_edges()
+        self.__check_faces()
+
+        return [' '.join([self.__subpath(subpath, matrix) for subpath in subpaths])
+                for matrix, subpaths in self.paths]
+
+    def __point_index(self, x: float, y: float) -> int:
+        """ Index of the point. Points closer than the tolerance are the same point """
+        column = round(x / self.__TOLERANCE)
+        row = round(y / self.__TOLERANCE)
+        for cell in ((column + dx, row + dy) for dx in (-1, 0, 1) for dy in (-1, 0, 1)):
+            for index in self.cells.get(cell, ()):
+                if math.dist(self.points[index], (x, y)) < self.__TOLERANCE:
+                    return index
+
+        self.points.append((x, y))
+        self.cells.setdefault((column, row), []).append(len(self.points) - 1)
+        return len(self.points) - 1
+
+    def __split_edges(self) -> None:
+        """ Splits the edges at the points that are on them and where two lines cross """
+        edges = self.edges
+        bounds = [self.__edge_bounds(edge) for edge in edges]
+        grid, cell = self.__grid(bounds)
+
+        splits = {}
+        for point_index, (x, y) in enumerate(self.points):
+            for index in grid.get(cell(x, y), ()):
+                if point_index not in edges[index][1:3] and self.__on_edge(edges[index], x, y):
+                    splits.setdefault(index, []).append(point_index)
+
+        tested = set()
+        for indexes in grid.values():
+            crossing = [index for index in indexes if edges[index][0] != 'E']
+            for position, first in enumerate(crossing):
+                for second in crossing[position + 1:]:
+                    if (first, second) in tested or not self.__inside_bounds(bounds[first], bounds[second], True) or \
+                            set(edges[first][1:3]) & set(edges[second][1:3]):
+                        continue
+                    tested.add((first, second))
+
+                    for point in self.__crossings(edges[first], edges[second]):
+                        point_index = self.__point_index(*point)
+                        for index in (first, second):
+                            if point_index not in edges[index][1:3]:
+                                splits.setdefault(index, []).append(point_index)
+
+        if not splits:
+            return
+
+        new_indexes = []
+        self.edges = []
+        for index, edge in enumerate(edges):
+            parts = self.__split_edge(edge, splits.get(index, []))
+            new_indexes.append(list(range(len(self.edges), len(self.edges) + len(parts))))
+            self.edges.extend(parts)
+
+        for _, subpaths in self.paths:
+            for subpath in subpaths:
+                subpath[1] = [new_index for index in subpath[1] for new_index in new_indexes[index]]
+
+    def __split_edge(self, edge: list, point_indexes: list) -> list:
+        """ Parts of an edge between the points on it in the direction of the edge """
+        if not point_indexes:
+            return [edge]
+
+        command, start, end, values, path_values = edge
+        (x1, y1), (x2, y2) = self.points[start], self.points[end]
+
+        if command == 'A':
+            center_x, center_y, _, start_angle, delta = self.__arc(edge)
+
+            def position(point: tuple) -> float:
+                angle = math.atan2(point[1] - center_y, point[0] - center_x) - start_angle
+                return (angle if delta > 0 else -angle) % (2 * math.pi)
+        else:
+            def position(point: tuple) -> float:
+                return (point[0] - x1) * (x2 - x1) + (point[1] - y1) * (y2 - y1)
+
+        point_indexes = [start] + sorted(set(point_indexes), key=lambda index: position(self.points[index])) + [end]
+
+        parts = []
+        for first, second in zip(point_indexes, point_indexes[1:]):
+            part_values = values
+            if command == 'A':
+                part_values = values[:3] + [self.__is_large(values, self.points[first], self.points[second],
+                                                            center_x, center_y), values[4]]
+            parts.append([command, first, second, part_values, path_values])
+
+        return parts
+
+    def __find_twins(self) -> None:
+        """ Finds edges that lie on an earlier edge, i.e. a line that is drawn twice. A twin is not part of the
+        faces and is moved with the earlier edge.
+        """
+        self.twins = {}
+        between = {}
+        for index, (_, start, end, _, _) in enumerate(self.edges):
+            between.setdefault((min(start, end), max(start, end)), []).append(index)
+
+        for indexes in between.values():
+            for position, index in enumerate(indexes):
+                middle = self.__middle(self.lines[index])
+                for earlier in indexes[:position]:
+                    if earlier not in self.twins and \
+                            math.dist(middle, self.__middle(self.lines[earlier])) < self.__TOLERANCE:
+                        self.twins[index] = (earlier, self.edges[index][1] == self.edges[earlier][1])
+                        break
+
+    def __trace_faces(self) -> None:
+        """ Finds the faces between the edges. An edge is passed once in each direction. The face of a direction
+        is on its left side, the faces inside of connected edges have a positive area.
+        """
+        # directions leaving each point ordered by their angle
+        self.leaving = [[] for _ in self.points]
+        for index, line in enumerate(self.lines):
+            if index in self.twins:
+                continue
+            start, end = self.edges[index][1:3]
+            self.leaving[start].append((math.atan2(line[1][1] - line[0][1], line[1][0] - line[0][0]), index, True))
+            self.leaving[end].append((math.atan2(line[-2][1] - line[-1][1], line[-2][0] - line[-1][0]), index,
+                                      False))
+
+        self.positions = {}
+        for leaving in self.leaving:
+            leaving.sort()
+            for position, (_, index, forward) in enumerate(leaving):
+                self.positions[(index, forward)] = position
+
+        self.faces = {}
+        self.face_edges = []
+        self.areas = []
+        for index in range(len(self.edges)):
+            for direction in ((index, True), (index, False)):
+                if direction in self.faces or index in self.twins:
+                    continue
+
+                face = len(self.face_edges)
+                directions = []
+                while direction not in self.faces:
+                    self.faces[direction] = face
+                    directions.append(direction)
+
+                    # the next edge of the face turns right as far as possible
+                    edge_index, forward = direction
+                    point = self.edges[edge_index][2 if forward else 1]
+                    leaving = self.leaving[point]
+                    direction = leaving[self.positions[(edge_index, not forward)] - 1][1:]
+
+                self.face_edges.append(directions)
+                self.areas.append(self.__area(self.__face_polygon(directions, self.lines)))
+
+    def __find_parts(self) -> None:
+        """ Decides for each face if it is a part or waste """
+        # connected edges by their first point
+        parents = list(range(len(self.points)))
+
+        def root(point: int) -> int:
+            while parents[point] != point:
+                parents[point] = parents[parents[point]]
+                point = parents[point]
+            return point
+
+        for _, start, end, _, _ in self.edges:
+            parents[root(start)] = root(end)
+
+        groups = {}
+        for face, directions in enumerate(self.face_edges):
+            groups.setdefault(root(self.edges[directions[0][0]][1]), []).append(face)
+
+        # the outer face of connected edges has the smallest area
+        outlines = []
+        for faces in groups.values():
+            outer = min(faces, key=lambda face: self.areas[face])
+            polygon = self.__face_polygon(self.face_edges[outer], self.lines)
+            outlines.append((faces, outer, polygon, self.__bounds(polygon)))
+
+        grid, cell = self.__grid([bounds for _, _, _, bounds in outlines])
+        self.parts = [False] * len(self.face_edges)
+        for faces, outer, polygon, bounds in outlines:
+            x, y = polygon[0]
+            depth = sum(1 for index in grid.get(cell(x, y), ())
+                        if outlines[index][2] is not polygon and self.__inside_bounds(bounds, outlines[index][3]) and
+                        self.__inside(x, y, outlines[index][2]))
+
+            for face in faces:
+                self.parts[face] = (depth % 2 == 0) != (face == outer)
+
+    def __move_edges(self) -> None:
+        """ Moves the edges between a part and waste away from the part """
+        # the normal (dy, -dx) of an edge points to its right side
+        self.distances = []
+        for index in range(len(self.edges)):
+            if index in self.twins:
+                self.distances.append(0)
+                continue
+            left = self.parts[self.faces[(index, True)]]
+            right = self.parts[self.faces[(index, False)]]
+            self.distances.append(0 if left == right else self.offset if left else -self.offset)
+
+        self.__find_slots()
+
+        self.moved = []
+        for index, (command, start, end, values, _) in enumerate(self.edges):
+            segment = (command, self.points[start], self.points[end], values)
+            moved = self.__move(segment, self.distances[index]) if self.distances[index] != 0 else segment
+            if moved is None:
+                x, y = self.points[start]
+                raise DesignError(f'The kerf can not be compensated for the arc at {x:.2f}, {y:.2f} that is '
+                                  f'smaller than the kerf')
+
+            self.moved.append(moved)
+
+    def __find_slots(self) -> None:
+        """ An open subpath with both ends on the lines of an earlier path cuts a slot into a part, i.e. the side
+        cuts of the partitions of an ItemBox. The slot is inside of the subpath and the line between its ends.
+        The edges of the subpath inside of the part move into the slot.
+        """
+        first_paths = [len(self.paths)] * len(self.points)
+        for path_index, (_, subpaths) in enumerate(self.paths):
+            for _, edges, _ in subpaths:
+                for index in edges:
+                    for point in self.edges[index][1:3]:
+                        first_paths[point] = min(first_paths[point], path_index)
+
+        for path_index, (_, subpaths) in enumerate(self.paths):
+            for _, edges, closed in subpaths:
+                if closed or not edges or first_paths[self.edges[edges[0]][1]] >= path_index or \
+                        first_paths[self.edges[edges[-1]][2]] >= path_index:
+                    continue
+
+                # a straight line through a part divides it. The slot is on the left side of the subpath if its
+                # polygon has a positive area
+                polygon = [point for index in edges for point in self.lines[index][:-1]] + [self.lines[edges[-1]][-1]]
+                area = self.__area(polygon)
+                if abs(area) < self.__TOLERANCE * self.__length(polygon):
+                    continue
+                distance = -self.offset if area > 0 else self.offset
+                for index in edges:
+                    if index not in self.twins and self.parts[self.faces[(index, True)]] and \
+                            self.parts[self.faces[(index, False)]]:
+                        self.distances[index] = distance
+
+    def __join_edges(self) -> None:
+        """ Finds the new end points of the edges. A moved edge meets the edge on its side of the waste and
+        reaches a common cut on the side of the part. A common cut reaches the moved edges beside it.
+        """
+        self.starts = [segment[1] for segment in self.moved]
+        self.ends = [segment[2] for segment in self.moved]
+        limit = self.__MITER_LIMIT * abs(self.offset)
+
+        for point, leaving in enumerate(self.leaving):
+            for position, (_, index, forward) in enumerate(leaving):
+                neighbours = [leaving[(position + 1) % len(leaving)][1], leaving[position - 1][1]]
+
+                if self.distances[index] != 0:
+                    # the edge moves to the right side of the direction leaving the point or to its left side
+                    side = 1 if (self.distances[index] > 0) == forward else 0
+                    reference = self.moved[index][1 if forward else 2]
+                    new_point = self.__curve_intersection(index, neighbours[side], reference)
+                    if new_point is None or (math.dist(new_point, reference) > limit and
+                                             self.__is_subpath_corner(index, neighbours[side])):
+                        new_point = reference
+
+                    # the edge is longer if the common cut meets it outside of the corner
+                    if self.distances[neighbours[1 - side]] == 0:
+                        line = self.lines[index]
+                        dx, dy = (line[1][0] - line[0][0], line[1][1] - line[0][1]) if forward else \
+                            (line[-2][0] - line[-1][0], line[-2][1] - line[-1][1])
+                        candidate = self.__curve_intersection(index, neighbours[1 - side], reference)
+                        if candidate is not None and math.dist(candidate, reference) <= limit and \
+                                (candidate[0] - new_point[0]) * dx + (candidate[1] - new_point[1]) * dy < 0:
+                            new_point = candidate
+                else:
+                    reference = self.points[point]
+                    new_point = reference
+                    for neighbour in neighbours:
+                        if self.distances[neighbour] == 0:
+                            continue
+                        candidate = self.__curve_intersection(index, neighbour, reference)
+                        if candidate is not None and \
+                                math.dist(new_point, reference) < math.dist(candidate, reference) <= limit:
+                            new_point = candidate
+
+                if forward:
+                    self.starts[index] = new_point
+                else:
+                    self.ends[index] = new_point
+
+        for index, (earlier, same_direction) in self.twins.items():
+            command, start, end, values = self.moved[earlier]
+            if same_direction:
+                self.distances[index] = self.distances[earlier]
+                self.moved[index] = self.moved[earlier]
+                self.starts[index], self.ends[index] = self.starts[earlier], self.ends[earlier]
+            else:
+                self.distances[index] = -self.distances[earlier]
+                self.moved[index] = (command, end, start, values[:4] + [not values[4]] if values else values)
+                self.starts[index], self.ends[index] = self.ends[earlier], self.starts[earlier]
+
+    def __check_faces(self) -> None:
+        """ Raises an error if a face does not grow or shrink by the offset along its moved edges, i.e. the
+        outline of a part grows by half of the kerf and a slot shrinks by half of the kerf.
+        """
+        new_lines = [self.__new_line(index) for index in range(len(self.edges))]
+
+        for face, directions in enumerate(self.face_edges):
+            moved = [(index, forward) for index, forward in directions if self.distances[index] != 0]
+            if self.areas[face] <= 0 or not moved:
+                continue
+
+            # an edge moving to its right side moves away from the face on its left side
+            length = sum(self.__length(self.lines[index]) for index, _ in moved)
+            expected = sum(self.__length(self.lines[index]) * (self.distances[index] if forward
+                                                                else -self.distances[index])
+                           for index, forward in moved)
+            change = self.__area(self.__face_polygon(directions, new_lines)) - self.areas[face]
+
+            # corners and the ends of common cuts change the area by less than a miter
+            allowed = 2 * self.__MITER_LIMIT * self.offset * self.offset * len(directions) + \
+                self.__TOLERANCE * length
+            if abs(change - expected) > allowed:
+                x, y = self.points[self.edges[moved[0][0]][1]]
+                raise DesignError(f'The kerf can not be compensated for the lines at {x:.2f}, {y:.2f}. '
+                                  f'They do not form closed contours')
+
+    def __subpath(self, subpath: list, matrix: tuple) -> str:
+        """ d attribute of a subpath with the moved edges in the coordinates of the path
+
+        :param subpath: tokens, edges and closed of the subpath
+        :param matrix: transformation of the path
+        :return: d attribute of the subpath
+        """
+        tokens, edges, closed = subpath
+        if not any(self.distances[index] != 0 or self.starts[index] != self.points[self.edges[index][1]] or
+                   self.ends[index] != self.points[self.edges[index][2]] for index in edges):
+            return ' '.join(tokens)
+
+        a, b, c, d, e, f = matrix
+        determinant = a * d - b * c
+        scale = math.sqrt(abs(determinant))
+
+        def point(drawing_point: tuple) -> str:
+            x = drawing_point[0] - e
+            y = drawing_point[1] - f
+            return self.__point(((d * x - c * y) / determinant, (a * y - b * x) / determinant))
+
+        output = [f'M {point(self.starts[edges[0]])}']
+        for position, index in enumerate(edges):
+            command, _, _, _, path_values = self.edges[index]
+            start, end = self.starts[index], self.ends[index]
+
+            if position > 0 and math.dist(self.ends[edges[position - 1]], start) >= self.__TOLERANCE:
+                output.append(f'L {point(start)}')
+
+            if command == 'A':
+                values = self.moved[index][3]
+                center_x, center_y = self.__arc(self.edges[index])[:2]
+                large = self.__is_large(values, start, end, center_x, center_y)
+                output.append(f'A {self.__number(values[0] / scale)} {self.__number(values[0] / scale)} '
+                              f'{self.__number(path_values[2])} {int(large)} {int(path_values[4] != 0)} {point(end)}')
+            elif command == 'E':
+                output.append(f'A {self.__number(path_values[0])} {self.__number(path_values[1])} '
+                              f'{self.__number(path_values[2])} {int(path_values[3] != 0)} '
+                              f'{int(path_values[4] != 0)} {point(end)}')
+            elif position < len(edges) - 1:
+                # a line that goes on in the same direction replaces the point where the edge was split
+                if not self.__is_straight(start, end, edges[position + 1]):
+                    output.append(f'L {point(end)}')
+            elif not closed or math.dist(end, self.starts[edges[0]]) >= self.__TOLERANCE:
+                # the last line to the start is drawn by Z
+                output.append(f'L {point(end)}')
+
+        if closed:
+            output.append('Z')
+
+        return ' '.join(output)
+
+    def __is_straight(self, start: tuple, end: tuple, following: int) -> bool:
+        """ True if the following edge is a line from the end in the direction of the line from start to end """
+        following_start, following_end = self.starts[following], self.ends[following]
+        if self.edges[following][0] != 'L' or math.dist(end, following_start) >= self.__TOLERANCE:
+            return False
+
+        dx, dy = end[0] - start[0], end[1] - start[1]
+        following_dx, following_dy = following_end[0] - end[0], following_end[1] - end[1]
+        return dx * following_dx + dy * following_dy > 0 and \
+            abs(dx * following_dy - dy * following_dx) < self.__TOLERANCE * math.hypot(following_dx, following_dy)
+
+    def __is_subpath_corner(self, first: int, second: int) -> bool:
+        """ True if the edges follow each other in a subpath. A corner of a subpath is connected by a line """
+        for _, subpaths in self.paths:
+            for _, edges, closed in subpaths:
+                if first in edges and second in edges:
+                    distance = abs(edges.index(first) - edges.index(second))
+                    return distance == 1 or (closed and distance == len(edges) - 1)
+
+        return False
+
+    def __curve_intersection(self, first: int, second: int, reference: tuple):
+        """ Intersection of the lines or circles through the new position of two edges closest to the reference
+
+        :return: (x, y) or None if they do not meet
+        """
+        if first == second:
+            return None
+
+        first_segment, second_segment = self.moved[first], self.moved[second]
+        if first_segment[0] != 'A' and second_segment[0] != 'A':
+            return self.__intersection(first_segment, second_segment)
+
+        if first_segment[0] != 'A':
+            points = self.__line_circle(first_segment, self.__circle(second))
+        elif second_segment[0] != 'A':
+            points = self.__line_circle(second_segment, self.__circle(first))
+        else:
+            points = self.__circle_circle(self.__circle(first), self.__circle(second))
+
+        return min(points, key=lambda point: math.dist(point, reference), default=None)
+
+    def __circle(self, index: int) -> tuple:
+        """ Center and radius of a moved arc """
+        center_x, center_y = self.__arc(self.edges[index])[:2]
+        return center_x, center_y, self.moved[index][3][0]
+
+    def __arc(self, edge: list) -> tuple:
+        """ Center, radius, start angle and angle of a circular arc """
+        values = edge[3]
+        key = (edge[1], edge[2], values[0], values[3], values[4])
+        if key not in self.arcs:
+            (x1, y1), (x2, y2) = self.points[edge[1]], self.points[edge[2]]
+            center_x, center_y, radius, _, start_angle, delta = \
+                PathGeometry.arc_center(x1, y1, values[0], values[0], 0, values[3], values[4], x2, y2)
+            self.arcs[key] = center_x, center_y, radius, start_angle, delta
+
+        return self.arcs[key]
+
+    @staticmethod
+    def __is_large(values: list, start: tuple, end: tuple, center_x: float, center_y: float) -> bool:
+        """ True if the arc from start to end around the center in the direction of its sweep is longer
+        than half of the circle
+        """
+        delta = math.atan2(end[1] - center_y, end[0] - center_x) - math.atan2(start[1] - center_y,
+                                                                               start[0] - center_x)
+        delta = delta % (2 * math.pi) if values[4] else -delta % (2 * math.pi)
+        return delta > math.pi
+
+    def __line(self, index: int) -> list:
+        """ Points of an edge. Arcs are replaced by lines """
+        command, start, end, values, _ = self.edges[index]
+        return self.__segment_line((command, self.points[start], self.points[end], values))
+
+    def __new_line(self, index: int) -> list:
+        """ Points of an edge at its new position """
+        command, _, _, values = self.moved[index]
+        if command == 'A':
+            center_x, center_y = self.__arc(self.edges[index])[:2]
+            values = values[:3] + [self.__is_large(values, self.starts[index], self.ends[index], center_x,
+                                                   center_y), values[4]]
+
+        return self.__segment_line((command, self.starts[index], self.ends[index], values))
+
+    @classmethod
+    def __segment_line(cls, segment: tuple) -> list:
+        command, start, end, values = segment
+        if command == 'L':
+            return [start, end]
+
+        return [start] + PathGeometry.arc_points(*start, *values[:3], values[3], values[4], *end, cls.__TOLERANCE)
+
+    @staticmethod
+    def __face_polygon(directions: list, lines: list) -> list:
+        """ Points around a face. The end points are kept, moved edges that do not meet are connected by a line """
+        polygon = []
+        for index, forward in directions:
+            polygon.extend(lines[index] if forward else lines[index][::-1])
+
+        return polygon
+
+    @staticmethod
+    def __area(polygon: list) -> float:
+        return sum(x1 * y2 - x2 * y1 for (x1, y1), (x2, y2) in zip(polygon, polygon[1:] + polygon[:1])) / 2
+
+    @staticmethod
+    def __length(line: list) -> float:
+        return sum(math.dist(first, second) for first, second in zip(line, line[1:]))
+
+    @staticmethod
+    def __middle(line: list) -> tuple:
+        if len(line) == 2:
+            return (line[0][0] + line[1][0]) / 2, (line[0][1] + line[1][1]) / 2
+
+        return line[len(line) // 2]
+
+    def __edge_bounds(self, edge: list) -> tuple:
+        (x1, y1), (x2, y2) = self.points[edge[1]], self.points[edge[2]]
+        if edge[0] == 'A':
+            center_x, center_y, radius = self.__arc(edge)[:3]
+            return center_x - radius, center_y - radius, center_x + radius, center_y + radius
+
+        return min(x1, x2), min(y1, y2), max(x1, x2), max(y1, y2)
+
+    def __on_edge(self, edge: list, x: float, y: float) -> bool:
+        """ True if the point is inside of a line or circular arc. Other arcs are not tested """
+        command, start, end, _, _ = edge
+        (x1, y1), (x2, y2) = self.points[start], self.points[end]
+
+        if command == 'L':
+            length = math.hypot(x2 - x1, y2 - y1)
+            along = ((x - x1) * (x2 - x1) + (y - y1) * (y2 - y1)) / length
+            across = ((x - x1) * (y2 - y1) - (y - y1) * (x2 - x1)) / length
+            return abs(across) < self.__TOLERANCE and self.__TOLERANCE < along < length - self.__TOLERANCE
+
+        if command == 'A':
+            center_x, center_y, radius, start_angle, delta = self.__arc(edge)
+            if abs(math.hypot(x - center_x, y - center_y) - radius) >= self.__TOLERANCE:
+                return False
+            angle = math.atan2(y - center_y, x - center_x) - start_angle
+            angle = angle % (2 * math.pi) if delta > 0 else -angle % (2 * math.pi)
+            return self.__TOLERANCE < angle * radius < abs(delta) * radius - self.__TOLERANCE
+
+        return False
+
+    def __crossings(self, first: list, second: list) -> list:
+        """ Points where two lines or circular arcs cross inside of both """
+        segments = []
+        circles = []
+        for edge in (first, second):
+            if edge[0] == 'A':
+                circles.append(self.__arc(edge)[:3])
+            else:
+                segments.append(('L', self.points[edge[1]], self.points[edge[2]], []))
+
+        if len(segments) == 2:
+            point = self.__intersection(*segments)
+            points = [] if point is None else [point]
+        elif segments:
+            points = self.__line_circle(segments[0], circles[0])
+        else:
+            points = self.__circle_circle(*circles)
+
+        return [point for point in points if self.__on_edge(first, *point) and self.__on_edge(second, *point)]
+
+    @classmethod
+    def __grid(cls, bounds: list) -> tuple:
+        """ Puts the bounds into a uniform grid, that only the bounds around a point are tested
+
+        :return: indexes of the bounds by the cells they cover and a function that returns the cell of a point
+        """
+        if not bounds:
+            return {}, None
+
+        min_x = min(left for left, _, _, _ in bounds)
+        min_y = min(top for _, top, _, _ in bounds)
+        max_x = max(right for _, _, right, _ in bounds)
+        max_y = max(bottom for _, _, _, bottom in bounds)
+
+        # about one bound per cell
+        size = max(max_x - min_x, max_y - min_y, cls.__TOLERANCE) / max(1.0, math.sqrt(len(bounds)))
+
+        def cell(x: float, y: float) -> tuple:
+            return int((x - min_x) / size), int((y - min_y) / size)
+
+        grid = {}
+        for index, (left, top, right, bottom) in enumerate(bounds):
+            first_column, first_row = cell(left - cls.__TOLERANCE, top - cls.__TOLERANCE)
+            last_column, last_row = cell(right + cls.__TOLERANCE, bottom + cls.__TOLERANCE)
+            for column in range(first_column, last_column + 1):
+                for row in range(first_row, last_row + 1):
+                    grid.setdefault((column, row), []).append(index)
+
+        return grid, cell
+
+    @staticmethod
+    def __bounds(polygon: list) -> tuple:
+        return min(x for x, _ in polygon), min(y for _, y in polygon), \
+            max(x for x, _ in polygon), max(y for _, y in polygon)
+
+    @classmethod
+    def __inside_bounds(cls, inner: tuple, outer: tuple, overlap: bool = False) -> bool:
+        """ True if the inner bounds are inside of the outer bounds or if they overlap """
+        if overlap:
+            return inner[0] <= outer[2] + cls.__TOLERANCE and outer[0] <= inner[2] + cls.__TOLERANCE and \
+                inner[1] <= outer[3] + cls.__TOLERANCE and outer[1] <= inner[3] + cls.__TOLERANCE
+
+        return outer[0] <= inner[0] and outer[1] <= inner[1] and inner[2] <= outer[2] and inner[3] <= outer[3]
+
+    @staticmethod
+    def __inside(x: float, y: float, polygon: list) -> bool:
+        """ Ray casting test if the point is inside of the polygon """
+        inside = False
+        for (x1, y1), (x2, y2) in zip(polygon, polygon[1:] + polygon[:1]):
+            if (y1 > y) != (y2 > y) and x < x1 + (y - y1) * (x2 - x1) / (y2 - y1):
+                inside = not inside
+
+        return inside
+
+    @staticmethod
+    def __move(segment: tuple, distance: float):
+        """ Moves a segment by the distance along its normal (dy, -dx)
+
+        :return: moved segment or None if an arc vanishes
+        """
+        command, (x1, y1), (x2, y2), values = segment
+
+        if command == 'A':
+            center_x, center_y, radius, _, _, _ = PathGeometry.arc_center(x1, y1, values[0], values[0], 0,
+                                                                          values[3], values[4], x2, y2)
+
+            # the normal of an arc with sweep 1 points away from the center
+            new_radius = radius + (distance if values[4] else -distance)
+            if new_radius <= 0:
+                return None
+
+            factor = new_radius / radius
+            return ('A', (center_x + (x1 - center_x) * factor, center_y + (y1 - center_y) * factor),
+                    (center_x + (x2 - center_x) * factor, center_y + (y2 - center_y) * factor),
+                    [new_radius, new_radius] + list(values[2:5]))
+
+        # other arcs are moved like lines
+        length = math.hypot(x2 - x1, y2 - y1)
+        dx = (y2 - y1) / length * distance
+        dy = -(x2 - x1) / length * distance
+        return command, (x1 + dx, y1 + dy), (x2 + dx, y2 + dy), values
+
+    @staticmethod
+    def __intersection(first: tuple, second: tuple):
+        """ Intersection of the lines through two segments or None if they are parallel """
+        (x1, y1), (x2, y2) = first[1], first[2]
+        (x3, y3), (x4, y4) = second[1], second[2]
+
+        denominator = (x2 - x1) * (y4 - y3) - (y2 - y1) * (x4 - x3)
+        if abs(denominator) < 1e-12:
+            return None
+
+        t = ((x3 - x1) * (y4 - y3) - (y3 - y1) * (x4 - x3)) / denominator
+        return x1 + t * (x2 - x1), y1 + t * (y2 - y1)
+
+    @staticmethod
+    def __line_circle(segment: tuple, circle: tuple) -> list:
+        """ Intersections of the line through a segment with a circle """
+        (x1, y1), (x2, y2) = segment[1], segment[2]
+        center_x, center_y, radius = circle
+
+        dx = x2 - x1
+        dy = y2 - y1
+        a = dx * dx + dy * dy
+        b = 2 * (dx * (x1 - center_x) + dy * (y1 - center_y))
+        c = (x1 - center_x) ** 2 + (y1 - center_y) ** 2 - radius * radius
+        discriminant = b * b - 4 * a * c
+        if a == 0 or discriminant < 0:
+            return []
+
+        root = math.sqrt(discriminant)
+        return [(x1 + t * dx, y1 + t * dy) for t in ((-b - root) / (2 * a), (-b + root) / (2 * a))]
+
+    @staticmethod
+    def __circle_circle(first: tuple, second: tuple) -> list:
+        """ Intersections of two circles """
+        x1, y1, r1 = first
+        x2, y2, r2 = second
+
+        distance = math.hypot(x2 - x1, y2 - y1)
+        if distance == 0 or distance > r1 + r2 or distance < abs(r1 - r2):
+            return []
+
+        along = (r1 * r1 - r2 * r2 + distance * distance) / (2 * distance)
+        across = math.sqrt(max(0.0, r1 * r1 - along * along))
+        x = x1 + along * (x2 - x1) / distance
+        y = y1 + along * (y2 - y1) / distance
+        return [(x + across * (y2 - y1) / distance, y - across * (x2 - x1) / distance),
+                (x - across * (y2 - y1) / distance, y + across * (x2 - x1) / distance)]
+
+    @classmethod
+    def __point(cls, point: tuple) -> str:
+        return f'{cls.__number(point[0])} {cls.__number(point[1])}'
+
+    @staticmethod
+    def __number(value: float) -> str:
+        return f'{value:.4f}'
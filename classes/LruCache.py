@@ -0,0 +1,56 @@
+from collections import OrderedDict
+
+
+class LruCache:
+    """ Bounded cache for the whole process. When the cache is full the least recently used entry is removed. """
+    __slots__ = ('maxsize', '__entries', 'hits', 'misses')
+
+    def __init__(self, maxsize: int = 128):
+        """
+        :param maxsize: maximum number of entries in the cache
+        """
+        self.maxsize = maxsize
+        self.__entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        """ Delivers the entry for the key and marks it as recently used
+
+        :param key: key of the entry
+        :param default: value if there is no entry for the key
+        :return: cached entry or default
+        """
+        try:
+            value = self.__entries[key]
+        except KeyError:
+            self.misses += 1
+            return default
+
+        self.__entries.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key, value) -> None:
+        """ Stores an entry. Removes the least recently used entry if the cache is full
+
+        :param key: key of the entry
+        :param value: value of the entry
+        :return:
+        """
+        self.__entries[key] = value
+        self.__entries.move_to_end(key)
+
+        if len(self.__entries) > self.maxsize:
+            self.__entries.popitem(last=False)
+
+    def clear(self) -> None:
+        self.__entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+    def __contains__(self, key) -> bool:
+        return key in self.__entries
+
+    def __len__(self) -> int:
+        return len(self.__entries)
@@ -0,0 +1,294 @@
+from typing import NamedTuple
+from xml.etree import ElementTree
+from classes.Design import Design
+from classes.File import File
+from classes.Part import Part
+from classes.PathGeometry import PathGeometry
+from classes.OverlapCheck import OverlapCheck
+from classes.InsertMakerError import NestingError
+from classes.Settings import Settings, Setting, number
+from classes.ConfigConstants import ConfigConstantsText as Ct
+from classes.ConfigConstants import ConfigConstantsTemplate as Cm
+
+
+class C:
+    nesting = 'nesting'
+    sheet_width = 'sheet width'
+    sheet_height = 'sheet height'
+    sheet_spacing = 'sheet spacing'
+    overlap_check = 'overlap check'
+
+
+class NestingSettings(Settings):
+    __slots__ = ()
+
+    template_file = Setting(Ct.template_file, str, 'NestingSheet.svg')
+
+    # default is a 12x12in mat
+    sheet_width = Setting(C.sheet_width, number, 304.8, measure=True)
+    sheet_height = Setting(C.sheet_height, number, 304.8, measure=True)
+
+    # distance between the parts and to the border of the sheet
+    sheet_spacing = Setting(C.sheet_spacing, number, 2, measure=True)
+
+    # stop if parts on a sheet cross each other
+    overlap_check = Setting(C.overlap_check, bool, True)
+
+
+class Placement(NamedTuple):
+    part: Part
+
+    # upper left corner of the part on the sheet in tdpi
+    x: int
+    y: int
+
+    # part is rotated by 90 degrees
+    rotated: bool
+
+
+class Nesting(Design):
+    """ Places the parts of a project on as few sheets of material as possible and writes one SVG per sheet.
+
+    The parts are packed by the bounding box of their lines with the MaxRects heuristic (best short side fit).
+    Parts may be rotated by 90 degrees.
+    """
+    __DEFAULT_FILENAME = 'Sheet'
+
+    # maximal distance between an arc and its polyline for the size of a part in dpi
+    __TOLERANCE = 0.01
+
+    settings_class = NestingSettings
+
+    def __init__(self, **kwargs):
+        super().__init__(kwargs)
+
+        # the parts to place. The sheets written by this design are no parts
+        self.nesting_parts = self.parts if self.parts is not None else []
+        self.parts = None
+
+        # the kerf is already compensated in the parts
+        self.settings.kerf = 0
+
+    def create(self) -> None:
+        sheets = self.pack([self.bounds(part) for part in self.nesting_parts])
+
+        if self.settings.overlap_check:
+            self.check_overlaps(sheets)
+
+        filename = f'{self.get_project_name_for_title()}{self.__DEFAULT_FILENAME}'
+
+        for number_of_sheet, placements in enumerate(sheets, start=1):
+            self.settings.title = f'{filename}-{number_of_sheet}'
+            self.settings.filename = File.set_svg_extension(Design.make_safe_filename(self.settings.title))
+
+            self.template_variables = {Ct.template_file: self.settings.template_file,
+                                       Cm.svgpath: ''.join([self.__place(placement, number_of_part)
+                                                            for number_of_part, placement in
+                                                            enumerate(placements, start=1)]),
+                                       Cm.viewbox_x: self.settings.sheet_width_tdpi,
+                                       Cm.viewbox_y: self.settings.sheet_height_tdpi}
+
+            self.write_to_file(self.template_variables)
+            print(f'Sheet {self.written_files()} with {len(placements)} parts created')
+
+    def check_overlaps(self, sheets: list) -> None:
+        """ Terminates if the drawings of parts on a sheet cross each other, i.e. because a drawing is
+        bigger than its viewbox
+
+        :param sheets: placements of the parts on each sheet
+        :return:
+        """
+        error = ''
+        for number_of_sheet, placements in enumerate(sheets, start=1):
+            check = OverlapCheck()
+            for number_of_part, placement in enumerate(placements, start=1):
+                root = ElementTree.fromstring(placement.part.svg)
+                for elem in list(root):
+                    if elem.attrib.get('id') == 'document-labels':
+                        root.remove(elem)
+                check.add_element(f'{placement.part.name} (part-{number_of_part})', root,
+                                  PathGeometry.parse_transform(self.__transform(placement)), PathGeometry.ids(root))
+
+            for conflict in check.conflicts():
+                error += f'Sheet {number_of_sheet}: {conflict.first} crosses {conflict.second} ' \
+                         f'at {round(conflict.x, 2)}, {round(conflict.y, 2)}\n'
+
+        if error:
+            raise NestingError(error.rstrip())
+
+    @staticmethod
+    def bounds(part: Part) -> Part:
+        """ The part with the size of its lines. The viewbox of a drawing begins at the origin and includes the
+        offset and the margin of the design, only the lines are placed on the sheet.
+
+        :param part: part with the size of its viewbox
+        :return: part with the upper left corner and the size of its lines
+        """
+        root = ElementTree.fromstring(part.svg)
+        for elem in list(root):
+            if elem.attrib.get('id') == 'document-labels':
+                root.remove(elem)
+
+        segments = PathGeometry.element_segments(root, PathGeometry.IDENTITY, Nesting.__TOLERANCE,
+                                                 PathGeometry.ids(root))
+        if not segments:
+            return part
+
+        left = Design.dpi_to_tdpi(min(min(x1, x2) for x1, _, x2, _ in segments))
+        top = Design.dpi_to_tdpi(min(min(y1, y2) for _, y1, _, y2 in segments))
+        right = Design.dpi_to_tdpi(max(max(x1, x2) for x1, _, x2, _ in segments))
+        bottom = Design.dpi_to_tdpi(max(max(y1, y2) for _, y1, _, y2 in segments))
+
+        return part._replace(width=right - left, height=bottom - top, left=left, top=top)
+
+    def pack(self, parts: list) -> list:
+        """ Packs the parts on sheets
+
+        :param parts: parts to place
+        :return: list of sheets with the placements of the parts on the sheet
+        """
+        spacing = self.settings.sheet_spacing_tdpi
+
+        # the spacing is added to every part. The sheet begins after the spacing at the border
+        width = self.settings.sheet_width_tdpi - spacing
+        height = self.settings.sheet_height_tdpi - spacing
+
+        error = ''
+        for part in parts:
+            if not self.__fits(part.width + spacing, part.height + spacing, width, height) and \
+                    not self.__fits(part.height + spacing, part.width + spacing, width, height):
+                error += f'Part {part.name} with {self.tdpi_to_unit(part.width)} x ' \
+                         f'{self.tdpi_to_unit(part.height)} {self.settings.unit} does not fit on the sheet.\n'
+
+        if error:
+            raise NestingError(error.rstrip())
+
+        # big parts first. Small parts fill the gaps
+        parts = sorted(parts, key=lambda item: (max(item.width, item.height), item.width * item.height),
+                       reverse=True)
+
+        # free rectangles of each sheet as [x, y, width, height] and the placements on it
+        sheets = []
+
+        for part in parts:
+            part_width = part.width + spacing
+            part_height = part.height + spacing
+
+            for free_rectangles, placements in sheets:
+                placement = self.__place_on_sheet(part, part_width, part_height, free_rectangles, spacing)
+                if placement is not None:
+                    placements.append(placement)
+                    break
+            else:
+                free_rectangles = [[0, 0, width, height]]
+                placement = self.__place_on_sheet(part, part_width, part_height, free_rectangles, spacing)
+                sheets.append((free_rectangles, [placement]))
+
+        return [placements for _, placements in sheets]
+
+    @staticmethod
+    def __fits(width: int, height: int, free_width: int, free_height: int) -> bool:
+        return width <= free_width and height <= free_height
+
+    @classmethod
+    def __place_on_sheet(cls, part: Part, width: int, height: int, free_rectangles: list, spacing: int):
+        """ Finds the free rectangle with the best short side fit and splits the free rectangles
+
+        :return: placement of the part or None if the part does not fit on the sheet
+        """
+        best = None
+        for free_x, free_y, free_width, free_height in free_rectangles:
+            for rotated, used_width, used_height in ((False, width, height), (True, height, width)):
+                if not cls.__fits(used_width, used_height, free_width, free_height):
+                    continue
+
+                short_side = min(free_width - used_width, free_height - used_height)
+                long_side = max(free_width - used_width, free_height - used_height)
+                if best is None or (short_side, long_side) < best[0]:
+                    best = ((short_side, long_side), free_x, free_y, used_width, used_height, rotated)
+
+        if best is None:
+            return None
+
+        _, x, y, used_width, used_height, rotated = best
+        cls.__split_free_rectangles(free_rectangles, x, y, used_width, used_height)
+
+        return Placement(part, x + spacing, y + spacing, rotated)
+
+    @staticmethod
+    def __split_free_rectangles(free_rectangles: list, x: int, y: int, width: int, height: int) -> None:
+        """ Replaces every free rectangle that overlaps the used rectangle by the maximal free rectangles
+        around it and removes the free rectangles that are inside of other free rectangles
+        """
+        right = x + width
+        bottom = y + height
+
+        result = []
+        for free in free_rectangles:
+            free_x, free_y, free_width, free_height = free
+            free_right = free_x + free_width
+            free_bottom = free_y + free_height
+
+            if x >= free_right or right <= free_x or y >= free_bottom or bottom <= free_y:
+                result.append(free)
+                continue
+
+            if x > free_x:
+                result.append([free_x, free_y, x - free_x, free_height])
+            if right < free_right:
+                result.append([right, free_y, free_right - right, free_height])
+            if y > free_y:
+                result.append([free_x, free_y, free_width, y - free_y])
+            if bottom < free_bottom:
+                result.append([free_x, bottom, free_width, free_bottom - bottom])
+
+        free_rectangles[:] = [free for index, free in enumerate(result)
+                              if not any(Nesting.__contains(other, free) and (other != free or other_index < index)
+                                         for other_index, other in enumerate(result) if other_index != index)]
+
+    @staticmethod
+    def __contains(outer: list, inner: list) -> bool:
+        return outer[0] <= inner[0] and outer[1] <= inner[1] and \
+            inner[0] + inner[2] <= outer[0] + outer[2] and inner[1] + inner[3] <= outer[1] + outer[3]
+
+    @staticmethod
+    def __transform(placement: Placement) -> str:
+        """ SVG transformation that moves the upper left corner of the lines of the part to its place on the
+        sheet
+        """
+        part = placement.part
+        if placement.rotated:
+            translate_x = placement.x + part.height + part.top
+            translate_y = placement.y - part.left
+        else:
+            translate_x = placement.x - part.left
+            translate_y = placement.y - part.top
+
+        transform = f'translate({Design.tdpi_to_dpi(translate_x)}, {Design.tdpi_to_dpi(translate_y)})'
+        if placement.rotated:
+            transform += ' rotate(90)'
+
+        return transform
+
+    def __place(self, placement: Placement, number_of_part: int) -> str:
+        return f'    <g id="part-{number_of_part}" transform="{self.__transform(placement)}">\n' \
+               f'{self.__part_svg(placement.part)}\n    </g>\n'
+
+    @staticmethod
+    def __part_svg(part: Part) -> str:
+        """ The drawing of the part without its labels. The viewport ends with the lines of the part """
+        ElementTree.register_namespace('', 'http://www.w3.org/2000/svg')
+        ElementTree.register_namespace('xlink', 'http://www.w3.org/1999/xlink')
+
+        root = ElementTree.fromstring(part.svg)
+        for elem in list(root):
+            if elem.attrib.get('id') == 'document-labels':
+                root.remove(elem)
+
+        width = Design.tdpi_to_dpi(part.left + part.width)
+        height = Design.tdpi_to_dpi(part.top + part.height)
+        root.set('viewBox', f'0 0 {width} {height}')
+        root.set('width', f'{width}')
+        root.set('height', f'{height}')
+
+        return ElementTree.tostring(root, encoding='unicode')
@@ -0,0 +1,151 @@
+import math
+from typing import NamedTuple
+from xml.etree import ElementTree
+from classes.PathGeometry import PathGeometry
+
+
+class Conflict(NamedTuple):
+    first: str
+    second: str
+
+    # point where the parts cross
+    x: float
+    y: float
+
+
+class OverlapCheck:
+    """ Finds lines of different parts that cross or touch each other.
+
+    The segments of all parts are put into a uniform grid. Only segments in the same cell of the grid are
+    compared, that the check is fast for drawings with many segments.
+    """
+
+    # tolerance for arcs and for touching segments in the unit of the drawing (dpi)
+    __TOLERANCE = 0.01
+
+    def __init__(self):
+        self.owners = []
+        self.segments = []
+
+    def add_segments(self, owner: str, segments: list) -> None:
+        """ Adds the segments of a part
+
+        :param owner: name of the part
+        :param segments: list of segments (x1, y1, x2, y2)
+        :return:
+        """
+        self.owners.extend([owner] * len(segments))
+        self.segments.extend(segments)
+
+    def add_element(self, owner: str, element: ElementTree.Element, matrix: tuple = PathGeometry.IDENTITY,
+                    ids: dict = None) -> None:
+        """ Adds all paths of an SVG element as a part
+
+        :param owner: name of the part
+        :param element: SVG element with the drawing of the part
+        :param matrix: transformation of the element
+        :param ids: elements by their id for <use>
+        :return:
+        """
+        self.add_segments(owner, PathGeometry.element_segments(element, matrix, self.__TOLERANCE, ids))
+
+    def conflicts(self) -> list:
+        """ Finds the crossing parts. Each pair of parts is reported once
+
+        :return: list of conflicts
+        """
+        segments = self.segments
+        owners = self.owners
+        if len(set(owners)) < 2:
+            return []
+
+        min_x = min(min(segment[0], segment[2]) for segment in segments)
+        min_y = min(min(segment[1], segment[3]) for segment in segments)
+        max_x = max(max(segment[0], segment[2]) for segment in segments)
+        max_y = max(max(segment[1], segment[3]) for segment in segments)
+
+        # about one segment per cell, but a segment should not cover many cells
+        average = sum(max(abs(x2 - x1), abs(y2 - y1)) for x1, y1, x2, y2 in segments) / len(segments)
+        size = max(max_x - min_x, max_y - min_y, self.__TOLERANCE) / max(1.0, math.sqrt(len(segments)))
+        size = max(size, average)
+
+        grid = {}
+        for index, (x1, y1, x2, y2) in enumerate(segments):
+            for column in range(int((min(x1, x2) - min_x) / size), int((max(x1, x2) - min_x) / size) + 1):
+                for row in range(int((min(y1, y2) - min_y) / size), int((max(y1, y2) - min_y) / size) + 1):
+                    grid.setdefault((column, row), []).append(index)
+
+        found = {}
+        for cell in grid.values():
+            if len(cell) < 2:
+                continue
+
+            # segments of the cell by their part
+            parts = {}
+            for index in cell:
+                parts.setdefault(owners[index], []).append(index)
+            if len(parts) < 2:
+                continue
+
+            names = sorted(parts)
+            for position, first_owner in enumerate(names):
+                for second_owner in names[position + 1:]:
+                    pair = (first_owner, second_owner)
+                    if pair not in found:
+                        self.__find_conflict(pair, parts[first_owner], parts[second_owner], found)
+
+        return list(found.values())
+
+    def __find_conflict(self, pair: tuple, first_segments: list, second_segments: list, found: dict) -> None:
+        """ Adds the first crossing of the segments of two parts to the found conflicts """
+        segments = self.segments
+        for first in first_segments:
+            for second in second_segments:
+                point = self.__intersection(segments[first], segments[second])
+                if point is not None:
+                    found[pair] = Conflict(pair[0], pair[1], *point)
+                    return
+
+    @classmethod
+    def __intersection(cls, first: tuple, second: tuple):
+        """ Point where two segments cross or touch each other
+
+        :return: (x, y) or None if the segments do not meet
+        """
+        x1, y1, x2, y2 = first
+        x3, y3, x4, y4 = second
+
+        # fast rejection by the bounding boxes
+        tolerance = cls.__TOLERANCE
+        if max(x1, x2) + tolerance < min(x3, x4) or max(x3, x4) + tolerance < min(x1, x2) or \
+                max(y1, y2) + tolerance < min(y3, y4) or max(y3, y4) + tolerance < min(y1, y2):
+            return None
+
+        dx1 = x2 - x1
+        dy1 = y2 - y1
+        dx2 = x4 - x3
+        dy2 = y4 - y3
+        denominator = dx1 * dy2 - dy1 * dx2
+
+        if abs(denominator) < 1e-12:
+            # parallel segments meet only if they are on the same line and overlap
+            if abs((x3 - x1) * dy1 - (y3 - y1) * dx1) > tolerance * max(abs(dx1), abs(dy1), 1e-12):
+                return None
+            for x, y in ((x3, y3), (x4, y4), (x1, y1), (x2, y2)):
+                if min(x1, x2) - tolerance <= x <= max(x1, x2) + tolerance and \
+                        min(y1, y2) - tolerance <= y <= max(y1, y2) + tolerance and \
+                        min(x3, x4) - tolerance <= x <= max(x3, x4) + tolerance and \
+                        min(y3, y4) - tolerance <= y <= max(y3, y4) + tolerance:
+                    return x, y
+            return None
+
+        t = ((x3 - x1) * dy2 - (y3 - y1) * dx2) / denominator
+        u = ((x3 - x1) * dy1 - (y3 - y1) * dx1) / denominator
+
+        # tolerance as part of the length of the segments
+        tolerance1 = tolerance / (math.hypot(dx1, dy1) or 1.0)
+        tolerance2 = tolerance / (math.hypot(dx2, dy2) or 1.0)
+        if -tolerance1 <= t <= 1 + tolerance1 and -tolerance2 <= u <= 1 + tolerance2:
+            return x1 + t * dx1, y1 + t * dy1
+
+        return None
@@ -0,0 +1,19 @@
+from typing import NamedTuple
+
+
+class Part(NamedTuple):
+    """ Drawing written by a design. Used to place the drawings of a project on sheets of material """
+
+    # filename of the drawing
+    name: str
+
+    # size of the drawing in tdpi
+    width: int
+    height: int
+
+    # complete SVG of the drawing
+    svg: str
+
+    # upper left corner of the lines in the drawing in tdpi. 0 while the size is the size of the viewbox
+    left: int = 0
+    top: int = 0
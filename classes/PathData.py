@@ -0,0 +1,181 @@
+import math
+from classes.PathGeometry import PathGeometry
+
+
+class PathData:
+    """ Numeric path of a drawing. The geometry is kept as commands with coordinates in tdpi until the
+    final emit as d attribute.
+
+    A command is a tuple
+        ('M', x, y)                                                 move to
+        ('L', x, y)                                                 line to
+        ('A', radius x, radius y, rotation, large, sweep, x, y)     arc to
+
+    Transformations (translate, scale, mirror, rotate) are only composed into the matrix of the path and are
+    cheap. The commands are shared by all transformed paths. flatten() applies the matrix to the coordinates,
+    the emit flattens automatically.
+    """
+    __slots__ = ('commands', 'matrix')
+
+    # number of decimal places of tdpi values
+    __PRECISION = 4
+
+    def __init__(self, commands: list = None, matrix: tuple = PathGeometry.IDENTITY):
+        self.commands = [] if commands is None else commands
+        self.matrix = matrix
+
+    def move_to(self, x: int, y: int) -> 'PathData':
+        self.commands.append(('M', x, y))
+        return self
+
+    def line_to(self, x: int, y: int) -> 'PathData':
+        self.commands.append(('L', x, y))
+        return self
+
+    def arc_to(self, radius_x: int, radius_y: int, sweep: int, x: int, y: int, large: int = 0,
+               rotation: float = 0) -> 'PathData':
+        self.commands.append(('A', radius_x, radius_y, rotation, large, sweep, x, y))
+        return self
+
+    def extend(self, other: 'PathData') -> 'PathData':
+        """ Appends the commands of another path with its transformation
+
+        :param other: path to append
+        :return: this path
+        """
+        if self.matrix != PathGeometry.IDENTITY:
+            self.commands, self.matrix = self.flatten().commands, PathGeometry.IDENTITY
+
+        self.commands.extend(other.flatten().commands)
+        return self
+
+    def transform(self, matrix: tuple) -> 'PathData':
+        """ New path with the transformation applied after the transformation of this path
+
+        :param matrix: transformation (a, b, c, d, e, f)
+        :return: transformed path. The commands are shared
+        """
+        return PathData(self.commands, PathGeometry.multiply(matrix, self.matrix))
+
+    def translate(self, x: int, y: int) -> 'PathData':
+        return self.transform((1, 0, 0, 1, x, y))
+
+    def scale(self, x: float, y: float) -> 'PathData':
+        return self.transform((x, 0, 0, y, 0, 0))
+
+    def mirror_x(self) -> 'PathData':
+        """ Mirrors the path at the y axis """
+        return self.scale(-1, 1)
+
+    def mirror_y(self) -> 'PathData':
+        """ Mirrors the path at the x axis """
+        return self.scale(1, -1)
+
+    def rotate(self, angle: float, x: int = 0, y: int = 0) -> 'PathData':
+        """ Rotates the path clockwise around a point
+
+        :param angle: angle in degrees
+        :param x: x of the center of the rotation
+        :param y: y of the center of the rotation
+        :return: rotated path
+        """
+        # rotations by multiples of 90 degrees stay exact
+        if angle % 90 == 0:
+            cos, sin = [(1, 0), (0, 1), (-1, 0), (0, -1)][int(angle % 360) // 90]
+        else:
+            cos, sin = math.cos(math.radians(angle)), math.sin(math.radians(angle))
+
+        return self.transform((cos, sin, -sin, cos, x - cos * x + sin * y, y - sin * x - cos * y))
+
+    def flatten(self) -> 'PathData':
+        """ Applies the transformation to the coordinates. Coordinates are rounded to tdpi
+
+        :return: path without transformation
+        """
+        if self.matrix == PathGeometry.IDENTITY:
+            return self
+
+        a, b, c, d, e, f = self.matrix
+        determinant = a * d - b * c
+
+        # arcs stay arcs if the transformation keeps circles or only scales along the axes
+        conformal = math.isclose(a, d) and math.isclose(b, -c) or math.isclose(a, -d) and math.isclose(b, c)
+        axis_scale_x, axis_scale_y = abs(a), abs(d)
+        scale = math.sqrt(abs(determinant))
+        angle = math.degrees(math.atan2(b, a))
+
+        commands = []
+        for command in self.commands:
+            x, y = command[-2:]
+            new_x = round(a * x + c * y + e)
+            new_y = round(b * x + d * y + f)
+
+            if command[0] != 'A':
+                commands.append((command[0], new_x, new_y))
+                continue
+
+            _, radius_x, radius_y, rotation, large, sweep, _, _ = command
+            if conformal:
+                radius_x, radius_y = round(radius_x * scale), round(radius_y * scale)
+                rotation = (rotation + angle) % 360 if determinant > 0 else (angle - rotation) % 360
+            elif b == 0 and c == 0 and rotation == 0:
+                radius_x, radius_y = round(radius_x * axis_scale_x), round(radius_y * axis_scale_y)
+            else:
+                raise ValueError('Arcs can only be rotated with uniform scaling')
+
+            # mirroring changes the direction of the arc
+            if determinant < 0:
+                sweep = 1 - sweep
+
+            commands.append(('A', radius_x, radius_y, rotation, large, sweep, new_x, new_y))
+
+        return PathData(commands)
+
+    def bounds(self) -> tuple:
+        """ Bounds of the end points of the commands
+
+        :return: min x, min y, max x, max y
+        """
+        commands = self.flatten().commands
+        if not commands:
+            return 0, 0, 0, 0
+
+        return min(command[-2] for command in commands), min(command[-1] for command in commands), \
+            max(command[-2] for command in commands), max(command[-1] for command in commands)
+
+    def to_d(self) -> str:
+        """ The path as d attribute of an SVG path in dpi
+
+        :return: d attribute
+        """
+        number = self.number
+        output = []
+        for command in self.flatten().commands:
+            if command[0] == 'A':
+                _, radius_x, radius_y, rotation, large, sweep, x, y = command
+                output.append(f'A {number(radius_x)} {number(radius_y)} {rotation:g} {large} {sweep} '
+                              f'{number(x)} {number(y)}')
+            else:
+                output.append(f'{command[0]} {number(command[1])} {number(command[2])}')
+
+        return ' '.join(output)
+
+    def to_svg(self) -> str:
+        """ The path as SVG path element
+
+        :return: <path/>
+        """
+        return f'<path d="{self.to_d()}"/>'
+
+    @classmethod
+    def number(cls, value: int) -> str:
+        """ Converts a tdpi value to dpi with 4 decimals
+
+        :param value: tdpi value
+        :return: dpi as text
+        """
+        if value < 0:
+            return '-' + cls.number(-value)
+
+        text = str(value).rjust(cls.__PRECISION + 1, '0')
+        return f'{text[:-cls.__PRECISION]}.{text[-cls.__PRECISION:]}'
@@ -0,0 +1,375 @@
+import re
+import math
+from xml.etree import ElementTree
+
+
+class PathGeometry:
+    """ Converts SVG drawings to straight segments, i.e. to check the geometry of the drawings.
+
+    Transformations are affine matrices (a, b, c, d, e, f) like the SVG matrix() transformation.
+    Arcs are replaced by polylines that differ at most by the chord tolerance from the arc.
+    """
+
+    IDENTITY = (1.0, 0.0, 0.0, 1.0, 0.0, 0.0)
+
+    __SVG_NAMESPACE = '{http://www.w3.org/2000/svg}'
+    __XLINK_HREF = '{http://www.w3.org/1999/xlink}href'
+
+    __PATH_TOKENS = re.compile(r'[MmLlHhVvZzAaCcSsQqTt]|[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+    __TRANSFORMS = re.compile(r'(matrix|translate|scale|rotate)\s*\(([^)]*)\)')
+
+    # number of parameters of the path commands
+    __PARAMETERS = {'M': 2, 'L': 2, 'H': 1, 'V': 1, 'Z': 0, 'A': 7, 'C': 6, 'S': 4, 'Q': 4, 'T': 2}
+
+    @staticmethod
+    def multiply(first: tuple, second: tuple) -> tuple:
+        """ Combines two transformations. The second transformation is applied first
+
+        :param first: outer transformation
+        :param second: inner transformation
+        :return: combined transformation
+        """
+        a1, b1, c1, d1, e1, f1 = first
+        a2, b2, c2, d2, e2, f2 = second
+        return (a1 * a2 + c1 * b2, b1 * a2 + d1 * b2,
+                a1 * c2 + c1 * d2, b1 * c2 + d1 * d2,
+                a1 * e2 + c1 * f2 + e1, b1 * e2 + d1 * f2 + f1)
+
+    @classmethod
+    def parse_transform(cls, text: str) -> tuple:
+        """ Converts the transform attribute of an SVG element to a matrix
+
+        :param text: transform attribute
+        :return: transformation matrix
+        """
+        matrix = cls.IDENTITY
+        for name, arguments in cls.__TRANSFORMS.findall(text or ''):
+            values = [float(value) for value in re.split(r'[\s,]+', arguments.strip()) if value]
+
+            if name == 'matrix':
+                current = tuple(values)
+            elif name == 'translate':
+                current = (1.0, 0.0, 0.0, 1.0, values[0], values[1] if len(values) > 1 else 0.0)
+            elif name == 'scale':
+                current = (values[0], 0.0, 0.0, values[1] if len(values) > 1 else values[0], 0.0, 0.0)
+            else:
+                angle = math.radians(values[0])
+                current = (math.cos(angle), math.sin(angle), -math.sin(angle), math.cos(angle), 0.0, 0.0)
+                if len(values) == 3:
+                    current = cls.multiply(cls.multiply((1.0, 0.0, 0.0, 1.0, values[1], values[2]), current),
+                                           (1.0, 0.0, 0.0, 1.0, -values[1], -values[2]))
+
+            matrix = cls.multiply(matrix, current)
+
+        return matrix
+
+    @classmethod
+    def __walk(cls, path: str):
+        """ Iterates over the commands of the d attribute of a path
+
+        :param path: d attribute of the path
+        :return: generator of (command, tokens, values, start point, end point, start of the subpath)
+        """
+        tokens = cls.__PATH_TOKENS.findall(path)
+        x = y = start_x = start_y = 0.0
+        command = ''
+        index = 0
+
+        while index < len(tokens):
+            if tokens[index].isalpha():
+                command = tokens[index]
+                index += 1
+                if command in 'Zz':
+                    yield command, [command], [], (x, y), (start_x, start_y), (start_x, start_y)
+                    x, y = start_x, start_y
+                    continue
+            elif not command:
+                raise ValueError(f'Path must start with a command: {path[:40]}')
+
+            count = cls.__PARAMETERS[command.upper()]
+            parameters = tokens[index:index + count]
+            values = [float(value) for value in parameters]
+            if len(values) != count:
+                raise ValueError(f'Missing parameters for {command} in path {path[:40]}')
+            index += count
+
+            relative = command.islower()
+            upper = command.upper()
+            previous = (x, y)
+
+            if upper == 'H':
+                x = x + values[0] if relative else values[0]
+            elif upper == 'V':
+                y = y + values[0] if relative else values[0]
+            else:
+                # end point of lines, arcs and curves
+                x, y = (x + values[-2], y + values[-1]) if relative else (values[-2], values[-1])
+
+            if upper == 'M':
+                start_x, start_y = x, y
+
+            yield command, [command] + parameters, values, previous, (x, y), (start_x, start_y)
+
+            # following coordinate pairs of a move are lines
+            if upper == 'M':
+                command = 'l' if relative else 'L'
+
+    @classmethod
+    def scale_path(cls, path: str, factor: float, number) -> str:
+        """ Scales the d attribute of a path uniformly. Rotations and flags of arcs are kept
+
+        :param path: d attribute of the path
+        :param factor: scale factor
+        :param number: function that formats a scaled value
+        :return: scaled d attribute
+        """
+        output = []
+        for command, tokens, values, _, _, _ in cls.__walk(path):
+            # rotation and flags of an arc are no lengths
+            arc = command.upper() == 'A'
+            output.append(' '.join([command] + [tokens[index + 1] if arc and index in (2, 3, 4)
+                                                else number(value * factor) for index, value in enumerate(values)]))
+
+        return ' '.join(output)
+
+    @classmethod
+    def path_to_polylines(cls, path: str, tolerance: float) -> list:
+        """ Converts the d attribute of a path to polylines. Each subpath is one polyline
+
+        :param path: d attribute of the path
+        :param tolerance: maximal distance between an arc and its polyline
+        :return: list of polylines. A polyline is a list of (x, y) points
+        """
+        polylines = []
+        polyline = []
+
+        for command, _, values, (x, y), (end_x, end_y), _ in cls.__walk(path):
+            upper = command.upper()
+
+            if upper == 'M':
+                if len(polyline) > 1:
+                    polylines.append(polyline)
+                polyline = [(end_x, end_y)]
+                continue
+
+            if upper == 'Z' and not polyline:
+                continue
+
+            if not polyline:
+                polyline = [(x, y)]
+
+            if upper == 'A':
+                polyline.extend(cls.arc_points(x, y, values[0], values[1], values[2], values[3] != 0,
+                                               values[4] != 0, end_x, end_y, tolerance))
+            else:
+                polyline.append((end_x, end_y))
+
+        if len(polyline) > 1:
+            polylines.append(polyline)
+
+        return polylines
+
+    @classmethod
+    def flatten_arcs(cls, path: str, tolerance: float) -> str:
+        """ Replaces the arcs in the d attribute of a path by lines. All other commands are not changed
+
+        :param path: d attribute of the path
+        :param tolerance: maximal distance between an arc and its lines
+        :return: d attribute without arcs
+        """
+        output = []
+        for command, tokens, values, (x, y), (end_x, end_y), _ in cls.__walk(path):
+            if command.upper() != 'A':
+                output.extend(tokens)
+                continue
+
+            points = cls.arc_points(x, y, values[0], values[1], values[2], values[3] != 0, values[4] != 0,
+                                    end_x, end_y, tolerance)
+            output.append('L')
+            output.extend([f'{point_x:.4f} {point_y:.4f}' for point_x, point_y in points])
+
+        return ' '.join(output)
+
+    @classmethod
+    def subpaths(cls, path: str) -> list:
+        """ Splits the d attribute of a path into its subpaths
+
+        :param path: d attribute of the path
+        :return: list of [tokens, segments, closed] for each subpath. The tokens are the original commands.
+                 A segment is (command, start point, end point, arc parameters) with the command L or A.
+                 Curves are segments to their end point.
+        """
+        subpaths = []
+        new_subpath = True
+
+        for command, tokens, values, start, end, _ in cls.__walk(path):
+            upper = command.upper()
+
+            if upper == 'M' or new_subpath:
+                subpaths.append([[], [], False])
+                new_subpath = False
+
+            subpath = subpaths[-1]
+            subpath[0].extend(tokens)
+
+            if upper == 'M':
+                continue
+
+            if upper == 'Z':
+                if start != end:
+                    subpath[1].append(('L', start, end, []))
+                subpath[2] = True
+                # commands after Z begin a new subpath
+                new_subpath = True
+            elif upper == 'A':
+                subpath[1].append(('A', start, end, values[:5]))
+            else:
+                subpath[1].append(('L', start, end, []))
+
+        return subpaths
+
+    @classmethod
+    def path_elements(cls, element: ElementTree.Element, matrix: tuple = IDENTITY, ids: dict = None) -> list:
+        """ All path elements with a d attribute in document order with their transformation
+
+        :param element: SVG element
+        :param matrix: transformation of the parent of the element
+        :param ids: elements by their id to resolve <use>. Without ids <use> is ignored
+        :return: list of (path element, transformation)
+        """
+        matrix = cls.multiply(matrix, cls.parse_transform(element.get('transform')))
+        tag = element.tag.replace(cls.__SVG_NAMESPACE, '')
+
+        if tag == 'path' and element.get('d') is not None:
+            return [(element, matrix)]
+
+        if tag == 'use' and ids is not None:
+            reference = ids.get((element.get(cls.__XLINK_HREF) or element.get('href') or '').lstrip('#'))
+            return [] if reference is None else cls.path_elements(reference, matrix, ids)
+
+        return [path for child in element for path in cls.path_elements(child, matrix, ids)]
+
+    @staticmethod
+    def arc_center(start_x: float, start_y: float, radius_x: float, radius_y: float, rotation: float,
+                   large_arc: bool, sweep: bool, end_x: float, end_y: float) -> tuple:
+        """ Conversion of an SVG arc from endpoint to center parameterization, SVG 1.1 appendix F.6.5.
+        Radii that are too small are scaled up.
+
+        :return: center x, center y, radius x, radius y, start angle, angle of the arc
+        """
+        phi = math.radians(rotation)
+        cos_phi = math.cos(phi)
+        sin_phi = math.sin(phi)
+        dx = (start_x - end_x) / 2
+        dy = (start_y - end_y) / 2
+        x1 = cos_phi * dx + sin_phi * dy
+        y1 = -sin_phi * dx + cos_phi * dy
+
+        radius_x = abs(radius_x)
+        radius_y = abs(radius_y)
+        scale = (x1 * x1) / (radius_x * radius_x) + (y1 * y1) / (radius_y * radius_y)
+        if scale > 1:
+            radius_x *= math.sqrt(scale)
+            radius_y *= math.sqrt(scale)
+
+        numerator = radius_x * radius_x * radius_y * radius_y - radius_x * radius_x * y1 * y1 - \
+            radius_y * radius_y * x1 * x1
+        denominator = radius_x * radius_x * y1 * y1 + radius_y * radius_y * x1 * x1
+        factor = math.sqrt(max(0.0, numerator / denominator))
+        if large_arc == sweep:
+            factor = -factor
+
+        center_x1 = factor * radius_x * y1 / radius_y
+        center_y1 = -factor * radius_y * x1 / radius_x
+        center_x = cos_phi * center_x1 - sin_phi * center_y1 + (start_x + end_x) / 2
+        center_y = sin_phi * center_x1 + cos_phi * center_y1 + (start_y + end_y) / 2
+
+        start_angle = math.atan2((y1 - center_y1) / radius_y, (x1 - center_x1) / radius_x)
+        end_angle = math.atan2((-y1 - center_y1) / radius_y, (-x1 - center_x1) / radius_x)
+        delta = end_angle - start_angle
+        if sweep and delta < 0:
+            delta += 2 * math.pi
+        elif not sweep and delta > 0:
+            delta -= 2 * math.pi
+
+        return center_x, center_y, radius_x, radius_y, start_angle, delta
+
+    @staticmethod
+    def arc_points(start_x: float, start_y: float, radius_x: float, radius_y: float, rotation: float,
+                   large_arc: bool, sweep: bool, end_x: float, end_y: float, tolerance: float) -> list:
+        """ Points of the polyline for an SVG arc without the start point. The number of points depends
+        on the radius that the polyline differs at most by the tolerance from the arc. The points are
+        calculated one by one, numpy is not a dependency of the project.
+
+        :return: list of (x, y) points
+        """
+        if radius_x == 0 or radius_y == 0 or (start_x == end_x and start_y == end_y):
+            return [(end_x, end_y)]
+
+        center_x, center_y, radius_x, radius_y, start_angle, delta = \
+            PathGeometry.arc_center(start_x, start_y, radius_x, radius_y, rotation, large_arc, sweep, end_x, end_y)
+        phi = math.radians(rotation)
+        cos_phi = math.cos(phi)
+        sin_phi = math.sin(phi)
+
+        # the chord of an angle step differs by radius * (1 - cos(step / 2)) from the arc
+        radius = max(radius_x, radius_y)
+        if tolerance <= 0 or tolerance >= radius:
+            step = math.pi / 2
+        else:
+            step = 2 * math.acos(1 - tolerance / radius)
+        segments = max(1, math.ceil(abs(delta) / step))
+
+        points = []
+        for segment in range(1, segments):
+            angle = start_angle + delta * segment / segments
+            x = radius_x * math.cos(angle)
+            y = radius_y * math.sin(angle)
+            points.append((cos_phi * x - sin_phi * y + center_x, sin_phi * x + cos_phi * y + center_y))
+        points.append((end_x, end_y))
+
+        return points
+
+    @classmethod
+    def element_segments(cls, element: ElementTree.Element, matrix: tuple, tolerance: float,
+                         ids: dict = None) -> list:
+        """ All segments of the paths in an SVG element and its children. <use> elements are resolved
+        with the ids.
+
+        :param element: SVG element
+        :param matrix: transformation of the element
+        :param tolerance: maximal distance between an arc and its polyline
+        :param ids: elements by their id for <use>
+        :return: list of segments (x1, y1, x2, y2)
+        """
+        segments = []
+        stack = [(element, cls.multiply(matrix, cls.parse_transform(element.get('transform'))))]
+
+        while stack:
+            current, current_matrix = stack.pop()
+            tag = current.tag.replace(cls.__SVG_NAMESPACE, '')
+
+            if tag == 'path':
+                a, b, c, d, e, f = current_matrix
+                for polyline in cls.path_to_polylines(current.get('d', ''), tolerance):
+                    points = [(a * x + c * y + e, b * x + d * y + f) for x, y in polyline]
+                    segments.extend([(x1, y1, x2, y2) for (x1, y1), (x2, y2) in zip(points, points[1:])])
+            elif tag == 'use' and ids is not None:
+                reference = ids.get((current.get(cls.__XLINK_HREF) or current.get('href') or '').lstrip('#'))
+                if reference is not None:
+                    stack.append((reference, cls.multiply(current_matrix,
+                                                          cls.parse_transform(reference.get('transform')))))
+
+            for child in current:
+                stack.append((child, cls.multiply(current_matrix, cls.parse_transform(child.get('transform')))))
+
+        return segments
+
+    @staticmethod
+    def ids(root: ElementTree.Element) -> dict:
+        """ All elements of a drawing with an id
+
+        :param root: root element of the drawing
+        :return: elements by their id
+        """
+        return {element.get('id'): element for element in root.iter() if element.get('id')}
@@ -0,0 +1,83 @@
+import os
+from classes.BuildRecord import BuildRecord
+
+
+class C:
+    projects = 'projects'
+    project = 'project'
+    nesting = 'nesting'
+    combined = 'combined'
+    designs = 'designs'
+    section = 'section'
+    design = 'design'
+    templates = 'templates'
+    configs = 'configs'
+    outputs = 'outputs'
+    file = 'file'
+    stale = 'stale'
+    dependencies = 'dependencies'
+    error = 'error'
+
+
+class Plan:
+    """ Dependency graph of a build, resolved from the configuration only. Nothing is drawn or written.
+
+    Every design is a node with its design class, templates, config files and output files. Designs that
+    create other designs, like the partitions of an ItemBox, have them as dependencies. An output is stale
+    if it does not exist or is older than one of the templates and config files of its design and was not
+    created from their current content. An output with an unchanged drawing is not written again and keeps
+    its modification time.
+    """
+
+    @staticmethod
+    def outputs(outputs: list, inputs: list) -> list:
+        """ The output files with their state
+
+        :param outputs: files written by the design
+        :param inputs: templates and config files of the design
+        :return: list of dicts with file and stale
+        """
+        newest = max((os.stat(file).st_mtime_ns for file in inputs if os.path.isfile(file)), default=0)
+
+        return [{C.file: file, C.stale: not os.path.isfile(file) or
+                 (os.stat(file).st_mtime_ns < newest and not BuildRecord.is_current(file, inputs))}
+                for file in outputs]
+
+    @staticmethod
+    def is_stale(node: dict) -> bool:
+        """ A design is stale if it failed to resolve or if one of its outputs or dependencies is stale """
+        return node.get(C.error) is not None or any(output[C.stale] for output in node.get(C.outputs, [])) or \
+            any(Plan.is_stale(dependency) for dependency in node.get(C.dependencies, []))
+
+    @classmethod
+    def print_plan(cls, plan: dict) -> None:
+        """ Prints the plan as an indented tree """
+        for project in plan[C.projects]:
+            if project[C.project] is not None:
+                print(f'{project[C.project]}{" with nesting" if project.get(C.nesting) else ""}'
+                      f'{" as combined sheet" if project.get(C.combined) else ""}')
+
+            if project.get(C.error) is not None:
+                print('  error: ' + project[C.error].replace('\n', '\n    '))
+
+            for design in project.get(C.designs, []):
+                cls.__print_design(design, '  ' if project[C.project] is not None else '')
+
+        nodes = [design for project in plan[C.projects] for design in project.get(C.designs, [])]
+        print(f'Designs: {len(nodes)}, stale: {sum(cls.is_stale(node) for node in nodes)}')
+
+    @classmethod
+    def __print_design(cls, node: dict, indent: str) -> None:
+        print(f'{indent}{node[C.section]}  {node.get(C.design) or "?"}{"  stale" if cls.is_stale(node) else ""}')
+
+        if node.get(C.error) is not None:
+            print(f'{indent}    error: ' + node[C.error].replace('\n', f'\n{indent}      '))
+            return
+
+        print(f'{indent}    templates: {", ".join(node[C.templates])}')
+        print(f'{indent}    configs: {", ".join(node[C.configs])}')
+        for output in node[C.outputs]:
+            print(f'{indent}    output: {output[C.file]}{"  stale" if output[C.stale] else ""}')
+
+        for dependency in node[C.dependencies]:
+            cls.__print_design(dependency, indent + '    ')
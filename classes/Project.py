@@ -1,9 +1,21 @@
 import argparse
+import glob
 import os
-import sys
+import time
+from typing import NamedTuple
 
 from classes.Single import Single
 from classes.Config import Config
+from classes.File import File
+from classes.Writer import Writer
+from classes.Design import Design
+from classes.ProjectLock import ProjectLock
+from classes.InsertMakerError import InsertMakerError, ConfigError, WriteError
+from classes.Plan import C as Cp
+from classes.Nesting import Nesting
+from classes.Nesting import C as Cn
+from classes.CombinedSheet import CombinedSheet
+from classes.CombinedSheet import C as Cc
 from classes.ConfigConstants import ConfigConstantsText as Ct
 
 
@@ -11,6 +23,47 @@ class C:
     designs = 'designs'
     project = 'Project'
 
+    glob_characters = '*?['
+    nesting = 'Nesting'
+    combined = 'CombinedSheet'
+
+
+class DesignResult(NamedTuple):
+    """ Outcome of a design of a project """
+
+    # config file and section of the design
+    design: str
+
+    # duration of the design in seconds
+    seconds: float
+
+    # text of the error, None for successful designs
+    error: str = None
+
+
+class ProjectResult(NamedTuple):
+    """ Outcome of a project in a run with several projects """
+
+    # config file of the project
+    project_file: str
+
+    # outcome of every design of the project
+    designs: list[DesignResult]
+
+    # files written and left unchanged by the project
+    written: int
+    unchanged: int
+
+    # duration of the build in seconds
+    seconds: float
+
+    # text of the error if the project itself failed, i.e. a missing [Project] section
+    error: str = None
+
+    @property
+    def failed(self) -> list[DesignResult]:
+        return [design for design in self.designs if design.error is not None]
+
 
 class Project:
 
@@ -22,22 +75,30 @@ class Project:
 
         self.kwargs = kwargs
 
-        # Terminate if project file does not exist.
+        # failing designs are recorded and the remaining designs are created
+        self.keep_going = kwargs.get(Ct.keep_going, False)
+
         if not os.path.isfile(project_config_file):
-            print(f'Project file "{project_config_file}" does not exist.')
-            sys.exit(-1)
+            raise ConfigError(f'Project file "{project_config_file}" does not exist.')
+
+        # the compiled configuration of the previous build. Forced builds start from scratch
+        self.lock = ProjectLock.load(project_config_file, ignore=kwargs.get(Ct.force, False))
+        if self.lock.project is not None:
+            self.designs, self.options, self.nesting, self.combined = self.lock.project
+            return
 
         # Test if 'Project' section exists in project file
         sections = Config.get_sections(project_config_file)
 
-        # [Project] section is madatory for projects. Terminate if it is not existing
+        # [Project] section is madatory for projects
         if not Config.section_exists(sections, C.project):
-            print(f'Missing section [{C.project}] in file {project_config_file}')
-            sys.exit(-1)
+            raise ConfigError(f'Missing section [{C.project}] in file {project_config_file}')
 
         # read the Project configuration from the settings
         self.__read_config(f"{project_config_file}{Ct.config_separator}{C.project}")
 
+        self.lock.set_project((self.designs, self.options, self.nesting, self.combined), project_config_file)
+
     @staticmethod
     def parse_arguments():
         parser = argparse.ArgumentParser(add_help=False)
@@ -55,8 +116,7 @@ class Project:
 
         # A project has to have a "designs" entry with the list of designs to create
         if not config.has_option(C.project, C.designs):
-            print(f'Project configuration {filename_and_section} has no designs!')
-            sys.exit(-1)
+            raise ConfigError(f'Project configuration {filename_and_section} has no designs!')
 
         # the designes are read as a string with \n separation between the designs
         self.designs = config.get(C.project, C.designs)
@@ -88,20 +148,226 @@ class Project:
         if config.has_option(C.project, Ct.resolution):
             self.options[Ct.thickness] = config.get(C.project, Ct.resolution)
 
+        # place the drawings of all designs on sheets of material
+        if config.has_option(C.project, Cn.nesting):
+            self.nesting = config.getboolean(C.project, Cn.nesting)
+
+        for key in [Cn.sheet_width, Cn.sheet_height, Cn.sheet_spacing]:
+            if config.has_option(C.project, key):
+                self.options[key] = config.get(C.project, key)
+
+        # write all drawings of the designs as layers of a single SVG instead of a file per design
+        if config.has_option(C.project, Cc.combined):
+            self.combined = config.getboolean(C.project, Cc.combined)
+
+        for key in [Cc.combined_spacing, Cc.combined_direction]:
+            if config.has_option(C.project, key):
+                self.options[key] = config.get(C.project, key)
+
     def __set_defaults(self):
         """ Set default values for all variables from built in values"""
         self.designs = []
         self.options = {}
+        self.nesting = False
+        self.combined = False
+
+    def create(self) -> list[DesignResult]:
+        """ Create the designs of the project. Without keep going the first failing design stops the project.
+
+        :return: outcome of the designs
+        """
+        results = []
+
+        # the project options are a layer above the InsertMaker.config, shared by all designs
+        self.kwargs[Ct.layers] = Design.standard_layers().new_child(self.options)
+
+        # designs with identical geometry are drawn only once per project
+        self.kwargs[Ct.drawings] = {}
+
+        # the designs collect their drawings for the nesting and the combined sheet
+        if self.nesting or self.combined:
+            self.kwargs[Ct.parts] = []
+
+        # the drawings of a combined sheet are not written as files of their own
+        self.kwargs[Ct.nowrite] = self.combined
+
+        # the designs take their settings from the lock or add them to the lock
+        ProjectLock.active = self.lock
+        try:
+            # iterate over all designs in the project file
+            for design in self.designs:
+                self.kwargs[Ct.config_file_and_section] = design
+                results.append(self.__create_design(design, lambda: Single.create(**self.kwargs)))
+
+            if self.nesting:
+                # sheets without the parts of failed designs would be incomplete
+                if any(result.error is not None for result in results):
+                    results.append(DesignResult(C.nesting, 0.0, 'Skipped because of failed designs'))
+                else:
+                    results.append(self.__create_design(C.nesting, lambda: Nesting(
+                        **dict(self.kwargs, **{Ct.nowrite: False})).create()))
+
+            if self.combined:
+                # a combined sheet without the parts of failed designs would be incomplete
+                if any(result.error is not None for result in results):
+                    results.append(DesignResult(C.combined, 0.0, 'Skipped because of failed designs'))
+                else:
+                    results.append(self.__create_design(C.combined, lambda: CombinedSheet(
+                        **dict(self.kwargs, **{Ct.nowrite: False})).create()))
+        finally:
+            ProjectLock.active = None
+
+        # the files of the project are on the disk before the project is complete
+        try:
+            Writer.flush()
+        except WriteError as e:
+            # files not handed over by a design of the project can not be reported for a design
+            if not self.keep_going or not e.designs.keys() <= {result.design for result in results}:
+                raise
+
+            # a design whose files could not be written has failed
+            results = [result._replace(error='\n'.join(
+                ([] if result.error is None else [result.error]) + e.designs[result.design]))
+                if result.design in e.designs else result for result in results]
+
+        # only a complete build is kept for the next build
+        if all(result.error is None for result in results):
+            self.lock.save()
 
-    def create(self):
-        """ Create the designs of the project
+        return results
 
-        :return: None
+    def plan(self) -> dict:
+        """ The plan of the project with the nodes of all designs. Nothing is drawn or written.
+
+        :return: plan of the project
+        """
+        self.kwargs[Ct.layers] = Design.standard_layers().new_child(self.options)
+
+        designs = [Single.plan(**dict(self.kwargs, **{Ct.config_file_and_section: design}))
+                   for design in self.designs]
+
+        return {Cp.project: self.kwargs[Ct.config_file], Cp.nesting: self.nesting, Cp.combined: self.combined,
+                Cp.designs: designs}
+
+    def __create_design(self, name: str, create) -> DesignResult:
+        """ Creates a design and measures the time. With keep going all errors of the design are recorded.
+
+        :param name: name of the design in the results
+        :param create: function that creates the design
+        :return: outcome of the design
+        """
+        start = time.perf_counter()
+
+        # the errors of the files written in the background are reported for the design
+        Writer.owner = name
+        try:
+            create()
+        except Exception as e:
+            if not self.keep_going:
+                raise
+            return DesignResult(name, time.perf_counter() - start, InsertMakerError.text(e))
+        finally:
+            Writer.owner = None
+
+        return DesignResult(name, time.perf_counter() - start)
+
+    @classmethod
+    def create_projects(cls, project_files: list, **kwargs) -> list[ProjectResult]:
+        """ Create several projects in one process. The projects share the parsed config files, the
+        templates, the InsertMaker.config and the loaded designs.
+
+        :param project_files: config files of the projects. Patterns like config/*.config are expanded
+        :param kwargs: arguments for all projects
+        :return: results of the projects
+        """
+        results = []
+
+        for project_file in cls.expand_project_files(project_files):
+            written, unchanged = File.get_statistics()
+            start = time.perf_counter()
+
+            # every project gets its own arguments, they are completed by the project
+            arguments = dict(kwargs)
+            arguments[Ct.config_file] = project_file
+
+            designs, error = [], None
+            try:
+                designs = Project(**arguments).create()
+            except InsertMakerError as e:
+                if not kwargs.get(Ct.keep_going, False):
+                    raise
+                error = str(e)
+
+            now_written, now_unchanged = File.get_statistics()
+            results.append(ProjectResult(project_file, designs, now_written - written,
+                                         now_unchanged - unchanged, time.perf_counter() - start, error))
+
+        return results
+
+    @classmethod
+    def plan_projects(cls, project_files: list, **kwargs) -> dict:
+        """ The plan of several projects. Errors in the configuration are part of the plan.
+
+        :param project_files: config files of the projects. Patterns like config/*.config are expanded
+        :param kwargs: arguments for all projects
+        :return: plan with all projects
+        """
+        projects = []
+
+        for project_file in cls.expand_project_files(project_files):
+            arguments = dict(kwargs)
+            arguments[Ct.config_file] = project_file
+
+            try:
+                projects.append(Project(**arguments).plan())
+            except InsertMakerError as e:
+                projects.append({Cp.project: project_file, Cp.error: str(e)})
+
+        return {Cp.projects: projects}
+
+    @staticmethod
+    def expand_project_files(project_files: list) -> list:
+        """ Expand the patterns in the list of project files. Of the matching files only those with a
+        [Project] section are used, files given by name are always used. Every file is used once.
+
+        :param project_files: project files and patterns
+        :return: project files in the given order, the matches of a pattern sorted by name
         """
-        self.kwargs[Ct.options] = self.options
+        retval = []
+        seen = set()
+
+        for pattern in project_files:
+            if any(character in pattern for character in C.glob_characters):
+                files = [file for file in sorted(glob.glob(pattern))
+                         if os.path.isfile(file) and Config.section_exists(Config.get_sections(file), C.project)]
+            else:
+                files = [pattern]
+
+            for file in files:
+                if os.path.abspath(file) not in seen:
+                    seen.add(os.path.abspath(file))
+                    retval.append(file)
+
+        return retval
+
+    @staticmethod
+    def print_report(results: list[ProjectResult]) -> None:
+        """ Prints the summary of a run with several projects together with the failures """
+        width = max((len(result.project_file) for result in results), default=0)
+
+        for result in results:
+            print(f'{result.project_file:<{width}}  designs: {len(result.designs):>4}  '
+                  f'failed: {len(result.failed):>4}  written: {result.written:>4}  '
+                  f'unchanged: {result.unchanged:>4}  {result.seconds:8.3f}s')
+
+            # the lines of multi line errors are indented below their project or design
+            if result.error is not None:
+                print('    ' + result.error.replace('\n', '\n        '))
+
+            for design in result.failed:
+                print(f'    {design.design} ({design.seconds:.3f}s): ' + design.error.replace('\n', '\n        '))
 
-        # iterate over all designs in the project file
-        for design in self.designs:
-            config = self.kwargs.copy()
-            config[Ct.config_file_and_section] = design
-            Single.create(**config)
+        print(f'Projects: {len(results)}, failed: {sum(result.error is not None for result in results)}, '
+              f'designs: {sum(len(result.designs) for result in results)}, '
+              f'failed: {sum(len(result.failed) for result in results)}, '
+              f'time: {sum(result.seconds for result in results):.3f}s')
@@ -0,0 +1,146 @@
+import os
+import pickle
+import hashlib
+from classes.File import File
+
+
+class ProjectLock:
+    """ Compiled configuration of a project. It keeps the designs and options of the project and the typed
+    settings of every section that the designs have loaded, together with the state of the configuration
+    files. As long as no configuration file has changed, a repeated build takes everything from the lock
+    and reads no configuration file.
+
+    The lock is written next to the project file with the extension .lock.
+    """
+
+    # the lock being used by the current build. None outside of projects
+    active = None
+
+    __EXTENSION = '.lock'
+
+    # version of the content. Locks of other versions are ignored
+    __VERSION = 2
+
+    def __init__(self, filename: str):
+        self.filename = filename
+
+        # designs, options and nesting of the project
+        self.project = None
+
+        # (design, typed settings) by (config file, section)
+        self.sections = {}
+
+        # (modification time, size, sha256) by config file
+        self.sources = {}
+
+        # the lock has new content and has to be written
+        self.changed = False
+
+    @classmethod
+    def load(cls, project_file: str, ignore=False) -> 'ProjectLock':
+        """ Loads the lock of a project. An unreadable or outdated lock is replaced by an empty lock
+
+        :param project_file: config file of the project
+        :param ignore: True starts with an empty lock, i.e. to force a complete build
+        :return: lock of the project
+        """
+        lock = ProjectLock(f'{project_file}{cls.__EXTENSION}')
+        if ignore or not os.path.isfile(lock.filename):
+            return lock
+
+        try:
+            with open(lock.filename, 'rb') as f:
+                version, project, sections, sources = pickle.load(f)
+        except Exception:
+            return lock
+
+        if version != cls.__VERSION:
+            return lock
+
+        lock.sources = sources
+        if not lock.__sources_unchanged():
+            lock.sources = {}
+            return lock
+
+        lock.project = project
+        lock.sections = sections
+
+        return lock
+
+    def save(self) -> None:
+        """ Writes the lock if it has new content """
+        if not self.changed:
+            return
+
+        data = pickle.dumps((self.__VERSION, self.project, self.sections, self.sources),
+                            protocol=pickle.HIGHEST_PROTOCOL)
+        File.write_file(self.filename, data, count=False)
+        self.changed = False
+
+    def set_project(self, project: tuple, project_file: str) -> None:
+        """ Keeps the designs, options and nesting of the project
+
+        :param project: project settings
+        :param project_file: config file of the project
+        :return:
+        """
+        self.project = project
+        self.add_source(project_file)
+        self.changed = True
+
+    def get_section(self, config_file: str, section: str):
+        """ The design and the typed settings of a section
+
+        :return: (design, settings) or None if the section is not in the lock
+        """
+        return self.sections.get((os.path.abspath(config_file), section))
+
+    def set_section(self, config_file: str, section: str, design: str, values: dict) -> None:
+        """ Keeps the design and the typed settings of a section
+
+        :param config_file: config file with the section
+        :param section: name of the section
+        :param design: class of the design that loaded the section
+        :param values: typed settings of the section
+        :return:
+        """
+        self.sections[(os.path.abspath(config_file), section)] = (design, values)
+        self.add_source(config_file)
+        self.changed = True
+
+    def add_source(self, config_file: str) -> None:
+        """ Keeps the state of a config file that the lock depends on """
+        filename = os.path.abspath(config_file)
+        if filename not in self.sources:
+            self.sources[filename] = self.__state(filename)
+
+    def __sources_unchanged(self) -> bool:
+        """ Tests if all config files are unchanged. The content of a file with a new modification time is
+        compared by its hash. An unchanged content only updates the state in the lock.
+        """
+        for filename, (mtime, size, digest) in self.sources.items():
+            try:
+                status = os.stat(filename)
+            except OSError:
+                return False
+
+            if status.st_mtime_ns == mtime and status.st_size == size:
+                continue
+
+            if status.st_size != size or self.__hash(filename) != digest:
+                return False
+
+            self.sources[filename] = (status.st_mtime_ns, size, digest)
+            self.changed = True
+
+        return True
+
+    @classmethod
+    def __state(cls, filename: str) -> tuple:
+        status = os.stat(filename)
+        return status.st_mtime_ns, status.st_size, cls.__hash(filename)
+
+    @staticmethod
+    def __hash(filename: str) -> str:
+        with open(filename, 'rb') as f:
+            return hashlib.sha256(f.read()).hexdigest()
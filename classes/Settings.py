@@ -0,0 +1,353 @@
+from enum import Enum
+from types import MappingProxyType
+from classes.ConfigConstants import ConfigConstantsText as Ct
+
+
+def number(value: str):
+    """ Converts a config text to int. Texts with a decimal point are converted to float
+
+    :param value: text to convert
+    :return: int or float value
+    """
+    if '.' in value:
+        return float(value)
+    return int(value)
+
+
+class Setting:
+    """ Declaration of a single setting of a design with its config key, type and default value.
+    A measure is given in the unit of the settings and is additionally available in tdpi as <name>_tdpi.
+    """
+    __slots__ = ('key', 'type', 'default', 'measure', 'slot', 'tdpi_slot')
+
+    __TRUE_VALUES = ['y', 'yes', '1', 't', 'true']
+
+    def __init__(self, key: str, type_, default, measure=False):
+        self.key = key
+        self.type = type_
+        self.default = default
+        self.measure = measure
+
+        # names of the slots for the value and the cached tdpi value. Set by SettingsMeta
+        self.slot = ''
+        self.tdpi_slot = ''
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        try:
+            return getattr(instance, self.slot)
+        except AttributeError:
+            pass
+
+        # not set in the design itself. Resolve the value from the shared layers and keep it
+        value = instance._layers.get(self.key, self)
+        if value is self:
+            return self.default
+
+        if isinstance(value, str) and self.type is not str:
+            value = self.parse(value)
+        setattr(instance, self.slot, value)
+
+        return value
+
+    def __set__(self, instance, value):
+        if isinstance(value, str) and self.type is not str:
+            value = self.parse(value)
+
+        setattr(instance, self.slot, value)
+
+        # the cached tdpi value is outdated
+        if self.measure and hasattr(instance, self.tdpi_slot):
+            delattr(instance, self.tdpi_slot)
+
+    def parse(self, value: str):
+        """ Converts a text from a config file to the type of the setting
+
+        :param value: text to convert
+        :return: converted value
+        """
+        value = value.strip()
+
+        if self.type is bool:
+            return value.lower() in self.__TRUE_VALUES
+
+        if isinstance(self.type, type) and issubclass(self.type, Enum):
+            try:
+                return self.type(value)
+            except ValueError:
+                raise ValueError(f'Unknown value for {self.key}. Current value \'{value}\'. '
+                                 f'Allowed values are {[e.value for e in self.type]}')
+
+        return self.type(value)
+
+
+class UnitSetting(Setting):
+    """ Declaration of the unit of the measures. Changing the unit discards all cached tdpi values """
+    __slots__ = ()
+
+    def __set__(self, instance, value):
+        super().__set__(instance, value)
+        instance.clear_tdpi()
+
+
+class TdpiSetting:
+    """ The tdpi value of a measure. It is calculated on first access and cached until the measure
+    or the unit changes.
+    """
+    __slots__ = ('setting',)
+
+    def __init__(self, setting: Setting):
+        self.setting = setting
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+
+        try:
+            return getattr(instance, self.setting.tdpi_slot)
+        except AttributeError:
+            value = instance.unit_to_tdpi(self.setting.__get__(instance, owner))
+            setattr(instance, self.setting.tdpi_slot, value)
+            return value
+
+
+class SettingsLayers:
+    """ Immutable chain of setting layers that are shared by many designs, i.e. InsertMaker.config and the
+    project options. Like a ChainMap the first layer has the highest priority. A layer is never copied,
+    new_child only creates a new chain in front of the existing layers.
+    """
+    __slots__ = ('maps',)
+
+    def __init__(self, *maps):
+        self.maps = tuple(maps)
+
+    def new_child(self, values: dict):
+        """ Creates a new chain with the values as the layer with the highest priority
+
+        :param values: key and value of the settings of the new layer
+        :return: new chain of layers
+        """
+        return SettingsLayers(MappingProxyType(dict(values)), *self.maps)
+
+    def get(self, key: str, default=None):
+        for layer in self.maps:
+            if key in layer:
+                return layer[key]
+        return default
+
+    def __contains__(self, key: str) -> bool:
+        return any(key in layer for layer in self.maps)
+
+
+class SettingsMeta(type):
+    """ Creates the slots for all declared settings and the lookup table from config keys to attributes """
+
+    def __new__(mcs, name, bases, namespace):
+        declared = {attr: setting for attr, setting in namespace.items() if isinstance(setting, Setting)}
+
+        slots = list(namespace.get('__slots__', ()))
+
+        for attr, setting in declared.items():
+            # a setting redeclared in a subclass only changes its default and uses the slots of the base
+            inherited = next((getattr(base, attr) for base in bases if isinstance(getattr(base, attr, None), Setting)),
+                             None)
+            setting.slot = inherited.slot if inherited else f'_{attr}'
+            setting.tdpi_slot = inherited.tdpi_slot if inherited else f'_{attr}{Ct.tdpi}'
+
+            if not inherited:
+                slots.append(setting.slot)
+                if setting.measure:
+                    slots.append(setting.tdpi_slot)
+
+            if setting.measure:
+                namespace[f'{attr}{Ct.tdpi}'] = TdpiSetting(setting)
+
+        namespace['__slots__'] = tuple(slots)
+        cls = super().__new__(mcs, name, bases, namespace)
+
+        # config key -> attribute, including the keys of the base classes
+        keys = {}
+        measures = []
+        for base in reversed(bases):
+            keys.update(getattr(base, '_keys', {}))
+            measures += getattr(base, '_measures', [])
+
+        for attr, setting in declared.items():
+            keys[setting.key] = attr
+            if setting.measure:
+                keys[f'{setting.key}{Ct.tdpi}'] = f'{attr}{Ct.tdpi}'
+                if setting.tdpi_slot not in measures:
+                    measures.append(setting.tdpi_slot)
+
+        cls._keys = keys
+        cls._measures = measures
+
+        return cls
+
+
+class Settings(metaclass=SettingsMeta):
+    """ Typed settings of a design. Every design declares its settings once in a subclass.
+    Settings not declared are kept as text.
+
+    Order of configuration is
+        built in defaults of the settings class
+        InsertMaker.config                        shared layer
+        Project configuration                     shared layer
+        Item configuration                        settings object
+
+    A setting not set in the item configuration is resolved from the layers on first access.
+    """
+    __slots__ = ('_extra', '_conversion_factors', '_layers')
+
+    # layers without any settings
+    __NO_LAYERS = SettingsLayers()
+
+    # x offset       : left offset of the whole SVG drawing
+    # y offset       : top offset of the whole SVG drawing
+    # y text spacing : vertical spacing of the describing text lines at the bottom of the drawing
+    # thickness      : thickness of the uses material
+    # stroke width   : stroke width of the lines in the SVG drawing
+    x_offset = Setting(Ct.x_offset, number, 1.0, measure=True)
+    y_offset = Setting(Ct.y_offset, number, 2.0, measure=True)
+    y_text_spacing = Setting(Ct.y_text_spacing, number, 7, measure=True)
+    thickness = Setting(Ct.thickness, number, 1.5, measure=True)
+    stroke_width = Setting(Ct.stroke_width, number, 2, measure=True)
+
+    # arc tolerance  : cutters without arc support get lines instead of arcs. Maximal distance between
+    #                  an arc and its lines. 0 keeps the arcs
+    arc_tolerance = Setting(Ct.arc_tolerance, number, 0, measure=True)
+
+    # kerf           : width of the cut. Closed contours are moved by the half kerf that the parts keep their size.
+    #                  0 keeps the contours
+    kerf = Setting(Ct.kerf, number, 0, measure=True)
+
+    # export formats : comma separated formats of the written files, svg and the machine formats gcode, hpgl, dxf
+    # feed rate      : speed of the machine while cutting in mm/min
+    # travel rate    : speed of the machine while moving without cutting in mm/min
+    export_formats = Setting(Ct.export_formats, str, 'svg')
+    feed_rate = Setting(Ct.feed_rate, number, 1000)
+    travel_rate = Setting(Ct.travel_rate, number, 3000)
+
+    # targets        : additional SVG files of the drawing, one per line as name, resolution, unit, precision.
+    #                  i.e. "inkscape, 96, mm, 3" writes <filename>-inkscape.svg with 96 dpi
+    targets = Setting(Ct.targets, str, '')
+
+    # unit             : used unit in the settings (mm or mil)
+    # stroke color     : color of the lines drawn in the SVG image
+    # stroke dasharray : pattern of the lines drawn in the SVG image
+    # resolution       : resolution of the SVG drawing
+    unit = UnitSetting(Ct.unit, str, Ct.unit_mm)
+    stroke_color = Setting(Ct.stroke_color, str, '#aaaaaa')
+    stroke_dasharray = Setting(Ct.stroke_dasharray, str, '0,0')
+    resolution = Setting(Ct.resolution, number, 72)
+
+    # The nonstandard settings are design dependend and cannot be in the global settings InsertMaker.config
+    # title         : title of the drawing
+    # filename      : filename of the utput file
+    # project name  : project (i.e. boardgame) to which the design belongs
+    # template name : SVG template to use for the design
+    title = Setting(Ct.title, str, '')
+    filename = Setting(Ct.filename, str, '')
+    project_name = Setting(Ct.project_name, str, '')
+    template_file = Setting(Ct.template_file, str, '')
+
+    def __init__(self, conversion_factors: dict, layers: SettingsLayers = None):
+        """
+        :param conversion_factors: factors to convert a value in a unit to tdpi
+        :param layers: shared settings below the settings of the design
+        """
+        self._conversion_factors = conversion_factors
+        self._layers = self.__NO_LAYERS if layers is None else layers
+        self._extra = {}
+
+    @property
+    def layers(self) -> SettingsLayers:
+        return self._layers
+
+    def as_layers(self) -> SettingsLayers:
+        """ Creates a chain of layers with the settings of this object on top of its own layers.
+        Used to share these settings with other settings objects.
+
+        :return: new chain of layers
+        """
+        values = dict(self._extra)
+        for key, attribute in self._keys.items():
+            setting = getattr(self.__class__, attribute)
+            if isinstance(setting, Setting) and hasattr(self, setting.slot):
+                values[key] = getattr(self, setting.slot)
+
+        return self._layers.new_child(values)
+
+    def values(self) -> dict:
+        """ The current value of every setting, including the settings only given in the layers
+
+        :return: value by config key
+        """
+        values = {}
+        for layer in reversed(self._layers.maps):
+            values.update(layer)
+        values.update(self._extra)
+
+        for key, attribute in self._keys.items():
+            if isinstance(getattr(self.__class__, attribute), Setting):
+                values[key] = getattr(self, attribute)
+
+        return values
+
+    def clear_tdpi(self) -> None:
+        """ Removes all cached tdpi values """
+        for slot in self._measures:
+            if hasattr(self, slot):
+                delattr(self, slot)
+
+    def conversion_factor(self) -> float:
+        """ Delivers the factor for the unit of the settings to convert to tdpi
+
+        :return: conversion factor
+        """
+        return self._conversion_factors[self.unit]
+
+    def unit_to_tdpi(self, value: float) -> int:
+        """ Converts a native unit (mm/mil) to tdpi
+
+        :param value: value to be converted
+        :return: converted value
+        """
+        return int(float(value) * self.conversion_factor())
+
+    def __getitem__(self, key: str):
+        attribute = self._keys.get(key)
+        if attribute is None:
+            if key in self._extra or key not in self._layers:
+                return self._extra[key]
+            return self._layers.get(key)
+        return getattr(self, attribute)
+
+    def __setitem__(self, key: str, value) -> None:
+        attribute = self._keys.get(key)
+        if attribute is None:
+            self._extra[key] = value
+        else:
+            setattr(self, attribute, value)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys or key in self._extra or key in self._layers
+
+    def get(self, key: str, default=None):
+        attribute = self._keys.get(key)
+        if attribute is None:
+            if key in self._extra:
+                return self._extra[key]
+            return self._layers.get(key, default)
+        return getattr(self, attribute)
+
+    def update(self, values: dict) -> None:
+        """ Updates the settings with the items of a dict. Texts are converted to the type of the setting
+
+        :param values: key and value of the settings to update
+        :return:
+        """
+        for key, value in values.items():
+            self[key] = value
@@ -1,6 +1,8 @@
 import importlib
-import sys
 from classes.Config import Config
+from classes.ProjectLock import ProjectLock
+from classes.InsertMakerError import InsertMakerError, DesignError
+from classes.Plan import C as Cp
 from classes.ConfigConstants import ConfigConstantsText as Ct
 
 
@@ -14,25 +16,56 @@ class Single:
         """
         config_file_and_section = kwargs.setdefault(Ct.config_file_and_section, '')
 
-        # read config file and extract the design to dynamically load the class
-        design = Config.get_design(config_file_and_section)
+        # read config file and extract the design to dynamically load the class. A project lock already knows it
+        design = None
+        if ProjectLock.active is not None:
+            config_file, section = Config.get_config_file_and_section(config_file_and_section)
+            locked = ProjectLock.active.get_section(config_file, section)
+            design = locked[0] if locked is not None else None
 
-        # Import the design from the config file and load the same named class
-        try:
-            module = importlib.import_module(f'classes.{design}')
-            class_ = getattr(module, design)
-        except ModuleNotFoundError:
-            print(f'Unknown design "{design}" in config file {config_file_and_section}.')
-            sys.exit(-1)
-        except Exception as inst:
-            print('Unknown Error')
-            print(type(inst))  # the exception instance
-            print(inst.args)  # arguments stored in .args
-            print(inst)
-            sys.exit(-1)
+        if design is None:
+            design = Config.get_design(config_file_and_section)
+
+        class_ = cls.get_design_class(design, f'config file {config_file_and_section}')
 
         # invoke creation of the item
         design = class_(**kwargs)
 
-        # execute the content
-        design.create()
+        # execute the content. In projects designs with the same geometry share their drawing
+        drawings = kwargs.get(Ct.drawings)
+        if drawings is not None:
+            design.create_or_reuse(drawings)
+        else:
+            design.create()
+
+    @classmethod
+    def plan(cls, **kwargs) -> dict:
+        """ The node of a single config file design in the plan of a build. The design is only configured.
+
+        :return: plan of the design. Errors in the configuration are part of the plan
+        """
+        config_file_and_section = kwargs.setdefault(Ct.config_file_and_section, '')
+
+        try:
+            design = Config.get_design(config_file_and_section)
+            class_ = cls.get_design_class(design, f'config file {config_file_and_section}')
+            return class_(**kwargs).plan()
+        except InsertMakerError as e:
+            return {Cp.section: config_file_and_section, Cp.design: None, Cp.error: str(e)}
+
+    @staticmethod
+    def get_design_class(design: str, source: str):
+        """ Imports the design and loads the same named class
+
+        :param design: name of the design, i.e. CardBox
+        :param source: origin of the design for error messages
+        :return: class of the design
+        """
+        try:
+            module = importlib.import_module(f'classes.{design}')
+            return getattr(module, design)
+        except ModuleNotFoundError as inst:
+            raise DesignError(f'Unknown design "{design}" in {source}.') from inst
+        except Exception as inst:
+            raise DesignError(f'Design "{design}" in {source} can not be loaded. {type(inst).__name__}: {inst}') \
+                from inst
@@ -0,0 +1,6 @@
+from enum import Enum
+
+
+class StripDirection(Enum):
+    HORIZONTAL = "horizontal"
+    VERTICAL = "vertical"
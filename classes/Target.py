@@ -0,0 +1,140 @@
+import re
+from typing import NamedTuple
+from xml.etree import ElementTree
+from classes.PathGeometry import PathGeometry
+from classes.InsertMakerError import SettingsError
+
+
+class C:
+    svg_namespace = 'http://www.w3.org/2000/svg'
+    xlink_namespace = 'http://www.w3.org/1999/xlink'
+    inkscape_namespace = 'http://www.inkscape.org/namespaces/inkscape'
+
+    unit_none = 'none'
+
+
+class Target(NamedTuple):
+    """ Output profile of a drawing, i.e. for an Inkscape workflow with 96 dpi or a laser working in mm.
+
+    The geometry of a design is drawn once. Every target writes the finished drawing again with its own
+    resolution, the unit of the document size and the number of decimals.
+    """
+
+    # name of the target, appended to the filename
+    name: str
+
+    # user units of the drawing per inch. 72 for the Cricut, 96 for Inkscape, 25.4 for drawings in mm
+    resolution: float
+
+    # unit of width and height of the document: mm, cm, in, pt, px or none
+    unit: str
+
+    # number of decimals of the written values
+    precision: int
+
+    # units of the document size per inch
+    __UNITS_PER_INCH = {'mm': 25.4, 'cm': 2.54, 'in': 1.0, 'pt': 72.0, 'px': 96.0}
+
+    # attributes with a length. Other attributes keep their values
+    __LENGTHS = ('x', 'y', 'dx', 'dy', 'width', 'height', 'cx', 'cy', 'r', 'rx', 'ry', 'x1', 'y1', 'x2', 'y2',
+                 'stroke-width', 'stroke-dasharray')
+
+    __NUMBER = re.compile(r'[-+]?(?:\d+\.?\d*|\.\d+)(?:[eE][-+]?\d+)?')
+    __TRANSFORMS = re.compile(r'(matrix|translate|scale|rotate)\s*\(([^)]*)\)')
+
+    @classmethod
+    def parse_targets(cls, text: str) -> list['Target']:
+        """ Reads the targets from a setting with one target per line
+
+            name, resolution, unit, precision
+
+        :param text: value of the setting
+        :return: list of targets
+        """
+        targets = []
+
+        for line in (line.strip() for line in text.splitlines()):
+            if not line:
+                continue
+
+            items = [item.strip() for item in line.split(',')]
+            if len(items) != 4 or not re.fullmatch(r'[\w-]+', items[0]):
+                raise SettingsError(f'Wrong target "{line}". Expected name, resolution, unit, precision')
+
+            name, resolution, unit, precision = items
+            if unit not in cls.__UNITS_PER_INCH and unit != C.unit_none:
+                raise SettingsError(f'Unknown unit {unit} of target {name}. Allowed units are '
+                                    f'{", ".join(list(cls.__UNITS_PER_INCH) + [C.unit_none])}')
+
+            try:
+                target = Target(name, float(resolution), unit, int(precision))
+            except ValueError:
+                raise SettingsError(f'Wrong resolution or precision of target {name}')
+
+            if target.resolution <= 0 or target.precision < 0:
+                raise SettingsError(f'Wrong resolution or precision of target {name}')
+
+            targets.append(target)
+
+        return targets
+
+    def emit(self, svg: str, resolution: float) -> str:
+        """ Writes the drawing with the resolution, unit and precision of the target
+
+        :param svg: finished drawing
+        :param resolution: resolution of the drawing
+        :return: drawing of the target
+        """
+        factor = self.resolution / resolution
+
+        ElementTree.register_namespace('', C.svg_namespace)
+        ElementTree.register_namespace('xlink', C.xlink_namespace)
+        ElementTree.register_namespace('inkscape', C.inkscape_namespace)
+
+        root = ElementTree.fromstring(svg)
+
+        for elem in root.iter():
+            for name, value in list(elem.attrib.items()):
+                if name == 'd':
+                    elem.set(name, PathGeometry.scale_path(value, factor, self.number))
+                elif name == 'transform':
+                    elem.set(name, self.__TRANSFORMS.sub(lambda match: self.__scale_transform(match, factor), value))
+                elif name in self.__LENGTHS:
+                    elem.set(name, self.__scale_numbers(value, factor))
+
+        # the size of the document in the unit of the target keeps the drawing in its real size
+        view_box = [float(value) for value in root.get('viewBox', '').split()]
+        if len(view_box) == 4 and self.unit != C.unit_none:
+            root.set('width', f'{self.number(view_box[2] / resolution * self.__UNITS_PER_INCH[self.unit])}{self.unit}')
+            root.set('height', f'{self.number(view_box[3] / resolution * self.__UNITS_PER_INCH[self.unit])}{self.unit}')
+
+        if len(view_box) == 4:
+            root.set('viewBox', ' '.join(self.number(value * factor) for value in view_box))
+
+        return '<?xml version="1.0" encoding="UTF-8" standalone="no"?>\n' + \
+            ElementTree.tostring(root, encoding='unicode')
+
+    def number(self, value: float) -> str:
+        """ Formats a value with the precision of the target """
+        text = f'{value:.{self.precision}f}'
+        return text[1:] if text.startswith('-') and not text.strip('-0.') else text
+
+    def __scale_numbers(self, value: str, factor: float) -> str:
+        return self.__NUMBER.sub(lambda match: self.number(float(match.group(0)) * factor), value)
+
+    def __scale_transform(self, match, factor: float) -> str:
+        """ Scales the lengths of a transformation. Angles and scales are kept """
+        name, arguments = match.group(1), match.group(2)
+        values = [value for value in re.split(r'[\s,]+', arguments.strip()) if value]
+
+        if name == 'translate':
+            lengths = range(len(values))
+        elif name == 'matrix':
+            lengths = (4, 5)
+        elif name == 'rotate':
+            lengths = (1, 2)
+        else:
+            lengths = ()
+
+        return f'{name}(' + ', '.join(self.number(float(value) * factor) if index in lengths else value
+                                      for index, value in enumerate(values)) + ')'
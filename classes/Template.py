@@ -1,33 +1,48 @@
-import sys
 import os
 import pathlib
 from classes.File import File
+from classes.LruCache import LruCache
+from classes.InsertMakerError import TemplateError
 
 
 class Template:
     __TEMPLATE_EXTENSION = 'svg'
     __TEMPLATE_PATH = os.path.join(pathlib.Path(os.path.dirname(__file__)).parent, 'templates')
 
+    # templates of the process by their name with the time of the last modification
+    __templates = LruCache(64)
+
     @classmethod
     def load_template(cls, template: str) -> str:
         """Import the template"""
 
         string = ""
         if not template:
-            print('No template name given')
-            sys.exit(-1)
+            raise TemplateError('No template name given')
 
-        template_file = File.path_and_extension(cls.__TEMPLATE_PATH, template, cls.__TEMPLATE_EXTENSION)
+        template_file = cls.template_file(template)
 
         if not os.path.isfile(template_file):
-            print(f'Template file {template_file} does not exist!')
-            sys.exit()
+            raise TemplateError(f'Template file {template_file} does not exist!')
 
-        with open(template_file, 'r') as f:
-            string = f.read()
+        key = (template_file, os.stat(template_file).st_mtime_ns)
+        string = cls.__templates.get(key)
+        if string is None:
+            with open(template_file, 'r') as f:
+                string = f.read()
+            cls.__templates.put(key, string)
 
         return string
 
+    @classmethod
+    def template_file(cls, template: str) -> str:
+        """ Filename with path of a template
+
+        :param template: name of the template, i.e. CardSheet.svg
+        :return: filename of the template
+        """
+        return File.path_and_extension(cls.__TEMPLATE_PATH, template, cls.__TEMPLATE_EXTENSION)
+
     @classmethod
     def load_and_create(cls, template: str, variables) -> str:
         pass
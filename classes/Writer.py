@@ -0,0 +1,178 @@
+import os
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from classes.File import File
+from classes.BuildRecord import BuildRecord
+from classes.InsertMakerError import InsertMakerError, WriteError
+
+
+class Writer:
+    """ Writes the files of the drawings in background threads. While a drawing is written the next design is
+    already drawn, i.e. when the files are on network storage.
+
+    The queue is bounded: a design waits when too many files are still to be written. Files with the same name
+    are written in the order they were handed over. Errors are collected and raised by flush at the end of the
+    run. Without a started writer every file is written immediately.
+    """
+
+    __executor = None
+
+    # free places in the queue
+    __places = None
+
+    # design whose files are handed over. The errors of the files are reported for it
+    owner = None
+
+    # last pending write of every file until the next flush, the errors of the finished writes with their design
+    __pending = {}
+    __errors = []
+    __lock = threading.Lock()
+
+    __atexit_registered = False
+
+    @classmethod
+    def start(cls, threads: int = 2, queue_size: int = 0) -> None:
+        """ Starts the background threads. The writes of a running writer are flushed before
+
+        :param threads: number of threads writing files
+        :param queue_size: maximum number of files waiting to be written, twice the threads without a size
+        :return:
+        """
+        cls.stop()
+
+        if threads <= 0:
+            return
+
+        cls.__executor = ThreadPoolExecutor(threads, thread_name_prefix='Writer')
+        cls.__places = threading.BoundedSemaphore(queue_size if queue_size > 0 else 2 * threads)
+
+        # all files are on the disk when the process ends
+        if not cls.__atexit_registered:
+            atexit.register(cls.stop)
+            cls.__atexit_registered = True
+
+    @classmethod
+    def is_running(cls) -> bool:
+        return cls.__executor is not None
+
+    @classmethod
+    def write_file(cls, filename: str, content, skip_unchanged=True, ignore=None, inputs=None) -> None:
+        """ Hands a file over to the background threads or writes it immediately without a started writer
+
+        :param filename: file with path to write
+        :param content: text or bytes of the file
+        :param skip_unchanged: True leaves the file untouched when its content is identical
+        :param ignore: pattern of bytes that are not compared, i.e. the title with the time of the run
+        :param inputs: templates and config files the file is created from, they are kept in the build record
+        :return:
+        """
+        cls.__hand_over(filename, inputs, lambda durable: File.write_file(
+            filename, content, skip_unchanged=skip_unchanged, durable=durable, ignore=ignore))
+
+    @classmethod
+    def write_stream(cls, filename: str, write, skip_unchanged=True, inputs=None) -> None:
+        """ Hands a function that writes the text of a file to a stream over to the background threads or calls
+        it immediately without a started writer. The text is written directly to the file.
+
+        :param filename: file with path to write
+        :param write: function that writes the text to the stream it gets
+        :param skip_unchanged: True leaves the file untouched when its content is identical
+        :param inputs: templates and config files the file is created from, they are kept in the build record
+        :return:
+        """
+        cls.__hand_over(filename, inputs, lambda durable: File.write_stream(
+            filename, write, skip_unchanged=skip_unchanged, durable=durable))
+
+    @classmethod
+    def __hand_over(cls, filename: str, inputs, write) -> None:
+        """ Writes a file with the function in a background thread or immediately without a started writer
+
+        :param filename: file with path to write
+        :param inputs: templates and config files of the file for the build record
+        :param write: function that writes the file, it gets True for a durable file
+        :return:
+        """
+        if cls.__executor is None:
+            # the same error as from the background threads
+            try:
+                write(False)
+            except OSError as e:
+                message = f'{filename}: {InsertMakerError.text(e)}'
+                raise WriteError(f'Files could not be written:\n{message}', {cls.owner: [message]}) from e
+            if inputs is not None:
+                BuildRecord.add(filename, inputs)
+            return
+
+        key = os.path.abspath(filename)
+
+        # a file is not written by two threads at the same time
+        with cls.__lock:
+            previous = cls.__pending.get(key)
+        if previous is not None:
+            previous.result()
+
+        # wait for a free place in the queue
+        cls.__places.acquire()
+        try:
+            future = cls.__executor.submit(cls.__write, filename, inputs, write, cls.owner)
+        except BaseException:
+            cls.__places.release()
+            raise
+
+        with cls.__lock:
+            cls.__pending[key] = future
+
+    @classmethod
+    def __write(cls, filename: str, inputs, write, owner) -> None:
+        """ Writes a file in a background thread. The error is kept for flush """
+        try:
+            write(True)
+            if inputs is not None:
+                BuildRecord.add(filename, inputs)
+        except Exception as e:
+            with cls.__lock:
+                cls.__errors.append((owner, f'{filename}: {InsertMakerError.text(e)}'))
+        finally:
+            cls.__places.release()
+
+    @classmethod
+    def flush(cls) -> None:
+        """ Waits until all handed over files are written. Raises an error for the files that could not
+        be written, it keeps the messages by the designs that handed the files over.
+
+        :return:
+        """
+        while True:
+            with cls.__lock:
+                pending = list(cls.__pending.values())
+                cls.__pending.clear()
+            if not pending:
+                break
+
+            for future in pending:
+                future.result()
+
+        with cls.__lock:
+            errors, cls.__errors = cls.__errors, []
+
+        if errors:
+            designs = {}
+            for owner, message in errors:
+                designs.setdefault(owner, []).append(message)
+            raise WriteError('Files could not be written:\n' + '\n'.join(message for _, message in errors), designs)
+
+    @classmethod
+    def stop(cls) -> None:
+        """ Writes all handed over files and ends the background threads. Remaining errors are printed """
+        if cls.__executor is None:
+            return
+
+        try:
+            cls.flush()
+        except WriteError as e:
+            print(e)
+        finally:
+            cls.__executor.shutdown(wait=True)
+            cls.__executor = None
+            cls.__places = None